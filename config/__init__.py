@@ -3,7 +3,8 @@ Configuration module for Fluidic Control System
 """
 
 from .settings import *
-from .hardware_config import HARDWARE_CONFIG
+from .hardware_config import (HARDWARE_CONFIG, PUMP_PORT, PRESSURE_CHANNEL, TEMP_CHANNEL,
+                              FLOW_CHANNEL, LEVEL_CHANNEL)
 
-__all__ = ['HARDWARE_CONFIG']
+__all__ = ['HARDWARE_CONFIG', 'PUMP_PORT', 'PRESSURE_CHANNEL', 'TEMP_CHANNEL', 'FLOW_CHANNEL', 'LEVEL_CHANNEL']
 
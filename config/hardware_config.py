@@ -39,3 +39,10 @@ HARDWARE_CONFIG = {
     }
 }
 
+
+# Flattened values for the hardware controller (read once at import, not per access)
+PUMP_PORT = HARDWARE_CONFIG['pump']['port']
+PRESSURE_CHANNEL = HARDWARE_CONFIG['sensors']['pressure']['channel']
+TEMP_CHANNEL = HARDWARE_CONFIG['sensors']['temperature']['channel']
+FLOW_CHANNEL = HARDWARE_CONFIG['sensors']['flow']['channel']
+LEVEL_CHANNEL = HARDWARE_CONFIG['sensors']['level']['channel']
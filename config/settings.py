@@ -20,8 +20,15 @@ DEFAULT_STEP_SIZE = 0.1  # V
 # Data settings
 DATA_DIRECTORY = "data"
 CSV_DELIMITER = ","
+# Data file format for new experiments: "csv" (default) or "parquet".
+# "parquet" is opt-in: it also writes a columnar .parquet file next to the CSV
+# and needs pyarrow. The data browser and Excel export read the CSV.
+DATA_FILE_FORMAT = "csv"
 TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
 
+# Logging: WARNING shows only warnings and errors; "INFO" or "DEBUG" adds progress output
+LOG_LEVEL = "WARNING"
+
 # Update intervals (in milliseconds)
 SENSOR_UPDATE_INTERVAL = 1000  # 1 second
 GUI_UPDATE_INTERVAL = 100  # 100ms
@@ -2,8 +2,11 @@
 Base experiment class
 """
 
+import logging
 from abc import ABC, abstractmethod
 
+logger = logging.getLogger(__name__)
+
 
 class BaseExperiment(ABC):
     """Base class for all experiment types"""
@@ -23,13 +26,13 @@ class BaseExperiment(ABC):
         self.is_running = False
         if self.hw_controller:
             self.hw_controller.stop_pump()
-        print("Experiment stopped.")
+        logger.info("Experiment stopped.")
     
     def finish(self):
         """Finish the experiment - complete current step then stop"""
         self.is_running = False
-        print("Experiment finishing - completing current step...")
+        logger.info("Experiment finishing - completing current step...")
         if self.hw_controller:
             self.hw_controller.stop_pump()
-        print("Experiment finished.")
+        logger.info("Experiment finished.")
 
@@ -2,10 +2,13 @@
 Experiment Manager - Main class for managing experiments
 """
 
+import logging
 from experiments.experiment_types.time_dependent import TimeDependentExperiment
 from experiments.experiment_types.iv_experiment import IVExperiment
 from experiments.safety_checks import SafetyChecker
 
+logger = logging.getLogger(__name__)
+
 
 class ExperimentManager:
     """
@@ -28,12 +31,14 @@ class ExperimentManager:
         # Current experiment
         self.current_experiment = None
     
-    def perform_safety_checks(self):
+    def perform_safety_checks(self, **readings):
         """
         Perform safety checks
+        readings: Optional level, pressure, temperature already read by the caller (skips re-reading them;
+            None = the read failed)
         Returns: True if everything is OK, False if there's a problem
         """
-        return self.safety_checker.perform_all_checks()
+        return self.safety_checker.perform_all_checks(**readings)
     
     def stop_experiment(self):
         """Stop the current experiment"""
@@ -42,7 +47,7 @@ class ExperimentManager:
             self.current_experiment.is_running = False
             self.current_experiment.stop()
         self.hw_controller.stop_pump()
-        print("Experiment stopped.")
+        logger.info("Experiment stopped.")
     
     def finish_experiment(self):
         """Finish the experiment - complete current step then stop"""
@@ -51,9 +56,9 @@ class ExperimentManager:
             self.current_experiment.is_running = False
             self.current_experiment.finish()
         else:
-            print("Experiment finishing - completing current step...")
+            logger.info("Experiment finishing - completing current step...")
             self.hw_controller.stop_pump()
-        print("Experiment finished.")
+        logger.info("Experiment finished.")
     
     def run_time_dependent_experiment(self, experiment_program):
         """
@@ -2,13 +2,55 @@
 I-V experiment type
 """
 
+import logging
+import math
 import time
+import numpy as np
 from experiments.base_experiment import BaseExperiment
+from utils.background_writer import BackgroundWriter
+from utils.data_handler import IV_FIELDNAMES
+
+logger = logging.getLogger(__name__)
+
+# Simulated sweep points written per append_columns call
+SIM_WRITE_BLOCK = 64
+
+
+def compute_voltage_points(start_v, end_v, step_v):
+    """
+    Calculate the voltage points of a sweep from start_v towards end_v
+    
+    The points are generated in one numpy call instead of repeated float addition,
+    so the end voltage is not lost to accumulated rounding (e.g. 0 to 1 V in 0.1 V steps).
+    If the range is not a multiple of the step, the sweep stops at the last point before end_v.
+    
+    Args:
+        start_v: Start voltage (V)
+        end_v: End voltage (V)
+        step_v: Step size (V) - the sign is ignored, direction comes from start_v/end_v
+    Returns:
+        List of voltages (floats)
+    """
+    step = abs(step_v)
+    if step == 0:
+        raise ValueError("Step size must be non-zero")
+    span = end_v - start_v
+    # Small tolerance so 1.0 / 0.1 counts as 10 steps, not 9.999...
+    num_steps = int(abs(span) / step + 1e-9)
+    last_v = start_v + math.copysign(num_steps * step, span)
+    if abs(last_v - end_v) < 1e-9 * step:
+        last_v = end_v
+    return np.linspace(start_v, last_v, num_steps + 1).tolist()
 
 
 class IVExperiment(BaseExperiment):
     """I-V experiment - current-voltage characteristic measurement"""
     
+    def __init__(self, hardware_controller, data_handler):
+        super().__init__(hardware_controller, data_handler)
+        # Rows are written by a separate thread while the SMU settles at the next voltage
+        self.writer = BackgroundWriter(data_handler)
+    
     def run(self, start_v, end_v, step_v, delay=0.1):
         """
         Run I-V experiment
@@ -19,53 +61,63 @@ class IVExperiment(BaseExperiment):
         """
         if not self.is_running:
             self.is_running = True
-            print("Starting I-V measurement...")
+            logger.info("Starting I-V measurement...")
         
         try:
             # Create new data file
-            self.data_handler.create_new_file()
+            self.data_handler.create_new_file(IV_FIELDNAMES)
             
             # Setup SMU for I-V measurement (manual sweep, not using built-in sweep)
             if self.hw_controller.smu:
                 self.hw_controller.setup_smu_iv_sweep(start_v, end_v, step_v)
             
             # Calculate voltage points for manual sweep
-            if start_v <= end_v:
-                voltage_points = []
-                v = start_v
-                while v <= end_v:
-                    voltage_points.append(v)
-                    v += step_v
-            else:
-                voltage_points = []
-                v = start_v
-                while v >= end_v:
-                    voltage_points.append(v)
-                    v -= step_v
+            voltage_points = compute_voltage_points(start_v, end_v, step_v)
+            
+            if not self.hw_controller.smu:
+                # Simulation mode - the curve is computed at once, but points are still paced by
+                # delay and written in blocks, so Stop ends the sweep like on hardware
+                voltages = np.asarray(voltage_points)
+                currents = voltages * 0.1
+                done = written = 0
+                while done < len(voltages) and self.is_running:
+                    time.sleep(delay)  # Delay between measurements
+                    done += 1
+                    if done - written == SIM_WRITE_BLOCK:
+                        self.data_handler.append_columns({"voltage": voltages[written:done],
+                                                          "current": currents[written:done]})
+                        written = done
+                if done > written:
+                    # Points measured before a Stop are kept, like the hardware path
+                    self.data_handler.append_columns({"voltage": voltages[written:done],
+                                                      "current": currents[written:done]})
+                return
             
             # Perform manual sweep - set voltage and measure for each point
-            for voltage in voltage_points:
-                if not self.is_running:
-                    break
-                
-                # Set voltage
-                if self.hw_controller.smu:
+            self.writer.start()
+            try:
+                for voltage in voltage_points:
+                    if not self.is_running:
+                        break
+                    
+                    # Set voltage
                     self.hw_controller.set_smu_voltage(voltage)
                     time.sleep(0.1)  # Wait for voltage stabilization
                     # Measure
-                    smu_data = self.hw_controller.measure_smu()
+                    smu_data = self.hw_controller.measure_smu(source_value=voltage)
                     if smu_data:
-                        self.data_handler.append_data(smu_data)
-                else:
-                    # Simulation mode
-                    smu_data = {"voltage": voltage, "current": voltage * 0.1}
-                    self.data_handler.append_data(smu_data)
-                
-                time.sleep(delay)  # Delay between measurements
+                        # Queued - the file write overlaps with the next settling delay
+                        self.writer.put(smu_data)
+                    
+                    time.sleep(delay)  # Delay between measurements
+            finally:
+                self.writer.stop()
         
         except Exception as e:
-            print(f"Error in I-V experiment: {e}")
+            logger.error("Error in I-V experiment: %s", e)
         finally:
+            # Both paths end here (the writer is already stopped) - push the buffered rows to disk
+            self.data_handler.close_file()
             self.stop()
-            print("I-V measurement finished.")
+            logger.info("I-V measurement finished.")
 
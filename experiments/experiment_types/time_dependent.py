@@ -2,90 +2,142 @@
 Time-dependent experiment type
 """
 
+import logging
 import time
 from experiments.base_experiment import BaseExperiment
 from experiments.safety_checks import SafetyChecker
+from utils.background_writer import BackgroundWriter
+from utils.data_handler import TIME_DEPENDENT_FIELDNAMES
+
+logger = logging.getLogger(__name__)
 
 
 class TimeDependentExperiment(BaseExperiment):
     """Time-dependent experiment - runs according to a program with steps"""
     
+    # Sampling period (seconds) - samples are scheduled on a fixed grid, not "work + sleep"
+    sample_period = 1.0
+    # Run the safety checks on every N-th sample (1 = every sample).
+    # Raise it for fast sampling - limit violations are not sub-second events.
+    check_every = 1
+    
     def __init__(self, hardware_controller, data_handler):
         super().__init__(hardware_controller, data_handler)
         # Safety checks bypassed for now - sensors not yet installed
         self.safety_checker = SafetyChecker(hardware_controller, bypass_checks=True)
+        # Data file writes run on a separate thread so disk latency does not shift sample timing
+        self.writer = BackgroundWriter(data_handler, recycle_rows=True)
     
     def run(self, experiment_program):
         """
         Run time-dependent experiment
         experiment_program: List of steps, each step is a dict with:
-            - duration: Duration (seconds)
-            - flow_rate: Flow rate (ml/min)
+            - duration: Duration (seconds) - required
+            - flow_rate: Flow rate (ml/min) - required
             - valve_setting: Valve settings (dict with valve1, valve2)
             - temp: Temperature (optional)
+            - check_every: Safety check every N samples for this step (optional, default check_every)
         """
         self.is_running = True
-        print("Starting time-dependent experiment...")
+        logger.info("Starting time-dependent experiment...")
         
         # Create new data file
-        self.data_handler.create_new_file()
+        self.data_handler.create_new_file(TIME_DEPENDENT_FIELDNAMES)
+        
+        # Local bindings for the sampling loop (avoid repeated global/attribute lookups)
+        # perf_counter is monotonic and high resolution on every platform
+        # (time.monotonic ticks in ~15 ms steps on Windows)
+        clock = time.perf_counter
+        sleep = time.sleep
+        put_row = self.writer.put
+        get_row = self.writer.get_row
+        read_all_sensors = self.hw_controller.read_all_sensors
+        
+        # Sample timestamps are wall-clock time anchored once at the start and advanced by the
+        # monotonic clock, so an NTP/DST clock change mid-run cannot make them jump
+        wall_offset = time.time() - clock()
         
-        # Execute each step in the program
-        for step in experiment_program:
-            if not self.is_running:
-                break  # Exit if experiment was stopped
-            
-            duration = step.get('duration')
-            flow_rate = step.get('flow_rate')
-            valve_setting = step.get('valve_setting', {})
-            temperature = step.get('temp', None)
-            
-            print(f"Executing step: Duration={duration}s, Flow Rate={flow_rate} ml/min")
-            
-            # Set flow rate and valves
-            self.hw_controller.set_pump_flow_rate(flow_rate)
-            if valve_setting:
-                self.hw_controller.set_valves(
-                    valve_setting.get('valve1', 'main'),
-                    valve_setting.get('valve2', 'main')
-                )
-            
-            # Set temperature if required
-            if temperature is not None:
-                # Temperature control logic can be added here
-                pass
-            
-            start_time = time.time()
-            
-            # Loop for the duration of the step
-            while time.time() - start_time < duration and self.is_running:
-                # Safety checks
-                if not self.safety_checker.perform_all_checks():
-                    self.stop()
-                    break
+        self.writer.start()
+        try:
+            # Execute each step in the program
+            for step in experiment_program:
+                if not self.is_running:
+                    break  # Exit if experiment was stopped
                 
-                # Read data from all sensors
-                pump_data = self.hw_controller.read_pump_data()
-                pressure_data = self.hw_controller.read_pressure_sensor()
-                temp_data = self.hw_controller.read_temperature_sensor()
-                level_data = self.hw_controller.read_level_sensor()
+                # Read the step once - the sampling loop below never touches the step dict
+                duration = step['duration']
+                flow_rate = step['flow_rate']
+                valve_setting = step.get('valve_setting')
+                temperature = step.get('temp')
+                check_every = max(1, int(step.get('check_every', self.check_every)))
                 
-                # Collect all data
-                data_point = {
-                    "time": time.time(),
-                    "flow_setpoint": flow_rate,
-                    "pump_flow_read": pump_data.get('flow', 0),
-                    "pressure_read": pressure_data if pressure_data is not None else "",  # FIXED: Handle None
-                    "temp_read": temp_data if temp_data is not None else "",
-                    "level_read": level_data if level_data is not None else ""
-                }
+                logger.info("Executing step: Duration=%ss, Flow Rate=%s ml/min", duration, flow_rate)
                 
-                # Save data to file
-                self.data_handler.append_data(data_point)
+                # Set flow rate and valves
+                self.hw_controller.set_pump_flow_rate(flow_rate)
+                if valve_setting:
+                    valve1 = valve_setting.get('valve1', 'main')
+                    valve2 = valve_setting.get('valve2', 'main')
+                    self.hw_controller.set_valves(valve1, valve2)
                 
-                # Wait for next scan
-                time.sleep(1)
+                # Set temperature if required
+                if temperature is not None:
+                    # Temperature control logic can be added here
+                    pass
+                
+                # Monotonic clock for step timing (time.time() can jump with NTP)
+                period = self.sample_period
+                start_time = clock()
+                next_t = start_time + period
+                # Counts down to the next safety check (the first sample of a step is always checked)
+                check_countdown = 1
+                
+                # Loop for the duration of the step
+                while clock() - start_time < duration and self.is_running:
+                    # Read data from all sensors - one pump query and one DAQ scan
+                    sensors = read_all_sensors()
+                    pump_data = sensors['pump']
+                    pressure_data = sensors['pressure']
+                    temp_data = sensors['temperature']
+                    level_data = sensors['level']
+                    
+                    # Safety checks on the values just read (no second round of hardware reads)
+                    check_countdown -= 1
+                    if check_countdown == 0:
+                        check_countdown = check_every
+                        if not self.safety_checker.perform_all_checks(level=level_data, pressure=pressure_data,
+                                                                      temperature=temp_data):
+                            self.stop()
+                            break
+                    
+                    # Collect all data - row dicts are recycled by the writer thread after they are written,
+                    # so every key is set on each sample
+                    row = get_row()
+                    row["time"] = wall_offset + clock()
+                    row["flow_setpoint"] = flow_rate
+                    row["pump_flow_read"] = pump_data.get('flow', 0)
+                    row["pressure_read"] = pressure_data if pressure_data is not None else ""  # FIXED: Handle None
+                    row["temp_read"] = temp_data if temp_data is not None else ""
+                    row["level_read"] = level_data if level_data is not None else ""
+                    
+                    # Save data to file (queued for the writer thread)
+                    put_row(row)
+                    
+                    # Wait for next scan - sleep until the next deadline so the period does not drift
+                    now = clock()
+                    slack = next_t - now
+                    if slack > 0:
+                        sleep(slack)
+                    next_t += period
+                    if next_t < now:
+                        # Fell more than a period behind (slow hardware) - skip missed samples
+                        next_t = now + period
+        
+        finally:
+            # Write everything still queued before the experiment returns, then push it to disk
+            self.writer.stop()
+            self.data_handler.close_file()
         
         self.stop()
-        print("Time-dependent experiment finished.")
+        logger.info("Time-dependent experiment finished.")
 
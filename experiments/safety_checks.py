@@ -2,6 +2,13 @@
 Safety checks for experiments
 """
 
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default for sensor values the caller did not pass - None is a reading that failed
+_NOT_SUPPLIED = object()
+
 
 class SafetyChecker:
     """Safety checks class for experiments"""
@@ -17,12 +24,13 @@ class SafetyChecker:
         self.hw_controller = hardware_controller
         self.bypass_checks = bypass_checks
     
-    def check_level(self, threshold=0.05):
+    def check_level(self, threshold=0.05, level=_NOT_SUPPLIED):
         """
         Check liquid level
         
         Args:
             threshold: Minimum level threshold (0.05 = 5%)
+            level: Level already read by the caller (None = the read failed; not passed = read the sensor)
         Returns:
             True if OK, False if there's a problem
         """
@@ -30,24 +38,25 @@ class SafetyChecker:
             return True
         
         try:
-            current_level = self.hw_controller.read_level_sensor()
+            current_level = level if level is not _NOT_SUPPLIED else self.hw_controller.read_level_sensor()
             if current_level is None:
                 # If sensor read failed, allow experiment to continue
                 return True
             if current_level < threshold:
-                print(f"WARNING: Liquid level is extremely low ({current_level*100:.1f}%). Stopping experiment.")
+                logger.warning("Liquid level is extremely low (%.1f%%). Stopping experiment.", current_level * 100)
                 return False
             return True
         except Exception as e:
-            print(f"Error checking level: {e}")
+            logger.error("Error checking level: %s", e)
             return True  # Continue if we can't check
     
-    def check_pressure(self, max_pressure=7.0):
+    def check_pressure(self, max_pressure=7.0, pressure=_NOT_SUPPLIED):
         """
         Check maximum pressure
         
         Args:
             max_pressure: Maximum allowed pressure (bar) - default 7.0 bar (~100 PSI)
+            pressure: Pressure already read by the caller (None = the read failed; not passed = query the pump)
         Returns:
             True if OK, False if there's a problem
         """
@@ -55,23 +64,24 @@ class SafetyChecker:
             return True
         
         try:
-            current_pressure = self.hw_controller.read_pressure_sensor()
+            current_pressure = pressure if pressure is not _NOT_SUPPLIED else self.hw_controller.read_pressure_sensor()
             if current_pressure is None:
                 return True
             if current_pressure > max_pressure:
-                print(f"WARNING: Pressure is too high ({current_pressure:.2f} bar). Stopping experiment.")
+                logger.warning("Pressure is too high (%.2f bar). Stopping experiment.", current_pressure)
                 return False
             return True
         except Exception as e:
-            print(f"Error checking pressure: {e}")
+            logger.error("Error checking pressure: %s", e)
             return True  # Continue if we can't check
     
-    def check_temperature(self, max_temperature=100.0):
+    def check_temperature(self, max_temperature=100.0, temperature=_NOT_SUPPLIED):
         """
         Check maximum temperature
         
         Args:
             max_temperature: Maximum allowed temperature (°C)
+            temperature: Temperature already read by the caller (None = the read failed; not passed = read the sensor)
         Returns:
             True if OK, False if there's a problem
         """
@@ -79,18 +89,19 @@ class SafetyChecker:
             return True
         
         try:
-            current_temp = self.hw_controller.read_temperature_sensor()
+            current_temp = temperature if temperature is not _NOT_SUPPLIED else self.hw_controller.read_temperature_sensor()
             if current_temp is None:
                 return True
             if current_temp > max_temperature:
-                print(f"WARNING: Temperature is too high ({current_temp:.2f} °C). Stopping experiment.")
+                logger.warning("Temperature is too high (%.2f °C). Stopping experiment.", current_temp)
                 return False
             return True
         except Exception as e:
-            print(f"Error checking temperature: {e}")
+            logger.error("Error checking temperature: %s", e)
             return True  # Continue if we can't check
     
-    def perform_all_checks(self, level_threshold=0.05, max_pressure=7.0, max_temperature=100.0):
+    def perform_all_checks(self, level_threshold=0.05, max_pressure=7.0, max_temperature=100.0,
+                           level=_NOT_SUPPLIED, pressure=_NOT_SUPPLIED, temperature=_NOT_SUPPLIED):
         """
         Perform all safety checks
         
@@ -98,17 +109,24 @@ class SafetyChecker:
             level_threshold: Minimum liquid level threshold (0.05 = 5%)
             max_pressure: Maximum allowed pressure (bar) - default 7.0 bar (~100 PSI)
             max_temperature: Maximum allowed temperature (°C)
+            level, pressure, temperature: Values the caller has already read this sample.
+                Passing them avoids a second hardware read; a passed None is a failed read
+                (not read again), a value that is not passed is read from the sensor.
         Returns:
             True if all checks pass, False if any check fails
         """
         if self.bypass_checks:
             return True
         
-        if not self.check_level(level_threshold):
-            return False
-        if not self.check_pressure(max_pressure):
-            return False
-        if not self.check_temperature(max_temperature):
-            return False
-        return True
+        # Values the caller already read are compared directly - no method call or
+        # exception handler per check. Missing or failed values go through the full check.
+        readings = (level, pressure, temperature)
+        if None not in readings and _NOT_SUPPLIED not in readings:
+            if level >= level_threshold and pressure <= max_pressure and temperature <= max_temperature:
+                return True
+        
+        # Short-circuits on the first failing check
+        return (self.check_level(level_threshold, level)
+                and self.check_pressure(max_pressure, pressure)
+                and self.check_temperature(max_temperature, temperature))
 
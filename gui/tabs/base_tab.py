@@ -5,6 +5,8 @@ Base class for all GUI tabs
 import customtkinter as ctk
 import threading
 
+from utils.sample_buffer import SampleBuffer
+
 
 class BaseTab(ctk.CTkFrame):
     """
@@ -29,11 +31,12 @@ class BaseTab(ctk.CTkFrame):
         self.exp_manager = exp_manager
         self.update_queue = update_queue
         
-        # Common data arrays
-        self.flow_x_data, self.flow_y_data = [], []
-        self.pressure_x_data, self.pressure_y_data = [], []
-        self.temp_x_data, self.temp_y_data = [], []
-        self.level_x_data, self.level_y_data = [], []
+        # Common data arrays (numpy-backed, reused across runs - see reset_buffers;
+        # loading an experiment replaces them with new buffers)
+        self.flow_x_data, self.flow_y_data = SampleBuffer(), SampleBuffer()
+        self.pressure_x_data, self.pressure_y_data = SampleBuffer(), SampleBuffer()
+        self.temp_x_data, self.temp_y_data = SampleBuffer(), SampleBuffer()
+        self.level_x_data, self.level_y_data = SampleBuffer(), SampleBuffer()
         
         # Lock for thread-safe access to data arrays (BUG FIX #1: Race Conditions)
         self.data_lock = threading.Lock()
@@ -48,6 +51,15 @@ class BaseTab(ctk.CTkFrame):
         kwargs.setdefault('hover_color', self.BLUE_BUTTON_HOVER)
         return ctk.CTkButton(parent, **kwargs)
     
+    def reset_buffers(self):
+        """
+        Empty the common data arrays, keeping their memory for the next run
+        Call with data_lock held
+        """
+        for buffer in (self.flow_x_data, self.flow_y_data, self.pressure_x_data, self.pressure_y_data,
+                       self.temp_x_data, self.temp_y_data, self.level_x_data, self.level_y_data):
+            buffer.clear()
+    
     def create_widgets(self):
         """
         Create tab widgets
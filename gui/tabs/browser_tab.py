@@ -5,14 +5,40 @@ Browser Tab - Experiment browser and comparison
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
 import os
-import glob
 import json
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from gui.tabs.base_tab import BaseTab
+from utils.data_handler import export_csv_to_excel
+from utils.sample_buffer import decimate
+
+
+# The only columns the browser plots - everything else in the CSV is skipped while parsing
+PLOT_COLUMNS = ('time', 'pump_flow_read', 'pressure_read', 'temp_read', 'level_read')
+
+# Experiment list rows created per event loop turn while the list is refreshed
+ROWS_PER_BATCH = 20
+
+
+def read_plot_columns(csv_file):
+    """
+    Read the plotted columns of an experiment CSV as float64
+    
+    Args:
+        csv_file: Path of the experiment CSV file
+    Returns:
+        DataFrame with the PLOT_COLUMNS present in the file. Non-numeric entries
+        (e.g. flow-change marker rows) become NaN.
+    """
+    import pandas as pd  # Deferred - only needed once an experiment is opened
+    
+    # usecols with a callable skips missing columns without reading the header first;
+    # data files start with '# key: value' metadata comment lines
+    df = pd.read_csv(csv_file, comment='#', usecols=lambda name: name in PLOT_COLUMNS, engine='c')
+    for column in df.columns:
+        if df[column].dtype.kind != 'f':
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+    return df
 
 
 class BrowserTab(BaseTab):
@@ -26,6 +52,10 @@ class BrowserTab(BaseTab):
         # Experiment list tracking
         self.experiment_buttons = []
         self.selected_experiments = []
+        # Parsed metadata per CSV path: {path: (csv mtime, metadata dict, formatted date)}
+        self._meta_cache = {}
+        # Incremented by each refresh - pending row batches of older refreshes stop
+        self._refresh_id = 0
         
         # Create widgets
         self.create_widgets()
@@ -80,70 +110,135 @@ class BrowserTab(BaseTab):
         self.selected_experiments.clear()
         
         # Scan data folder for CSV files and metadata
+        # One directory pass - DirEntry.stat() is cached (no extra stat on Windows), and the
+        # set of names answers "does the metadata file exist" without another stat
         data_folder = self.data_handler.data_folder
-        csv_files = glob.glob(os.path.join(data_folder, "*.csv"))
+        try:
+            with os.scandir(data_folder) as it:
+                entries = list(it)
+        except OSError:
+            entries = []
+        names = {entry.name for entry in entries}
         
         experiments = []
-        for csv_file in csv_files:
-            metadata_file = csv_file.replace('.csv', '_metadata.json')
-            metadata = {}
-            if os.path.exists(metadata_file):
-                try:
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                except:
-                    pass
+        meta_cache = {}
+        for entry in entries:
+            if not entry.name.endswith('.csv'):
+                continue
+            csv_file = os.path.join(data_folder, entry.name)
+            mtime = entry.stat().st_mtime
             
-            # Extract info from filename if no metadata
-            if not metadata:
-                basename = os.path.basename(csv_file)
-                metadata = {
-                    'name': basename.replace('.csv', ''),
-                    'description': '',
-                    'tags': [],
-                    'operator': '',
-                    'start_time': ''
-                }
+            # Reuse the parsed metadata if the CSV has not changed since the last refresh
+            cached = self._meta_cache.get(csv_file)
+            if cached is not None and cached[0] == mtime:
+                metadata, date_text = cached[1], cached[2]
+            else:
+                has_metadata_file = entry.name.replace('.csv', '_metadata.json') in names
+                metadata = self._read_metadata(csv_file, has_metadata_file)
+                date_text = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+            meta_cache[csv_file] = (mtime, metadata, date_text)
             
             experiments.append({
                 'file': csv_file,
                 'metadata': metadata,
-                'date': os.path.getmtime(csv_file)
+                'date': mtime,
+                'date_text': date_text
             })
+        # Only keep entries for files that still exist
+        self._meta_cache = meta_cache
         
         # Sort by date (newest first)
         experiments.sort(key=lambda x: x['date'], reverse=True)
         
-        # Create buttons for each experiment
-        for exp in experiments:
-            exp_frame = ctk.CTkFrame(self.exp_list_frame)
-            exp_frame.pack(fill='x', padx=5, pady=2)
-            
-            # Checkbox for selection
-            var = ctk.BooleanVar()
-            checkbox = ctk.CTkCheckBox(exp_frame, text="", variable=var)
-            checkbox.pack(side='left', padx=5)
-            
-            # Experiment info
-            info_text = f"{exp['metadata'].get('name', 'Unknown')}"
-            if exp['metadata'].get('description'):
-                info_text += f" - {exp['metadata']['description'][:50]}"
-            if exp['metadata'].get('tags'):
-                info_text += f" [Tags: {', '.join(exp['metadata']['tags'])}]"
-            
-            label = ctk.CTkLabel(exp_frame, text=info_text, anchor='w')
-            label.pack(side='left', fill='x', expand=True, padx=5)
-            
-            date_label = ctk.CTkLabel(exp_frame, text=datetime.fromtimestamp(exp['date']).strftime('%Y-%m-%d %H:%M'), width=150)
-            date_label.pack(side='right', padx=5)
-            
-            self.experiment_buttons.append({
-                'frame': exp_frame,
-                'checkbox': checkbox,
-                'var': var,
-                'file': exp['file'],
-                'metadata': exp['metadata']
-            })
+        # Create the rows in batches so Tk can handle events between them
+        self._refresh_id += 1
+        self._add_experiment_rows(experiments, 0, self._refresh_id)
+    
+    def _add_experiment_rows(self, experiments, start, refresh_id):
+        """
+        Create the list rows for one batch of experiments and schedule the next batch
+        
+        Args:
+            experiments: Sorted experiment dicts from refresh_experiments
+            start: Index of the first experiment in this batch
+            refresh_id: Refresh that scheduled this batch - stale batches are dropped
+        """
+        if refresh_id != self._refresh_id or not self.winfo_exists():
+            return
+        end = min(start + ROWS_PER_BATCH, len(experiments))
+        for exp in experiments[start:end]:
+            self._add_experiment_row(exp)
+        if end < len(experiments):
+            self.after(1, self._add_experiment_rows, experiments, end, refresh_id)
+    
+    def _add_experiment_row(self, exp):
+        """Create the list row (checkbox, info and date labels) for one experiment"""
+        exp_frame = ctk.CTkFrame(self.exp_list_frame)
+        exp_frame.pack(fill='x', padx=5, pady=2)
+        
+        # Checkbox for selection
+        var = ctk.BooleanVar()
+        checkbox = ctk.CTkCheckBox(exp_frame, text="", variable=var)
+        checkbox.pack(side='left', padx=5)
+        
+        # Experiment info
+        info_text = f"{exp['metadata'].get('name', 'Unknown')}"
+        if exp['metadata'].get('description'):
+            info_text += f" - {exp['metadata']['description'][:50]}"
+        if exp['metadata'].get('tags'):
+            info_text += f" [Tags: {', '.join(exp['metadata']['tags'])}]"
+        
+        label = ctk.CTkLabel(exp_frame, text=info_text, anchor='w')
+        label.pack(side='left', fill='x', expand=True, padx=5)
+        
+        date_label = ctk.CTkLabel(exp_frame, text=exp['date_text'], width=150)
+        date_label.pack(side='right', padx=5)
+        
+        # Lowercased search text, built once here instead of on every keystroke
+        metadata = exp['metadata']
+        tags = [tag.lower() for tag in metadata.get('tags', [])]
+        self.experiment_buttons.append({
+            'frame': exp_frame,
+            'checkbox': checkbox,
+            'var': var,
+            'file': exp['file'],
+            'metadata': metadata,
+            'visible': True,
+            'name_lower': metadata.get('name', '').lower(),
+            'desc_lower': metadata.get('description', '').lower(),
+            'tags_lower': (','.join(tags), ' '.join(tags))
+        })
+    
+    def _read_metadata(self, csv_file, has_metadata_file=True):
+        """
+        Read the metadata of an experiment
+        
+        Args:
+            csv_file: Path of the experiment CSV file
+            has_metadata_file: False if the caller already knows there is no _metadata.json file
+        Returns:
+            Metadata dict from the _metadata.json file, or one built from the filename
+        """
+        metadata_file = csv_file.replace('.csv', '_metadata.json')
+        metadata = {}
+        if has_metadata_file:
+            try:
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f)
+            except:
+                pass
+        
+        # Extract info from filename if no metadata
+        if not metadata:
+            basename = os.path.basename(csv_file)
+            metadata = {
+                'name': basename.replace('.csv', ''),
+                'description': '',
+                'tags': [],
+                'operator': '',
+                'start_time': ''
+            }
+        return metadata
     
     def filter_experiments(self):
         """Filter experiments based on search and tag filters"""
@@ -153,16 +248,18 @@ class BrowserTab(BaseTab):
         for exp_btn in self.experiment_buttons:
             visible = True
             if search_term:
-                name = exp_btn['metadata'].get('name', '').lower()
-                desc = exp_btn['metadata'].get('description', '').lower()
-                if search_term not in name and search_term not in desc:
+                if search_term not in exp_btn['name_lower'] and search_term not in exp_btn['desc_lower']:
                     visible = False
             
             if visible and tag_filter:
-                tags = [tag.lower() for tag in exp_btn['metadata'].get('tags', [])]
-                if tag_filter not in ','.join(tags) and tag_filter not in ' '.join(tags):
+                comma_tags, space_tags = exp_btn['tags_lower']
+                if tag_filter not in comma_tags and tag_filter not in space_tags:
                     visible = False
             
+            # Only touch the geometry manager when the row is shown or hidden
+            if visible == exp_btn['visible']:
+                continue
+            exp_btn['visible'] = visible
             if visible:
                 exp_btn['frame'].pack(fill='x', padx=5, pady=2)
             else:
@@ -181,42 +278,25 @@ class BrowserTab(BaseTab):
         
         exp = selected[0]
         try:
-            df = pd.read_csv(exp['file'])
+            df = read_plot_columns(exp['file'])
             
-            # Load data into arrays (these will be shared with MainTab via update_queue)
-            # BUG FIX #1: Thread-safe update with lock
-            with self.data_lock:
-                if 'time' in df.columns:
-                    time_data = df['time'].tolist()
-                    if 'pump_flow_read' in df.columns:
-                        self.flow_x_data = time_data.copy()
-                        self.flow_y_data = df['pump_flow_read'].tolist()
-                    if 'pressure_read' in df.columns:
-                        self.pressure_x_data = time_data.copy()
-                        self.pressure_y_data = df['pressure_read'].tolist()
-                    if 'temp_read' in df.columns:
-                        self.temp_x_data = time_data.copy()
-                        self.temp_y_data = df['temp_read'].tolist()
-                    if 'level_read' in df.columns:
-                        self.level_x_data = time_data.copy()
-                        self.level_y_data = (df['level_read'] * 100).tolist()
-                
-                # Make copies for queue
-                flow_x_copy = list(self.flow_x_data)
-                flow_y_copy = list(self.flow_y_data)
-                pressure_x_copy = list(self.pressure_x_data)
-                pressure_y_copy = list(self.pressure_y_data)
-                temp_x_copy = list(self.temp_x_data)
-                temp_y_copy = list(self.temp_y_data)
-                level_x_copy = list(self.level_x_data)
-                level_y_copy = list(self.level_y_data)
+            # Load data as numpy arrays and send them to MainTab via update_queue.
+            # The series share one time array - MainTab copies each into its own buffer.
+            graph_data = {}
+            if 'time' in df.columns:
+                time_data = df['time'].to_numpy()
+                if 'pump_flow_read' in df.columns:
+                    graph_data['flow'] = (time_data, df['pump_flow_read'].to_numpy())
+                if 'pressure_read' in df.columns:
+                    graph_data['pressure'] = (time_data, df['pressure_read'].to_numpy())
+                if 'temp_read' in df.columns:
+                    graph_data['temp'] = (time_data, df['temp_read'].to_numpy())
+                if 'level_read' in df.columns:
+                    graph_data['level'] = (time_data, df['level_read'].to_numpy() * 100)
             
-            # Update graphs via queue (MainTab will handle this)
-            if self.update_queue:
-                self.update_queue.put(('UPDATE_GRAPH1', (flow_x_copy, flow_y_copy)))
-                self.update_queue.put(('UPDATE_GRAPH2', (pressure_x_copy, pressure_y_copy)))
-                self.update_queue.put(('UPDATE_GRAPH3', (temp_x_copy, temp_y_copy)))
-                self.update_queue.put(('UPDATE_GRAPH4', (level_x_copy, level_y_copy)))
+            # Update graphs via queue (MainTab will handle this) - one message for all series
+            if self.update_queue and graph_data:
+                self.update_queue.put(('UPDATE_ALL', graph_data))
             
             messagebox.showinfo('Success', f"Loaded experiment: {exp['metadata'].get('name', 'Unknown')}")
         except Exception as e:
@@ -229,6 +309,10 @@ class BrowserTab(BaseTab):
             messagebox.showwarning('Warning', 'Please select at least 2 experiments to compare.')
             return
         
+        # Deferred - building the tab should not pay for matplotlib until a comparison is made
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         try:
             # Create comparison window
             compare_window = ctk.CTkToplevel(self)
@@ -236,34 +320,36 @@ class BrowserTab(BaseTab):
             compare_window.geometry('1200x800')
             
             # Create comparison graph
-            fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+            fig = Figure(figsize=(12, 8))
+            axes = fig.subplots(2, 2)
             axes = axes.flatten()
             
             colors = ['#2E86AB', '#A23B72', '#F18F01', '#06A77D', '#C73E1D']
             
             for idx, exp in enumerate(selected[:5]):  # Limit to 5 experiments
-                df = pd.read_csv(exp['file'])
+                df = read_plot_columns(exp['file'])
                 color = colors[idx % len(colors)]
                 name = exp['metadata'].get('name', f'Experiment {idx+1}')
                 
                 if 'time' in df.columns:
-                    time_data = df['time'].tolist()
+                    time_data = df['time'].to_numpy()
                     
+                    # Long runs are decimated to ~2000 points per series before plotting
                     # Flow
                     if 'pump_flow_read' in df.columns:
-                        axes[0].plot(time_data, df['pump_flow_read'], label=name, color=color, alpha=0.7)
+                        axes[0].plot(*decimate(time_data, df['pump_flow_read'].to_numpy()), label=name, color=color, alpha=0.7)
                     
                     # Pressure
                     if 'pressure_read' in df.columns:
-                        axes[1].plot(time_data, df['pressure_read'], label=name, color=color, alpha=0.7)
+                        axes[1].plot(*decimate(time_data, df['pressure_read'].to_numpy()), label=name, color=color, alpha=0.7)
                     
                     # Temperature
                     if 'temp_read' in df.columns:
-                        axes[2].plot(time_data, df['temp_read'], label=name, color=color, alpha=0.7)
+                        axes[2].plot(*decimate(time_data, df['temp_read'].to_numpy()), label=name, color=color, alpha=0.7)
                     
                     # Level
                     if 'level_read' in df.columns:
-                        axes[3].plot(time_data, df['level_read'] * 100, label=name, color=color, alpha=0.7)
+                        axes[3].plot(*decimate(time_data, df['level_read'].to_numpy() * 100), label=name, color=color, alpha=0.7)
             
             # Configure axes
             titles = ['Flow Rate (ml/min)', 'Pressure (bar)', 'Temperature (°C)', 'Level (%)']
@@ -299,11 +385,11 @@ class BrowserTab(BaseTab):
             if filename:
                 import shutil
                 if filename.endswith('.csv'):
-                    shutil.copy(selected[0]['file'], filename)
+                    # Data only - no permission bits to copy
+                    shutil.copyfile(selected[0]['file'], filename)
                 else:
-                    # Read CSV and export to Excel
-                    df = pd.read_csv(selected[0]['file'])
-                    df.to_excel(filename, index=False)
+                    # Stream the CSV into Excel row by row
+                    export_csv_to_excel(selected[0]['file'], filename)
                 messagebox.showinfo('Success', 'Experiment exported successfully!')
         except Exception as e:
             messagebox.showerror('Error', f"Error exporting experiment: {e}")
@@ -4,10 +4,23 @@ IV Write Program Tab - Define voltage jumps programmatically
 
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
+import logging
 import threading
 import time
 
 from gui.tabs.base_tab import BaseTab
+from utils.sample_buffer import SampleBuffer
+from utils.background_writer import BackgroundWriter
+from utils.data_handler import IV_PROGRAM_FIELDNAMES
+from utils.iv_program import RAMP_TOLERANCE, ramp_voltages, parse_program_targets
+from config.settings import GUI_UPDATE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# IV graph updates are sent in batches: when this many points are pending,
+# or when IV_GRAPH_INTERVAL seconds have passed since the last update (20 Hz)
+IV_GRAPH_BATCH_SIZE = 20
+IV_GRAPH_INTERVAL = 0.05
 
 
 class IVProgramTab(BaseTab):
@@ -19,10 +32,25 @@ class IVProgramTab(BaseTab):
     def __init__(self, parent, hw_controller, data_handler, exp_manager, update_queue=None):
         super().__init__(parent, hw_controller, data_handler, exp_manager, update_queue)
         self.iv_step_running = False
-        self.iv_stop_requested = False
+        # Set by stop_program - also wakes the program thread from its sample wait
+        self._stop_event = threading.Event()
         self.iv_thread = None
-        self.iv_voltages = []
-        self.iv_currents = []
+        # Run history as float64 arrays (reused across runs)
+        self.iv_voltages = SampleBuffer()
+        self.iv_currents = SampleBuffer()
+        # Number of points already sent to the IV graph (only touched by the program thread)
+        self._graph_sent_count = 0
+        self._last_graph_update = 0.0
+        self._graph_sent = False  # False until the first batch of a run replaces the graph data
+        # Last parsed program text and its target voltages (see get_program_targets)
+        self._parsed_program_text = None
+        self._parsed_targets = []
+        # Latest status text/color and whether a label update is already scheduled
+        self._pending_status = ('Ready', 'black')
+        self._status_scheduled = False
+        # Rows are written in batches from a separate thread, off the sample timing path.
+        # Written row dicts are handed back and refilled instead of built per sample
+        self.writer = BackgroundWriter(data_handler, recycle_rows=True)
         self.create_widgets()
 
     def create_widgets(self):
@@ -104,61 +132,75 @@ class IVProgramTab(BaseTab):
 
     def parse_program(self, program_text):
         """Parse the user-defined I-V program (targets only)."""
-        targets = []
-        for line in program_text.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if ':' not in line:
-                continue
-            try:
-                _, body = line.split(':', 1)
-                kv_pairs = [part.strip() for part in body.split(',') if '=' in part]
-                for part in kv_pairs:
-                    key, value = part.split('=', 1)
-                    if key.strip().lower() == 'voltage':
-                        targets.append(float(value.strip()))
-                        break
-            except ValueError as err:
-                print(f"Skipping line due to parse error: {line} ({err})")
-                continue
-        return targets
+        return parse_program_targets(program_text)
+
+    def get_program_targets(self, program_text):
+        """Target voltages of the program text - parsed again only when the text has changed."""
+        if program_text != self._parsed_program_text:
+            self._parsed_targets = self.parse_program(program_text)
+            self._parsed_program_text = program_text
+        # Copy, so the caller cannot modify the cached list
+        return list(self._parsed_targets)
+
+    def _read_program_targets(self):
+        """Target voltages of the editor program - the text is only read again after an edit."""
+        # Tk sets the modified flag on every insert/delete, including load_program
+        if self._parsed_program_text is None or self.program_editor.edit_modified():
+            program_text = self.program_editor.get('1.0', 'end-1c')
+            self.program_editor.edit_modified(False)
+            return self.get_program_targets(program_text)
+        return list(self._parsed_targets)
+
+    def _read_entry_value(self, entry, error_message, positive=False):
+        """
+        Read a number from an entry field
+
+        Returns:
+            The value, or None after showing error_message if the entry is invalid
+        """
+        try:
+            value = float(entry.get())
+        except ValueError:
+            value = None
+        if value is None or (positive and value <= 0):
+            messagebox.showerror('Error', error_message)
+            return None
+        return value
 
     def run_program(self):
         """Run the IV write program."""
         if self.iv_step_running:
             messagebox.showinfo('In progress', 'IV program already running.')
             return
-        program_text = self.program_editor.get('1.0', 'end-1c')
-        targets = self.parse_program(program_text)
+        targets = self._read_program_targets()
         if not targets:
             messagebox.showerror('Error', 'No valid target voltages found. Define at least one voltage.')
             return
-        try:
-            current_limit = float(self.current_limit_entry.get())
-        except ValueError:
-            messagebox.showerror('Error', 'Invalid current limit.')
+        # Stops at the first invalid field (one error dialog)
+        current_limit = self._read_entry_value(self.current_limit_entry, 'Invalid current limit.')
+        if current_limit is None:
             return
-        try:
-            jump_size = float(self.jump_size_entry.get())
-            if jump_size <= 0:
-                raise ValueError("Jump size must be positive")
-        except ValueError:
-            messagebox.showerror('Error', 'Invalid jump size.')
+        jump_size = self._read_entry_value(self.jump_size_entry, 'Invalid jump size.', positive=True)
+        if jump_size is None:
             return
-        try:
-            sample_rate = float(self.sample_rate_entry.get())
-            if sample_rate <= 0:
-                raise ValueError("Sample rate must be positive")
-        except ValueError:
-            messagebox.showerror('Error', 'Invalid samples/sec.')
+        sample_rate = self._read_entry_value(self.sample_rate_entry, 'Invalid samples/sec.', positive=True)
+        if sample_rate is None:
             return
-        self.iv_stop_requested = False
+        self._stop_event.clear()
         self.iv_step_running = True
         self.iv_voltages.clear()
         self.iv_currents.clear()
-        self.data_handler.create_new_file()
+        self._graph_sent_count = 0
+        self._graph_sent = False
+        # Only the columns the program records - no empty flow/sensor fields per row
+        self.data_handler.create_new_file(IV_PROGRAM_FIELDNAMES)
+        self.writer.start()
         self.exp_manager.is_running = True
+        if self.update_queue:
+            # Poll the queue at twice the sample rate while running - not faster than graph
+            # batches are sent, not slower than the normal GUI polling
+            poll_ms = min(GUI_UPDATE_INTERVAL, max(int(IV_GRAPH_INTERVAL * 1000), int(500 / sample_rate)))
+            self.update_queue.put(('SET_POLL_MS', poll_ms))
         self.update_status('Running I-V program…', 'orange')
         self.iv_thread = threading.Thread(
             target=self._run_program_thread,
@@ -169,7 +211,7 @@ class IVProgramTab(BaseTab):
 
     def stop_program(self):
         """Stop the running IV program."""
-        self.iv_stop_requested = True
+        self._stop_event.set()
         if self.iv_step_running:
             self.update_status('Stopping program…', 'orange')
         self.exp_manager.stop_experiment()
@@ -177,97 +219,186 @@ class IVProgramTab(BaseTab):
     def _run_program_thread(self, targets, current_limit, jump_size, sample_rate):
         """Thread worker for running the IV program."""
         sample_interval = max(0.02, 1.0 / sample_rate)
+        # The SMU cannot appear or disappear during a run - choose the calls once, not per sample.
+        # Without an SMU the setpoints are recorded with zero current.
+        hw = self.hw_controller
+        if hw.smu:
+            set_voltage = hw.set_smu_voltage
+            measure = hw.measure_smu
+        else:
+            set_voltage = lambda voltage, current_limit: None
+            measure = lambda source_value=None: None
+        wait_for_sample = self._wait_for_sample
+        stop_event = self._stop_event
         try:
-            if self.hw_controller.smu:
-                self.hw_controller.setup_smu_for_iv_measurement(current_limit)
-            program_start_time = time.time()
+            if hw.smu:
+                hw.setup_smu_for_iv_measurement(current_limit)
+            # Monotonic clock for timestamps and sample deadlines (time.time() can jump with NTP)
+            program_start_time = time.perf_counter()
+            next_sample = program_start_time + sample_interval
+            record = self._make_recorder(program_start_time)
             current_voltage = None
-            measurement = self.hw_controller.measure_smu() if self.hw_controller.smu else None
+            measurement = measure()
             if measurement:
                 current_voltage = measurement['voltage']
             else:
                 current_voltage = targets[0]
 
-            for idx, target_voltage in enumerate(targets):
-                if self.iv_stop_requested:
+            step_labels = [f"{idx+1}/{len(targets)}" for idx in range(len(targets))]
+            for target_voltage, step_label in zip(targets, step_labels):
+                if stop_event.is_set():
                     break
-                step_label = f"{idx+1}/{len(targets)}"
-                direction = 1 if target_voltage > current_voltage else -1
-                while not self.iv_stop_requested and (
-                    (direction > 0 and current_voltage < target_voltage - 1e-6) or
-                    (direction < 0 and current_voltage > target_voltage + 1e-6)
-                ):
-                    next_voltage = current_voltage + direction * jump_size
-                    if direction > 0:
-                        next_voltage = min(next_voltage, target_voltage)
-                    else:
-                        next_voltage = max(next_voltage, target_voltage)
-                    if self.hw_controller.smu:
-                        self.hw_controller.set_smu_voltage(next_voltage, current_limit)
-                    time.sleep(sample_interval)
-                    measurement = self.hw_controller.measure_smu()
+                # The whole ramp to this target, computed in one numpy call
+                ramp_recorded = False
+                for next_voltage in ramp_voltages(current_voltage, target_voltage, jump_size).tolist():
+                    if stop_event.is_set():
+                        break
+                    set_voltage(next_voltage, current_limit)
+                    next_sample = wait_for_sample(next_sample, sample_interval)
+                    if stop_event.is_set():
+                        break
+                    measurement = measure(source_value=next_voltage)
                     measured_voltage = measurement['voltage'] if measurement else next_voltage
                     current_reading = measurement['current'] if measurement else 0.0
                     current_voltage = measured_voltage
-                    self._record_iv_measurement(
-                        program_start_time, step_label, target_voltage,
-                        measured_voltage, current_reading
-                    )
-                if self.iv_stop_requested:
+                    record(step_label, target_voltage, measured_voltage, current_reading)
+                    ramp_recorded = True
+                if stop_event.is_set():
+                    break
+                if ramp_recorded and abs(current_voltage - target_voltage) <= RAMP_TOLERANCE:
+                    # The last ramp sample was already taken at the target
+                    continue
+                set_voltage(target_voltage, current_limit)
+                next_sample = wait_for_sample(next_sample, sample_interval)
+                if stop_event.is_set():
                     break
-                if self.hw_controller.smu:
-                    self.hw_controller.set_smu_voltage(target_voltage, current_limit)
-                time.sleep(sample_interval)
-                measurement = self.hw_controller.measure_smu()
+                measurement = measure(source_value=target_voltage)
                 measured_voltage = measurement['voltage'] if measurement else target_voltage
                 current_reading = measurement['current'] if measurement else 0.0
                 current_voltage = measured_voltage
-                self._record_iv_measurement(
-                    program_start_time, step_label, target_voltage,
-                    measured_voltage, current_reading
-                )
+                record(step_label, target_voltage, measured_voltage, current_reading)
         except Exception as exc:
-            print(f"Error running IV program: {exc}")
-            self.update_status('Error during run', 'red')
+            logger.error("Error running IV program: %s", exc)
+            self._post_status('Error during run', 'red')
+            if self.update_queue:
+                # The dialog is opened by the GUI thread - this thread never calls Tk directly
+                self.update_queue.put(('SHOW_ERROR', f"Error running IV program: {exc}"))
         finally:
-            self.iv_step_running = False
-            self.iv_stop_requested = False
+            self._stop_event.clear()
             self.exp_manager.is_running = False
+            # Write the queued rows before the file is closed
+            self.writer.stop()
             try:
                 self.data_handler.close_file()
             except Exception as err:
                 print(f"Error closing IV program file: {err}")
             self.hw_controller.stop_smu()
-            self.update_status('Ready', 'green')
+            self._post_status('Ready', 'green')
             if self.update_queue:
+                self._flush_graph_points()
+                # Refit the IV graph - live updates leave extra axis margin
+                self.update_queue.put(('UPDATE_IV_TIME_GRAPH', None))
+                self.update_queue.put(('SET_POLL_MS', None))
                 self.update_queue.put(('UPDATE_IV_STATUS', ('Ready', 'green')))
                 self.update_queue.put(('UPDATE_IV_STATUS_BAR', 'I-V program completed.'))
+            # Cleared last - a new run must not start while this one still owns the writer and the file
+            self.iv_step_running = False
 
-    def _record_iv_measurement(self, start_time, step_label, target_voltage, measured_voltage, current_reading):
-        timestamp = time.time() - start_time
-        self.iv_voltages.append(measured_voltage)
-        self.iv_currents.append(current_reading)
-        data_point = {
-            "time": timestamp,
-            "flow_setpoint": "",
-            "pump_flow_read": "",
-            "pressure_read": "",
-            "temp_read": "",
-            "level_read": "",
-            "program_step": step_label,
-            "voltage": measured_voltage,
-            "current": current_reading,
-            "target_voltage": target_voltage
-        }
-        self.data_handler.append_data(data_point)
-        if self.update_queue:
-            self.update_queue.put(('UPDATE_IV_GRAPH', (list(self.iv_voltages), list(self.iv_currents))))
-            self.update_queue.put(('UPDATE_IV_STATUS_BAR',
-                                   f"Target {target_voltage:.3f} V ({step_label}): {measured_voltage:.3f} V, {current_reading:.3e} A"))
+    def _wait_for_sample(self, deadline, interval):
+        """
+        Sleep until the sample deadline and return the next one
+        Samples stay on a fixed grid - the time spent in SMU calls is not added to the interval
+
+        Args:
+            deadline: perf_counter time of this sample
+            interval: Seconds between samples
+        Returns:
+            Deadline of the next sample
+        """
+        now = time.perf_counter()
+        if deadline > now:
+            # Returns early if stop_program sets the stop event
+            self._stop_event.wait(deadline - now)
+        deadline += interval
+        if deadline < now:
+            # Fell more than one interval behind - restart the grid instead of bursting
+            deadline = now + interval
+        return deadline
+
+    def _make_recorder(self, start_time):
+        """
+        Build the per-sample record function for one run
+
+        The buffers, writer and queue are bound once as closure variables instead of
+        being looked up on the tab for every sample.
+
+        Args:
+            start_time: perf_counter time the run started (timestamps are relative to it)
+        Returns:
+            record(step_label, target_voltage, measured_voltage, current_reading)
+        """
+        clock = time.perf_counter
+        monotonic = time.monotonic
+        voltages = self.iv_voltages
+        append_voltage = voltages.append
+        append_current = self.iv_currents.append
+        get_row = self.writer.get_row
+        put_row = self.writer.put
+        update_queue = self.update_queue
+
+        def record(step_label, target_voltage, measured_voltage, current_reading):
+            timestamp = clock() - start_time
+            append_voltage(measured_voltage)
+            append_current(current_reading)
+            # Every key is assigned, so a recycled row carries nothing over from its last use
+            row = get_row()
+            row["time"] = timestamp
+            row["program_step"] = step_label
+            row["voltage"] = measured_voltage
+            row["current"] = current_reading
+            row["target_voltage"] = target_voltage
+            put_row(row)
+            if update_queue:
+                if (len(voltages) - self._graph_sent_count >= IV_GRAPH_BATCH_SIZE or
+                        monotonic() - self._last_graph_update >= IV_GRAPH_INTERVAL):
+                    self._flush_graph_points()
+                    update_queue.put(('UPDATE_IV_STATUS_BAR',
+                                      f"Target {target_voltage:.3f} V ({step_label}): {measured_voltage:.3f} V, {current_reading:.3e} A"))
+
+        return record
+
+    def _flush_graph_points(self):
+        """Send the pending points to the IV graph - only the new points, not the whole run"""
+        start, end = self._graph_sent_count, len(self.iv_voltages)
+        if end == start:
+            return
+        # The first batch of a run replaces the graph data, later batches are appended.
+        # Small array copies of the new points - the buffers are reused by the next run
+        update_type = 'UPDATE_IV_GRAPH_APPEND' if self._graph_sent else 'UPDATE_IV_GRAPH'
+        self.update_queue.put((update_type, (self.iv_voltages.view()[start:end].copy(),
+                                             self.iv_currents.view()[start:end].copy())))
+        self._graph_sent_count = end
+        self._graph_sent = True
+        self._last_graph_update = time.monotonic()
 
     def update_status(self, text, color='black'):
         """Update the status label from any thread."""
-        def updater():
-            self.program_status_label.configure(text=text, text_color=color)
-        self.after(0, updater)
+        # Only the latest status is shown - a burst of calls schedules a single Tk callback
+        self._pending_status = (text, color)
+        if not self._status_scheduled:
+            self._status_scheduled = True
+            self.after_idle(self._drain_status)
+
+    def _post_status(self, text, color):
+        """Update the status label from the program thread (through update_queue if available)."""
+        if self.update_queue:
+            self.update_queue.put(('UPDATE_IV_PROGRAM_STATUS', (text, color)))
+        else:
+            self.update_status(text, color)
+
+    def _drain_status(self):
+        """Show the latest pending status (runs on the Tk thread)."""
+        self._status_scheduled = False
+        text, color = self._pending_status
+        self.program_status_label.configure(text=text, text_color=color)
 
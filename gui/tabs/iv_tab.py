@@ -4,13 +4,43 @@ IV Tab - I-V measurement and characterization
 
 import customtkinter as ctk
 from tkinter import PanedWindow, Frame, messagebox, filedialog
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import logging
 import threading
+import queue
+import pickle
 import time
 import os
+from bisect import bisect_right
+import numpy as np
 
 from gui.tabs.base_tab import BaseTab
+from utils.sample_buffer import SampleBuffer
+from utils.lttb import lttb
+from utils.iv_statistics import iv_statistics
+from utils.background_writer import BackgroundWriter
+from experiments.experiment_types.iv_experiment import compute_voltage_points
+
+logger = logging.getLogger(__name__)
+
+# SMU-timed sweep: buffer poll period and how long without a new reading counts as stalled (s)
+HARDWARE_SWEEP_POLL_INTERVAL = 0.1
+HARDWARE_SWEEP_STALL_TIMEOUT = 10.0
+
+# Minimum time between live graph updates during a sweep (s) - fast sweeps do not flood the GUI
+GRAPH_UPDATE_MIN_INTERVAL = 0.05
+
+# SI unit tables for get_si_unit_label - UNITS[i] applies below THRESHOLDS[i]
+VOLTAGE_THRESHOLDS = (1e-9, 1e-6, 1e-3, 1, 1e3)
+VOLTAGE_UNITS = (('pV', 1e12), ('nV', 1e9), ('µV', 1e6), ('mV', 1e3), ('V', 1), ('kV', 1e-3))
+CURRENT_THRESHOLDS = (1e-9, 1e-6, 1e-3, 1)
+CURRENT_UNITS = (('pA', 1e12), ('nA', 1e9), ('µA', 1e6), ('mA', 1e3), ('A', 1))
+RESISTANCE_THRESHOLDS = (1e-3, 1, 1e3, 1e6)
+RESISTANCE_UNITS = (('µΩ', 1e6), ('mΩ', 1e3), ('Ω', 1), ('kΩ', 1e-3), ('MΩ', 1e-6))
+
+# Decimals of the live readout labels (the unit keeps the scaled value in 0.1 - 1e4)
+READOUT_DECIMALS = {'voltage': 3, 'current': 3, 'resistance': 2}
 
 
 class IVTab(BaseTab):
@@ -22,10 +52,28 @@ class IVTab(BaseTab):
         super().__init__(parent, hw_controller, data_handler, exp_manager, update_queue)
         
         # IV-specific data arrays
-        self.iv_x_data, self.iv_y_data = [], []
-        self.iv_time_x_data, self.iv_time_v_data, self.iv_time_i_data = [], [], []
-        self.iv_measurement_start_time = None
+        # Sweep data as growable float64 arrays (cleared and reused for each sweep)
+        self.iv_x_data, self.iv_y_data = SampleBuffer(), SampleBuffer()
+        self.iv_time_x_data, self.iv_time_v_data, self.iv_time_i_data = SampleBuffer(), SampleBuffer(), SampleBuffer()
+        self.iv_measurement_start_ns = None  # time.monotonic_ns() at the sweep start
         self.iv_measurement_stop = False  # Flag to stop measurement
+        self.plot_decim = 5  # Send a graph update every N sweep points (the last point is always sent)
+        # Live readout formatters - unit_type -> closure with its unit and scale bound in
+        self._fmt = {unit_type: self._make_fmt(unit_type, *self.get_si_unit_label(1, unit_type))
+                     for unit_type in READOUT_DECIMALS}
+        self._iv_sweep_range = None  # (min V, max V) of the running sweep - fixes the voltage axis
+        self._axis_max_abs = {}  # SampleBuffer -> (generation, length, max |value|) for the axis units
+        
+        # One long-lived worker runs every job that talks to the SMU or VISA (sweeps, manual
+        # measurements, detect/refresh, the VISA device scan) in order, so two of them never
+        # use the instrument at the same time
+        self._job_queue = queue.Queue()
+        threading.Thread(target=self._job_worker, daemon=True).start()
+        
+        # VISA device list window (filled in by a background scan)
+        self._visa_window = None
+        self._visa_textbox = None
+        self._visa_scan_running = False
         
         # Temperature sensor channel (ai1 is already used for temperature in hardware_controller)
         self.temp_sensor_channel = 'ai1'  # Using ai1 which is the temperature sensor channel
@@ -194,6 +242,16 @@ class IVTab(BaseTab):
         ctk.CTkRadioButton(valve_btn_frame, text="Main", variable=self.iv_valve_var, value="main").pack(side='left', padx=5)
         ctk.CTkRadioButton(valve_btn_frame, text="Rinsing", variable=self.iv_valve_var, value="rinsing").pack(side='left', padx=5)
         
+        ctk.CTkLabel(params_grid, text='Plot every (pts):', width=120).grid(row=6, column=0, padx=5, pady=2)
+        self.iv_plot_decim_entry = ctk.CTkEntry(params_grid, width=150)
+        self.iv_plot_decim_entry.insert(0, str(self.plot_decim))
+        self.iv_plot_decim_entry.grid(row=6, column=1, padx=5, pady=2)
+        
+        # Instrument-timed sweep: much faster for many points, but no per-point MCusb reading
+        self.iv_hardware_sweep_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(params_grid, text='SMU-timed sweep', variable=self.iv_hardware_sweep_var).grid(
+            row=7, column=0, columnspan=2, padx=5, pady=2, sticky='w')
+        
         # Quick Control
         quick_frame = ctk.CTkFrame(left_frame)
         quick_frame.pack(fill='x', pady=5)
@@ -346,20 +404,33 @@ class IVTab(BaseTab):
     def setup_graphs(self):
         """Initialize IV graph"""
         # IV graph
-        self.iv_fig, self.iv_ax = plt.subplots(figsize=(8, 6))
-        self.iv_ax.set_xlabel("Voltage (V)", color='black', fontsize=12)
-        self.iv_ax.set_ylabel("Current (A)", color='black', fontsize=12)
-        self.iv_ax.set_title("I-V Characteristic", color='black', fontsize=14, fontweight='bold', pad=15)
+        self.iv_fig = Figure(figsize=(8, 6))
+        self.iv_ax = self.iv_fig.subplots()
+        # Styling is set once here - plot_iv_xy_graph only changes the label texts, data and limits
+        self.iv_ax.set_xlabel("Voltage (V)", color='black', fontsize=11)
+        self.iv_ax.set_ylabel("Current (A)", color='black', fontsize=11)
+        self.iv_ax.set_title("I-V Characteristic", color='black', fontsize=12, fontweight='bold', pad=12)
         self.iv_ax.set_facecolor('white')
-        self.iv_ax.grid(True, alpha=0.4, color='gray', linestyle='-', linewidth=0.5)
+        self.iv_ax.grid(True, alpha=0.4, color='gray', linestyle='-', linewidth=0.5, which='both')
         self.iv_ax.set_axisbelow(True)
-        self.iv_ax.tick_params(colors='black', labelsize=10)
+        self.iv_ax.tick_params(colors='black', labelsize=9)
         for spine in self.iv_ax.spines.values():
             spine.set_color('black')
             spine.set_linewidth(1)
         
+        # The one data line - updates only call set_data on it.
+        # Animated: drawn by _on_iv_draw, so it is not part of the cached background
+        self.iv_line, = self.iv_ax.plot([], [], color='#C73E1D', linewidth=2.5, alpha=0.85, animated=True)
+        
         # Create canvas for IV graph
         self.iv_canvas = FigureCanvasTkAgg(self.iv_fig, self.iv_graph_frame)
+        # Live updates blit only the data line onto a cached background
+        self._iv_background = None
+        self._iv_plot_layout = None  # (x axis, y axis, x label, y label) of the last full draw
+        # Data fingerprints of the last full redraw / live update - unchanged data is not drawn again
+        self._iv_plot_fingerprint = None
+        self._iv_blit_fingerprint = None
+        self.iv_canvas.mpl_connect('draw_event', self._on_iv_draw)
         self.iv_canvas.draw()
         self.iv_canvas.get_tk_widget().pack(side='top', fill='both', expand=1)
         
@@ -373,38 +444,53 @@ class IVTab(BaseTab):
         abs_value = abs(value) if value != 0 else 1e-9
         
         if unit_type == 'voltage':
-            if abs_value >= 1e3:
-                return ('kV', 1e-3)
-            elif abs_value >= 1:
-                return ('V', 1)
-            elif abs_value >= 1e-3:
-                return ('mV', 1e3)
-            elif abs_value >= 1e-6:
-                return ('µV', 1e6)
-            elif abs_value >= 1e-9:
-                return ('nV', 1e9)
-            else:
-                return ('pV', 1e12)
+            return VOLTAGE_UNITS[bisect_right(VOLTAGE_THRESHOLDS, abs_value)]
+        elif unit_type == 'resistance':
+            return RESISTANCE_UNITS[bisect_right(RESISTANCE_THRESHOLDS, abs_value)]
         else:  # current
-            if abs_value >= 1:
-                return ('A', 1)
-            elif abs_value >= 1e-3:
-                return ('mA', 1e3)
-            elif abs_value >= 1e-6:
-                return ('µA', 1e6)
-            elif abs_value >= 1e-9:
-                return ('nA', 1e9)
-            else:
-                return ('pA', 1e12)
+            return CURRENT_UNITS[bisect_right(CURRENT_THRESHOLDS, abs_value)]
     
     def get_axis_unit_label(self, data, unit_type='voltage'):
         """Get appropriate SI unit label based on data range"""
-        if not data or len(data) == 0:
+        if data is None or len(data) == 0:
             return ('V', 1) if unit_type == 'voltage' else ('A', 1)
         
-        max_abs = max(abs(min(data)), abs(max(data))) if data else 1e-9
+        # fmin/fmax skip NaN (failed readings) without a temporary array - two passes in C
+        data = np.asarray(data, dtype=np.float64)
+        max_abs = max(abs(np.fmin.reduce(data)), abs(np.fmax.reduce(data)))
+        if np.isnan(max_abs):  # Only failed readings
+            return ('V', 1) if unit_type == 'voltage' else ('A', 1)
         return self.get_si_unit_label(max_abs, unit_type)
     
+    def _buffer_axis_unit(self, buffer, unit_type):
+        """
+        Axis unit for a SampleBuffer - same result as get_axis_unit_label on its data.
+        The largest |value| is kept per buffer, so after appends only the new points are scanned.
+        """
+        generation = buffer.generation  # Read before the length - a clear() in between forces a full scan
+        n = len(buffer)
+        cached = self._axis_max_abs.get(buffer)
+        if cached is not None and cached[0] == generation and cached[1] <= n:
+            # Same contents plus appended points - reduce only the tail
+            start, max_abs = cached[1], cached[2]
+        else:
+            start, max_abs = 0, np.nan
+        tail = buffer.view()[start:n]
+        if len(tail):
+            # fmin/fmax skip NaN (failed readings)
+            max_abs = np.fmax(max_abs, max(abs(np.fmin.reduce(tail)), abs(np.fmax.reduce(tail))))
+        self._axis_max_abs[buffer] = (generation, n, max_abs)
+        if np.isnan(max_abs):  # No data or only failed readings
+            return ('V', 1) if unit_type == 'voltage' else ('A', 1)
+        return self.get_si_unit_label(max_abs, unit_type)
+    
+    def _voltage_axis_unit(self, buffer):
+        """Voltage axis unit - from the sweep range while a sweep runs, so it does not change mid-sweep"""
+        sweep_range = self._iv_sweep_range
+        if sweep_range is not None:
+            return self.get_si_unit_label(max(abs(sweep_range[0]), abs(sweep_range[1])), 'voltage')
+        return self._buffer_axis_unit(buffer, 'voltage')
+    
     def format_value_with_unit(self, value, unit_type='voltage'):
         """Format a single value with appropriate SI unit"""
         if value == float('inf') or value == float('-inf'):
@@ -424,15 +510,44 @@ class IVTab(BaseTab):
                 return f"{value:.2e} Ω"
         else:
             unit, scale = self.get_si_unit_label(value, unit_type)
-            scaled_value = value * scale
-            if abs(scaled_value) >= 100:
-                return f"{scaled_value:.1f} {unit}"
-            elif abs(scaled_value) >= 10:
-                return f"{scaled_value:.2f} {unit}"
-            elif abs(scaled_value) >= 1:
-                return f"{scaled_value:.3f} {unit}"
-            else:
-                return f"{scaled_value:.4f} {unit}"
+            return self._format_scaled(value * scale, unit)
+    
+    def _make_fmt(self, unit_type, unit, scale):
+        """
+        Build the formatter for a live readout label with its unit and scale fixed
+        
+        The closure only scales and formats. When a value is more than a decade outside
+        the unit, it picks a new unit and replaces itself in self._fmt, so the readout
+        does not switch units (or recompute them) on every sample.
+        
+        Args:
+            unit_type: 'voltage', 'current' or 'resistance'
+            unit, scale: Unit label and the factor that converts to it
+        Returns:
+            Function value -> label text
+        """
+        decimals = READOUT_DECIMALS[unit_type]
+        
+        def fmt(value):
+            scaled = value * scale
+            if value != 0 and not 0.1 <= abs(scaled) < 1e4 and np.isfinite(value):
+                new_unit, new_scale = self.get_si_unit_label(value, unit_type)
+                if new_unit != unit:
+                    new_fmt = self._fmt[unit_type] = self._make_fmt(unit_type, new_unit, new_scale)
+                    return new_fmt(value)
+            return f"{scaled:.{decimals}f} {unit}"
+        return fmt
+    
+    def _format_scaled(self, scaled_value, unit):
+        """Format an already scaled value - fewer decimals for larger values"""
+        if abs(scaled_value) >= 100:
+            return f"{scaled_value:.1f} {unit}"
+        elif abs(scaled_value) >= 10:
+            return f"{scaled_value:.2f} {unit}"
+        elif abs(scaled_value) >= 1:
+            return f"{scaled_value:.3f} {unit}"
+        else:
+            return f"{scaled_value:.4f} {unit}"
     
     def format_range_with_unit(self, min_val, max_val, unit_type='voltage'):
         """Format a range (min to max) with appropriate SI unit"""
@@ -465,16 +580,16 @@ class IVTab(BaseTab):
     # --- SMU Control Functions ---
     def detect_smu(self):
         """Detect and connect to Keithley 2450 SMU automatically (with threading)"""
-        print("DEBUG: Detect SMU button clicked")
+        logger.debug("Detect SMU button clicked")
         
         # 1. Update UI immediately (Main Thread)
         self.smu_status_label.configure(text="Scanning for devices...", text_color='orange')
         
-        # 2. Run logic in background thread
-        threading.Thread(target=self._run_detect_smu_logic, daemon=True).start()
+        # 2. Run logic on the job worker
+        self._job_queue.put((self._run_detect_smu_logic, ()))
     
     def _run_detect_smu_logic(self):
-        """Background thread for SMU detection"""
+        """Job worker - SMU detection"""
         try:
             # Heavy VISA operations here (this can take several seconds)
             detected_smu = self.hw_controller.auto_detect_smu()
@@ -487,30 +602,33 @@ class IVTab(BaseTab):
                     except:
                         pass
                 self.hw_controller.smu = detected_smu
-                self.after(0, lambda: messagebox.showinfo('Success', 
-                    f'Keithley 2450 SMU detected and connected!\nResource: {detected_smu.resource_name}'))
-                self.after(0, self.refresh_smu_status)
+                self._post_ui('SHOW_INFO', ('Success', f'Keithley 2450 SMU detected and connected!\n'
+                                                      f'Resource: {detected_smu.resource_name}'),
+                              lambda data: messagebox.showinfo(*data))
+                # Already on the job worker - refresh the status directly
+                self._run_refresh_smu_logic()
             else:
-                self.after(0, lambda: messagebox.showwarning('Not Found', 
-                    'Keithley 2450 SMU not found. Please check:\n1. Device is powered on\n2. USB cable is connected\n3. VISA drivers are installed'))
-                self.after(0, lambda: self.smu_status_label.configure(text='✗ Not Connected', text_color='red'))
+                self._post_ui('SHOW_WARNING', ('Not Found', 'Keithley 2450 SMU not found. Please check:\n'
+                                                           '1. Device is powered on\n2. USB cable is connected\n'
+                                                           '3. VISA drivers are installed'),
+                              lambda data: messagebox.showwarning(*data))
+                self._post_ui('UPDATE_SMU_STATUS', {'connected': False}, self._update_smu_ui)
         except Exception as e:
-            error_msg = str(e)
-            self.after(0, lambda: messagebox.showerror('Error', f'Error detecting SMU: {error_msg}'))
-            self.after(0, lambda: self.smu_status_label.configure(text='✗ Not Connected', text_color='red'))
+            self._post_ui('SHOW_ERROR', f'Error detecting SMU: {e}', lambda data: messagebox.showerror('Error', data))
+            self._post_ui('UPDATE_SMU_STATUS', {'connected': False}, self._update_smu_ui)
     
     def refresh_smu_status(self):
         """Refresh SMU connection status display (with threading)"""
-        print("DEBUG: Refresh SMU button clicked")
+        logger.debug("Refresh SMU button clicked")
         
         # 1. Update UI immediately (Main Thread)
         self.smu_status_label.configure(text="Checking...", text_color='orange')
         
-        # 2. Run logic in background thread
-        threading.Thread(target=self._run_refresh_smu_logic, daemon=True).start()
+        # 2. Run logic on the job worker
+        self._job_queue.put((self._run_refresh_smu_logic, ()))
     
     def _run_refresh_smu_logic(self):
-        """Background thread for SMU status refresh with re-initialization"""
+        """Job worker - SMU status refresh with re-initialization"""
         try:
             # Step A: Check if software object exists
             # Step B: Active Health Check (performed in get_smu_info())
@@ -535,11 +653,10 @@ class IVTab(BaseTab):
                 else:
                     print("[REFRESH] SMU reconnection failed - device not found")
             
-            # 3. Schedule UI update back on Main Thread
-            self.after(0, lambda: self._update_smu_ui(smu_info))
+            # 3. Hand the result to the main thread
+            self._post_ui('UPDATE_SMU_STATUS', smu_info, self._update_smu_ui)
         except Exception as e:
-            error_msg = str(e)
-            self.after(0, lambda: self._update_smu_error(error_msg))
+            self._post_ui('UPDATE_SMU_ERROR', str(e), self._update_smu_error)
     
     def _update_smu_ui(self, smu_info):
         """Update SMU UI with results (called on main thread)"""
@@ -561,7 +678,7 @@ class IVTab(BaseTab):
     
     def refresh_mcusb_status(self):
         """Refresh MCusb-1408FS-Plus connection status display (with threading)"""
-        print("DEBUG: Refresh MCusb button clicked")
+        logger.debug("Refresh MCusb button clicked")
         
         # 1. Update UI immediately (Main Thread)
         self.mcusb_status_label.configure(text="Checking...", text_color='orange')
@@ -734,44 +851,79 @@ class IVTab(BaseTab):
         self.after(100, self.update_mcusb_readings)
     
     def list_visa_devices(self):
-        """List all available VISA devices (with threading)"""
-        print("DEBUG: List VISA devices button clicked")
-        
-        # 1. Show loading message immediately (Main Thread)
-        messagebox.showinfo('Scanning', 'Scanning for VISA devices...\nThis may take a few seconds.')
-        
-        # 2. Run logic in background thread
-        threading.Thread(target=self._run_list_visa_devices_logic, daemon=True).start()
+        """List all available VISA devices in a non-modal window, filled in as each device answers"""
+        logger.debug("List VISA devices button clicked")
+        
+        if self._visa_scan_running:
+            # A scan is still running - just bring its window to the front
+            if self._visa_window is not None and self._visa_window.winfo_exists():
+                self._visa_window.lift()
+            return
+        
+        # 1. Open (or reuse) the device window immediately (Main Thread)
+        if self._visa_window is None or not self._visa_window.winfo_exists():
+            self._visa_window = ctk.CTkToplevel(self)
+            self._visa_window.title('VISA Devices')
+            self._visa_window.geometry('600x400')
+            self._visa_textbox = ctk.CTkTextbox(self._visa_window, font=ctk.CTkFont(family='Courier', size=12))
+            self._visa_textbox.pack(fill='both', expand=True, padx=10, pady=10)
+        self._visa_window.lift()
+        self._visa_textbox.configure(state='normal')
+        self._visa_textbox.delete('1.0', 'end')
+        self._visa_textbox.insert('end', 'Scanning for VISA devices...\n\n')
+        self._visa_textbox.configure(state='disabled')
+        
+        # 2. Run the scan on the job worker
+        self._visa_scan_running = True
+        self._job_queue.put((self._enum_visa, ()))
     
-    def _run_list_visa_devices_logic(self):
-        """Background thread for listing VISA devices"""
+    def _enum_visa(self):
+        """Job worker - query each VISA resource and post it as soon as it answers"""
+        summary = None
         try:
-            # Heavy VISA operations here (this can take several seconds)
+            # Heavy VISA operations here (each device can take up to the 2 s timeout)
             resources = self.hw_controller.list_visa_resources()
             
             if resources:
-                device_list = "Available VISA Devices:\n\n"
+                rm = getattr(self.hw_controller.smu, 'rm', None) if self.hw_controller.smu else None
                 for i, resource in enumerate(resources, 1):
-                    device_list += f"{i}. {resource}\n"
                     try:
                         # Access ResourceManager through SMU object
-                        if self.hw_controller.smu and hasattr(self.hw_controller.smu, 'rm') and self.hw_controller.smu.rm:
-                            inst = self.hw_controller.smu.rm.open_resource(resource)
+                        if rm is None:
+                            raise RuntimeError('No VISA resource manager')
+                        inst = rm.open_resource(resource)
+                        try:
                             inst.timeout = 2000
-                            idn = inst.query("*IDN?")
-                            device_list += f"   IDN: {idn.strip()}\n"
+                            idn = inst.query("*IDN?").strip()
+                        finally:
                             inst.close()
-                    except:
-                        device_list += "   (Could not query device)\n"
-                    device_list += "\n"
-                
-                # 3. Schedule UI update back on Main Thread
-                self.after(0, lambda: messagebox.showinfo('VISA Devices', device_list))
+                    except Exception:
+                        idn = None
+                    self._post_ui('UPDATE_VISA_DEVICE', (i, resource, idn), lambda data: self._add_visa_device(*data))
+                summary = f'Scan complete - {len(resources)} device(s) found.'
             else:
-                self.after(0, lambda: messagebox.showinfo('VISA Devices', 'No VISA devices found.'))
+                summary = 'No VISA devices found.'
         except Exception as e:
-            error_msg = str(e)
-            self.after(0, lambda: messagebox.showerror('Error', f'Error listing VISA devices: {error_msg}'))
+            summary = f'Error listing VISA devices: {e}'
+        finally:
+            self._post_ui('UPDATE_VISA_SCAN_DONE', summary, self._finish_visa_scan)
+    
+    def _append_visa_text(self, text):
+        """Append text to the VISA device window, if it is still open (called on main thread)"""
+        if self._visa_textbox is not None and self._visa_textbox.winfo_exists():
+            self._visa_textbox.configure(state='normal')
+            self._visa_textbox.insert('end', text)
+            self._visa_textbox.configure(state='disabled')
+    
+    def _add_visa_device(self, index, resource, idn):
+        """Add one scanned device to the VISA device window (called on main thread)"""
+        idn_text = f'IDN: {idn}' if idn is not None else '(Could not query device)'
+        self._append_visa_text(f'{index}. {resource}\n   {idn_text}\n\n')
+    
+    def _finish_visa_scan(self, summary):
+        """Show the scan result and allow a new scan (called on main thread)"""
+        self._visa_scan_running = False
+        self._append_visa_text(f'{summary}\n')
     
     def set_smu_voltage_manual(self):
         """Set SMU voltage manually"""
@@ -792,7 +944,11 @@ class IVTab(BaseTab):
             messagebox.showerror('Error', f'Error setting voltage: {e}')
     
     def measure_smu_manual(self):
-        """Take a manual measurement from SMU"""
+        """Take a manual measurement from SMU (on the job worker)"""
+        self._job_queue.put((self._run_measure_smu_logic, ()))
+    
+    def _run_measure_smu_logic(self):
+        """Background thread for a manual SMU measurement"""
         try:
             measurement = self.hw_controller.measure_smu()
             if measurement:
@@ -800,21 +956,41 @@ class IVTab(BaseTab):
                 current = measurement.get('current', 0)
                 resistance = voltage / current if current != 0 else float('inf')
                 
-                self.iv_voltage_label.configure(text=self.format_value_with_unit(voltage, 'voltage'))
-                self.iv_current_label.configure(text=self.format_value_with_unit(current, 'current'))
-                if resistance != float('inf'):
-                    self.iv_resistance_label.configure(text=self.format_value_with_unit(resistance, 'resistance'))
-                else:
-                    self.iv_resistance_label.configure(text='∞')
+                self._post_ui('UPDATE_IV_READING', (voltage, current), lambda data: self.show_iv_reading(*data))
                 
-                messagebox.showinfo('Measurement', 
-                    f'Voltage: {self.format_value_with_unit(voltage, "voltage")}\n'
-                    f'Current: {self.format_value_with_unit(current, "current")}\n'
-                    f'Resistance: {self.format_value_with_unit(resistance, "resistance") if resistance != float("inf") else "∞"}')
+                message = (f'Voltage: {self.format_value_with_unit(voltage, "voltage")}\n'
+                           f'Current: {self.format_value_with_unit(current, "current")}\n'
+                           f'Resistance: {self.format_value_with_unit(resistance, "resistance") if resistance != float("inf") else "∞"}')
+                self._post_ui('SHOW_INFO', ('Measurement', message), lambda data: messagebox.showinfo(*data))
             else:
-                messagebox.showerror('Error', 'Failed to measure. Check SMU connection.')
+                self._post_ui('SHOW_ERROR', 'Failed to measure. Check SMU connection.',
+                              lambda data: messagebox.showerror('Error', data))
         except Exception as e:
-            messagebox.showerror('Error', f'Error measuring: {e}')
+            self._post_ui('SHOW_ERROR', f'Error measuring: {e}', lambda data: messagebox.showerror('Error', data))
+    
+    def show_iv_reading(self, voltage, current):
+        """Show a voltage/current reading and its resistance (called on main thread)"""
+        fmt = self._fmt
+        self.iv_voltage_label.configure(text=fmt['voltage'](voltage))
+        self.iv_current_label.configure(text=fmt['current'](current))
+        if current != 0:
+            self.iv_resistance_label.configure(text=fmt['resistance'](voltage / current))
+        else:
+            self.iv_resistance_label.configure(text='∞')
+    
+    def _post_ui(self, update_type, data, fallback):
+        """
+        Hand a widget update from a worker thread to the main thread
+        
+        Args:
+            update_type: update_queue message type (routed by the main app)
+            data: Message data
+            fallback: Called as fallback(data) via after() when there is no update_queue
+        """
+        if self.update_queue:
+            self.update_queue.put((update_type, data))
+        else:
+            self.after(0, lambda: fallback(data))
     
     def smu_output_off(self):
         """Turn off SMU output"""
@@ -864,27 +1040,67 @@ class IVTab(BaseTab):
             start_val = float(self.iv_start_entry.get()) if self.iv_start_entry.get() else -2.0
             stop_val = float(self.iv_stop_entry.get()) if self.iv_stop_entry.get() else 2.0
             step_val = float(self.iv_step_entry.get()) if self.iv_step_entry.get() else 0.1
+            # Read the entries here - the measurement thread does not touch Tk widgets
+            self.plot_decim = max(1, int(self.iv_plot_decim_entry.get())) if self.iv_plot_decim_entry.get() else 5
+            try:
+                current_limit = float(self.smu_current_limit_entry.get())
+            except ValueError:
+                current_limit = 0.1
+            try:
+                delay = float(self.iv_time_entry.get())
+            except ValueError:
+                delay = 0.1
+            hardware_sweep = self.iv_hardware_sweep_var.get()
             
-            # Reset stop flag and enable stop button
-            self.iv_measurement_stop = False
+            # Enable the stop button - the stop flag is reset when the job worker starts the
+            # sweep, so a Stop pressed for a running sweep is not undone here
             if hasattr(self, 'iv_stop_button'):
                 self.iv_stop_button.configure(state='normal')
             
-            threading.Thread(target=self.run_iv_measurement,
-                           args=(start_val, stop_val, step_val),
-                           daemon=True).start()
+            self._job_queue.put((self.run_iv_measurement,
+                                 (start_val, stop_val, step_val, current_limit, delay, hardware_sweep)))
         except ValueError:
             messagebox.showerror('Error', "Invalid input values. Please enter numbers.")
     
     def iv_stop_measurement(self):
-        """Stop IV measurement"""
+        """Stop IV measurement (and drop sweeps queued behind it)"""
         self.iv_measurement_stop = True
+        self._cancel_pending_jobs()
         if hasattr(self, 'iv_stop_button'):
             self.iv_stop_button.configure(state='disabled')
         if self.update_queue:
             self.update_queue.put(('UPDATE_IV_STATUS', ('Stopped', 'orange')))
             self.update_queue.put(('UPDATE_IV_STATUS_BAR', "Measurement stopped by user"))
     
+    def _job_worker(self):
+        """Worker thread - run queued (function, args) jobs one at a time"""
+        while True:
+            func, args = self._job_queue.get()
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error in IV job: {e}")
+    
+    def _cancel_pending_jobs(self):
+        """
+        Remove the sweeps that have not started yet (the running one stops via its flag)
+        Other queued jobs (status refresh, VISA scan) are kept - their UI waits for the result
+        """
+        kept = []
+        while True:
+            try:
+                job = self._job_queue.get_nowait()
+            except queue.Empty:
+                break
+            if job[0] != self.run_iv_measurement:
+                kept.append(job)
+        for job in kept:
+            self._job_queue.put(job)
+    
+    def _set_stop_button_state(self, state):
+        """Enable/disable the stop button (called on main thread)"""
+        self.iv_stop_button.configure(state=state)
+    
     def iv_choose_program(self):
         """IV choose program - placeholder"""
         pass
@@ -911,10 +1127,21 @@ class IVTab(BaseTab):
         else:
             return None, None
     
-    def run_iv_measurement(self, start_val, stop_val, step_val):
-        """Run I-V measurement in separate thread"""
+    def run_iv_measurement(self, start_val, stop_val, step_val, current_limit=0.1, delay=0.1,
+                           hardware_sweep=False):
+        """
+        Run I-V measurement in separate thread
+        
+        Args:
+            start_val, stop_val, step_val: Sweep voltages (V)
+            current_limit: SMU current compliance (A)
+            delay: Settling time before each measurement (s)
+            hardware_sweep: Let the SMU run the sweep (see _run_hardware_sweep)
+        """
         # Reset stop flag
         self.iv_measurement_stop = False
+        # A queued sweep may start after the previous one disabled the button
+        self._post_ui('UPDATE_IV_STOP_BUTTON', 'normal', self._set_stop_button_state)
         
         if self.update_queue:
             self.update_queue.put(('UPDATE_IV_STATUS', ('Measuring...', 'orange')))
@@ -926,36 +1153,38 @@ class IVTab(BaseTab):
         self.iv_time_x_data.clear()
         self.iv_time_v_data.clear()
         self.iv_time_i_data.clear()
-        self.iv_measurement_start_time = time.time()
-        self.update_iv_statistics()
+        # Monotonic clock - elapsed times cannot jump with a wall clock (NTP) change
+        self.iv_measurement_start_ns = time.monotonic_ns()
+        # Empty graph - the main thread redraws it and resets the statistics
+        self._post_ui('UPDATE_IV_GRAPH_TAIL', 0, self.refresh_iv_graph)
         
         # Create new data file
         self.data_handler.create_new_file()
         if self.data_handler.file_path and self.update_queue:
             filename = os.path.basename(self.data_handler.file_path)
             self.update_queue.put(('UPDATE_IV_FILE', filename))
+        # Rows are written in batches on the writer thread, not one file call per point.
+        # Unbounded queue (maxsize=0) - a sweep has a known size, and SMU-timed sweeps
+        # hand over whole chunks of readings at once, so no row may be dropped
+        writer = BackgroundWriter(self.data_handler, maxsize=0)
+        writer.start()
         
         try:
-            try:
-                current_limit = float(self.smu_current_limit_entry.get()) if hasattr(self, 'smu_current_limit_entry') else 0.1
-            except:
-                current_limit = 0.1
-            
-            # Generate voltage points
-            if start_val < stop_val:
-                voltage_points = []
-                v = start_val
-                while v <= stop_val:
-                    voltage_points.append(v)
-                    v += step_val
-            else:
-                voltage_points = []
-                v = start_val
-                while v >= stop_val:
-                    voltage_points.append(v)
-                    v -= step_val
+            # Generate voltage points (one numpy call - no accumulated rounding at the end voltage)
+            voltage_points = compute_voltage_points(start_val, stop_val, step_val)
             
             total_points = len(voltage_points)
+            # Room for the whole sweep up front - appends never reallocate mid-sweep
+            for buffer in (self.iv_x_data, self.iv_y_data, self.iv_time_x_data, self.iv_time_v_data, self.iv_time_i_data):
+                buffer.reserve(total_points)
+            # Readout units for this sweep - the voltage range is known, the current starts from the limit
+            voltage_unit = self.get_si_unit_label(max(abs(start_val), abs(stop_val)), 'voltage')
+            self._fmt['voltage'] = self._make_fmt('voltage', *voltage_unit)
+            self._fmt['current'] = self._make_fmt('current', *self.get_si_unit_label(current_limit, 'current'))
+            plot_decim = self.plot_decim
+            graph_sent = 0  # Number of points already sent to the graph
+            last_graph_update = 0.0  # time.monotonic() of the last graph update
+            self._iv_sweep_range = (min(voltage_points), max(voltage_points))
             
             # Configure SMU
             # BUG FIX #3: Better None check for SMU
@@ -975,108 +1204,114 @@ class IVTab(BaseTab):
                     self.update_queue.put(('UPDATE_IV_STATUS_BAR', "SMU not connected"))
                 return
             
-            # Perform I-V sweep
-            for voltage in voltage_points:
-                # Check if measurement should be stopped
-                if self.iv_measurement_stop:
-                    print("Measurement stopped by user")
-                    if self.update_queue:
-                        self.update_queue.put(('UPDATE_IV_STATUS', ('Stopped', 'orange')))
-                        self.update_queue.put(('UPDATE_IV_STATUS_BAR', "Measurement stopped by user"))
-                    # BUG FIX #2: Lambda closure - capture button reference correctly
-                    if hasattr(self, 'iv_stop_button'):
-                        btn = self.iv_stop_button
-                        self.after(0, lambda b=btn: b.configure(state='disabled'))
-                    break
-                
-                # BUG FIX #3: Better None check for SMU
-                if self.hw_controller.smu is not None and hasattr(self.hw_controller, 'smu'):
-                    try:
-                        self.hw_controller.set_smu_voltage(voltage, current_limit)
+            if hardware_sweep:
+                # The SMU steps and measures on its own - readings are fetched in chunks
+                graph_sent = self._run_hardware_sweep(voltage_points, delay, plot_decim, writer)
+            else:
+                # Perform I-V sweep (one VISA round trip per point, with MCusb readings)
+                for voltage in voltage_points:
+                    # Check if measurement should be stopped
+                    if self.iv_measurement_stop:
+                        print("Measurement stopped by user")
+                        if self.update_queue:
+                            self.update_queue.put(('UPDATE_IV_STATUS', ('Stopped', 'orange')))
+                            self.update_queue.put(('UPDATE_IV_STATUS_BAR', "Measurement stopped by user"))
+                        self._post_ui('UPDATE_IV_STOP_BUTTON', 'disabled', self._set_stop_button_state)
+                        break
+                    
+                    # BUG FIX #3: Better None check for SMU
+                    if self.hw_controller.smu is not None and hasattr(self.hw_controller, 'smu'):
                         try:
-                            delay = float(self.iv_time_entry.get()) if hasattr(self, 'iv_time_entry') else 0.1
-                        except:
-                            delay = 0.1
-                        time.sleep(delay)
-                        
-                        # Read voltage from MCusb channel 0 (IN HI)
-                        # Try differential first (if IN HI and IN LO are on CH0), then fall back to single-ended
-                        # This gives us the actual voltage being applied, measured independently
-                        if self.hw_controller.ni_daq and self.hw_controller.ni_daq.is_connected():
-                            try:
-                                # Try differential first (IN HI - IN LO on CH0)
-                                mcusb_voltage = self.hw_controller.ni_daq.read_analog_input('ai0', differential=True)
-                                if mcusb_voltage is None:
-                                    # Fall back to single-ended if differential fails
-                                    mcusb_voltage = self.hw_controller.ni_daq.read_analog_input('ai0', differential=False)
-                                
-                                if mcusb_voltage is not None:
-                                    # Update display in real-time via queue
-                                    if self.update_queue:
-                                        self.update_queue.put(('UPDATE_MCUSB_CH0', mcusb_voltage))
-                                    print(f"MCusb CH0 (IN HI) reading: {mcusb_voltage:.4f}V (SMU set: {voltage}V)")
-                            except Exception as e:
-                                print(f"Error reading MCusb during sweep: {e}")
-                        
-                        measurement = self.hw_controller.measure_smu()
-                        if measurement:
-                            current = measurement['current']
-                        else:
-                            print(f"Warning: Failed to measure at {voltage}V")
+                            # Settling deadline from when the set command is sent - the VISA
+                            # round trip counts toward the delay instead of adding to it
+                            settle_deadline = time.monotonic() + delay
+                            self.hw_controller.set_smu_voltage(voltage, current_limit)
+                            time.sleep(max(0.0, settle_deadline - time.monotonic()))
+                            
+                            # Read voltage from MCusb channel 0 (IN HI)
+                            # Try differential first (if IN HI and IN LO are on CH0), then fall back to single-ended
+                            # This gives us the actual voltage being applied, measured independently
+                            if self.hw_controller.ni_daq and self.hw_controller.ni_daq.is_connected():
+                                try:
+                                    # Try differential first (IN HI - IN LO on CH0)
+                                    mcusb_voltage = self.hw_controller.ni_daq.read_analog_input('ai0', differential=True)
+                                    if mcusb_voltage is None:
+                                        # Fall back to single-ended if differential fails
+                                        mcusb_voltage = self.hw_controller.ni_daq.read_analog_input('ai0', differential=False)
+                                    
+                                    if mcusb_voltage is not None:
+                                        # Update display in real-time via queue
+                                        if self.update_queue:
+                                            self.update_queue.put(('UPDATE_MCUSB_CH0', mcusb_voltage))
+                                        print(f"MCusb CH0 (IN HI) reading: {mcusb_voltage:.4f}V (SMU set: {voltage}V)")
+                                except Exception as e:
+                                    print(f"Error reading MCusb during sweep: {e}")
+                            
+                            measurement = self.hw_controller.measure_smu(source_value=voltage)
+                            if measurement:
+                                current = measurement['current']
+                            else:
+                                print(f"Warning: Failed to measure at {voltage}V")
+                                continue
+                        except Exception as e:
+                            print(f"Error in I-V measurement at {voltage}V: {e}")
                             continue
-                    except Exception as e:
-                        print(f"Error in I-V measurement at {voltage}V: {e}")
-                        continue
-                else:
-                    if self.update_queue:
-                        self.update_queue.put(('UPDATE_IV_STATUS', ('Error', 'red')))
-                        self.update_queue.put(('UPDATE_IV_STATUS_BAR', "SMU not connected"))
-                    return
-                
-                # Update graph
-                self.iv_x_data.append(voltage)
-                self.iv_y_data.append(current)
-                
-                # Save time-dependent data
-                elapsed_time = time.time() - self.iv_measurement_start_time
-                self.iv_time_x_data.append(elapsed_time)
-                self.iv_time_v_data.append(voltage)
-                self.iv_time_i_data.append(current)
-                
-                # Check stop flag again before continuing (in case it was set during measurement)
-                if self.iv_measurement_stop:
-                    print("Measurement stopped by user")
-                    if self.update_queue:
-                        self.update_queue.put(('UPDATE_IV_STATUS', ('Stopped', 'orange')))
-                        self.update_queue.put(('UPDATE_IV_STATUS_BAR', "Measurement stopped by user"))
-                    # BUG FIX #2: Lambda closure - capture button reference correctly
-                    if hasattr(self, 'iv_stop_button'):
-                        btn = self.iv_stop_button
-                        self.after(0, lambda b=btn: b.configure(state='disabled'))
-                    break
-                
-                if self.update_queue:
-                    self.update_queue.put(('UPDATE_IV_GRAPH', (list(self.iv_x_data), list(self.iv_y_data))))
+                    else:
+                        if self.update_queue:
+                            self.update_queue.put(('UPDATE_IV_STATUS', ('Error', 'red')))
+                            self.update_queue.put(('UPDATE_IV_STATUS_BAR', "SMU not connected"))
+                        return
+                    
+                    # Update graph
+                    self.iv_x_data.append(voltage)
+                    self.iv_y_data.append(current)
+                    
+                    # Save time-dependent data
+                    # Exact integer ns difference - converted to float seconds once
+                    elapsed_time = (time.monotonic_ns() - self.iv_measurement_start_ns) * 1e-9
+                    self.iv_time_x_data.append(elapsed_time)
+                    self.iv_time_v_data.append(voltage)
+                    self.iv_time_i_data.append(current)
+                    
+                    # Check stop flag again before continuing (in case it was set during measurement)
+                    if self.iv_measurement_stop:
+                        print("Measurement stopped by user")
+                        if self.update_queue:
+                            self.update_queue.put(('UPDATE_IV_STATUS', ('Stopped', 'orange')))
+                            self.update_queue.put(('UPDATE_IV_STATUS_BAR', "Measurement stopped by user"))
+                        self._post_ui('UPDATE_IV_STOP_BUTTON', 'disabled', self._set_stop_button_state)
+                        break
+                    
+                    # Render every plot_decim-th point, at most every GRAPH_UPDATE_MIN_INTERVAL -
+                    # acquisition does not wait for the graph
                     progress = len(self.iv_x_data)
-                    self.update_queue.put(('UPDATE_IV_STATUS_BAR', f"Measuring: {progress}/{total_points} points..."))
-                
-                # Save data point
-                data_point = {
-                    "time": len(self.iv_x_data),
-                    "voltage": voltage,
-                    "current": current,
-                    "elapsed_time": elapsed_time
-                }
-                self.data_handler.append_data(data_point)
+                    now = time.monotonic()
+                    if progress - graph_sent >= plot_decim and now - last_graph_update >= GRAPH_UPDATE_MIN_INTERVAL:
+                        # Only the new length - the main thread draws from the shared buffers
+                        self._post_ui('UPDATE_IV_GRAPH_TAIL', progress, self.refresh_iv_graph)
+                        if self.update_queue:
+                            self.update_queue.put(('UPDATE_IV_STATUS_BAR', f"Measuring: {progress}/{total_points} points..."))
+                        graph_sent = progress
+                        last_graph_update = now
+                    
+                    # Save data point
+                    data_point = {
+                        "time": len(self.iv_x_data),
+                        "voltage": voltage,
+                        "current": current,
+                        "elapsed_time": elapsed_time
+                    }
+                    writer.put(data_point)
             
-            if self.update_queue:
+            # Send the points since the last graph update (also after a stop)
+            if len(self.iv_x_data) > graph_sent:
+                self._post_ui('UPDATE_IV_GRAPH_TAIL', len(self.iv_x_data), self.refresh_iv_graph)
+            
+            if self.update_queue and not self.iv_measurement_stop:
                 self.update_queue.put(('UPDATE_IV_STATUS', ('Completed', 'green')))
                 self.update_queue.put(('UPDATE_IV_STATUS_BAR', "I-V measurement completed"))
             
-            # BUG FIX #2: Lambda closure - capture button reference correctly
-            if hasattr(self, 'iv_stop_button'):
-                btn = self.iv_stop_button
-                self.after(0, lambda b=btn: b.configure(state='disabled'))
+            self._post_ui('UPDATE_IV_STOP_BUTTON', 'disabled', self._set_stop_button_state)
             
         except Exception as e:
             if self.update_queue:
@@ -1088,151 +1323,331 @@ class IVTab(BaseTab):
         
         finally:
             try:
+                writer.stop()  # Writes the queued rows
                 self.data_handler.close_file()
             except Exception as e:
                 print(f"Error closing IV data file: {e}")
             finally:
                 self.hw_controller.stop_smu()
+                self._iv_sweep_range = None
+                if self.update_queue:
+                    # Live updates leave extra axis margin - refit the graph to the final data
+                    self.update_queue.put(('UPDATE_IV_TIME_GRAPH', None))
+    
+    def _run_hardware_sweep(self, voltage_points, delay, plot_decim, writer):
+        """
+        Run the sweep on the SMU and fetch the readings in chunks while it runs.
+        The SMU steps the source itself, so there is no VISA round trip per point.
+        
+        Args:
+            voltage_points: Equally spaced sweep voltages (from compute_voltage_points)
+            delay: Source delay before each measurement (s)
+            plot_decim: Send a graph update every N points
+            writer: Started BackgroundWriter for the data rows
+        Returns:
+            Number of points sent to the graph
+        """
+        total_points = len(voltage_points)
+        if not self.hw_controller.start_smu_voltage_sweep(voltage_points[0], voltage_points[-1], total_points, delay):
+            raise RuntimeError("Could not start the SMU sweep")
+        # Buffer times are relative to the first reading
+        sweep_offset = (time.monotonic_ns() - self.iv_measurement_start_ns) * 1e-9
+        graph_sent = 0
+        read_count = 0
+        last_progress = time.monotonic()
+        
+        while read_count < total_points:
+            if self.iv_measurement_stop:
+                self.hw_controller.abort_smu_sweep()
+                print("Measurement stopped by user")
+                if self.update_queue:
+                    self.update_queue.put(('UPDATE_IV_STATUS', ('Stopped', 'orange')))
+                    self.update_queue.put(('UPDATE_IV_STATUS_BAR', "Measurement stopped by user"))
+                self._post_ui('UPDATE_IV_STOP_BUTTON', 'disabled', self._set_stop_button_state)
+                break
+            
+            time.sleep(HARDWARE_SWEEP_POLL_INTERVAL)
+            count = self.hw_controller.get_smu_sweep_count()
+            if not count or count <= read_count:
+                if time.monotonic() - last_progress > delay + HARDWARE_SWEEP_STALL_TIMEOUT:
+                    self.hw_controller.abort_smu_sweep()
+                    raise RuntimeError(f"SMU sweep stalled after {read_count}/{total_points} points")
+                continue
+            
+            data = self.hw_controller.read_smu_sweep_data(read_count + 1, count)
+            if data is None:
+                self.hw_controller.abort_smu_sweep()
+                raise RuntimeError("Could not read the SMU sweep data")
+            voltages, currents, rel_times = data
+            elapsed_times = rel_times + sweep_offset
+            self.iv_x_data.extend(voltages)
+            self.iv_y_data.extend(currents)
+            self.iv_time_x_data.extend(elapsed_times)
+            self.iv_time_v_data.extend(voltages)
+            self.iv_time_i_data.extend(currents)
+            for k, (voltage, current, elapsed_time) in enumerate(
+                    zip(voltages.tolist(), currents.tolist(), elapsed_times.tolist()), read_count + 1):
+                writer.put({
+                    "time": k,
+                    "voltage": voltage,
+                    "current": current,
+                    "elapsed_time": elapsed_time
+                })
+            read_count += len(voltages)
+            last_progress = time.monotonic()
+            
+            if read_count - graph_sent >= plot_decim:
+                self._post_ui('UPDATE_IV_GRAPH_TAIL', read_count, self.refresh_iv_graph)
+                if self.update_queue:
+                    self.update_queue.put(('UPDATE_IV_STATUS_BAR', f"Measuring: {read_count}/{total_points} points..."))
+                graph_sent = read_count
+        
+        return graph_sent
     
     # --- Graph Functions ---
     def on_iv_axis_change(self, *args):
-        """Handle IV axis selection change"""
+        """Handle IV axis selection change (picking the selection that is already shown does nothing)"""
         x_axis_type = self.iv_x_axis_combo.get()
         y_axis_type = self.iv_y_axis_combo.get()
+        layout = self._iv_plot_layout
+        if layout is not None and layout[:2] == (x_axis_type, y_axis_type):
+            return  # Live updates keep the shown graph current
         self.plot_iv_xy_graph(x_axis_type, y_axis_type)
     
-    def plot_iv_xy_graph(self, x_axis_type, y_axis_type):
-        """Plot IV graph with selected axes and automatic unit scaling"""
-        self.iv_ax.clear()
+    def get_iv_plot_data(self, x_axis_type, y_axis_type):
+        """
+        Get the scaled data and labels for the selected IV axes
         
+        Returns:
+            (x_data_scaled, y_data_scaled, xlabel, ylabel, title)
+        """
         if x_axis_type == 'Time' and y_axis_type == 'Voltage':
-            x_data = self.iv_time_x_data
-            y_data = self.iv_time_v_data
+            x_data = self.iv_time_x_data.view()
+            y_data = self.iv_time_v_data.view()
             xlabel_base = "Time"
             ylabel_base = "Voltage"
             title = "Voltage vs Time"
-            y_unit, y_scale = self.get_axis_unit_label(y_data, 'voltage')
+            y_unit, y_scale = self._voltage_axis_unit(self.iv_time_v_data)
             ylabel = f"{ylabel_base} ({y_unit})"
             xlabel = f"{xlabel_base} (s)"
-            y_data_scaled = [y * y_scale for y in y_data] if y_data else []
+            y_data_scaled = y_data * y_scale
             x_data_scaled = x_data
         elif x_axis_type == 'Time' and y_axis_type == 'Current':
-            x_data = self.iv_time_x_data
-            y_data = self.iv_time_i_data
+            x_data = self.iv_time_x_data.view()
+            y_data = self.iv_time_i_data.view()
             xlabel_base = "Time"
             ylabel_base = "Current"
             title = "Current vs Time"
-            y_unit, y_scale = self.get_axis_unit_label(y_data, 'current')
+            y_unit, y_scale = self._buffer_axis_unit(self.iv_time_i_data, 'current')
             ylabel = f"{ylabel_base} ({y_unit})"
             xlabel = f"{xlabel_base} (s)"
-            y_data_scaled = [y * y_scale for y in y_data] if y_data else []
+            y_data_scaled = y_data * y_scale
             x_data_scaled = x_data
         elif x_axis_type == 'Voltage' and y_axis_type == 'Current':
-            x_data = self.iv_x_data
-            y_data = self.iv_y_data
+            x_data = self.iv_x_data.view()
+            y_data = self.iv_y_data.view()
             xlabel_base = "Voltage"
             ylabel_base = "Current"
             title = "I-V Characteristic"
-            x_unit, x_scale = self.get_axis_unit_label(x_data, 'voltage')
-            y_unit, y_scale = self.get_axis_unit_label(y_data, 'current')
+            x_unit, x_scale = self._voltage_axis_unit(self.iv_x_data)
+            y_unit, y_scale = self._buffer_axis_unit(self.iv_y_data, 'current')
             xlabel = f"{xlabel_base} ({x_unit})"
             ylabel = f"{ylabel_base} ({y_unit})"
-            x_data_scaled = [x * x_scale for x in x_data] if x_data else []
-            y_data_scaled = [y * y_scale for y in y_data] if y_data else []
+            x_data_scaled = x_data * x_scale
+            y_data_scaled = y_data * y_scale
         elif x_axis_type == 'Current' and y_axis_type == 'Voltage':
-            x_data = self.iv_y_data
-            y_data = self.iv_x_data
+            x_data = self.iv_y_data.view()
+            y_data = self.iv_x_data.view()
             xlabel_base = "Current"
             ylabel_base = "Voltage"
             title = "V-I Characteristic"
-            x_unit, x_scale = self.get_axis_unit_label(x_data, 'current')
-            y_unit, y_scale = self.get_axis_unit_label(y_data, 'voltage')
+            x_unit, x_scale = self._buffer_axis_unit(self.iv_y_data, 'current')
+            y_unit, y_scale = self._voltage_axis_unit(self.iv_x_data)
             xlabel = f"{xlabel_base} ({x_unit})"
             ylabel = f"{ylabel_base} ({y_unit})"
-            x_data_scaled = [x * x_scale for x in x_data] if x_data else []
-            y_data_scaled = [y * y_scale for y in y_data] if y_data else []
+            x_data_scaled = x_data * x_scale
+            y_data_scaled = y_data * y_scale
         else:
-            x_data = self.iv_x_data
-            y_data = self.iv_y_data
+            x_data = self.iv_x_data.view()
+            y_data = self.iv_y_data.view()
             xlabel_base = "Voltage"
             ylabel_base = "Current"
             title = "I-V Characteristic"
-            x_unit, x_scale = self.get_axis_unit_label(x_data, 'voltage')
-            y_unit, y_scale = self.get_axis_unit_label(y_data, 'current')
+            x_unit, x_scale = self._voltage_axis_unit(self.iv_x_data)
+            y_unit, y_scale = self._buffer_axis_unit(self.iv_y_data, 'current')
             xlabel = f"{xlabel_base} ({x_unit})"
             ylabel = f"{ylabel_base} ({y_unit})"
-            x_data_scaled = [x * x_scale for x in x_data] if x_data else []
-            y_data_scaled = [y * y_scale for y in y_data] if y_data else []
+            x_data_scaled = x_data * x_scale
+            y_data_scaled = y_data * y_scale
         
-        # Plot the data
-        if len(x_data_scaled) > 0 and len(y_data_scaled) > 0:
-            self.iv_ax.plot(x_data_scaled, y_data_scaled, color='#C73E1D', linewidth=2.5, alpha=0.85)
-        else:
-            self.iv_ax.plot([], [], color='#C73E1D', linewidth=2.5)
+        return x_data_scaled, y_data_scaled, xlabel, ylabel, title
+    
+    def plot_iv_xy_graph(self, x_axis_type, y_axis_type, margin_scale=1.0):
+        """
+        Plot IV graph with selected axes and automatic unit scaling (full redraw)
         
-        # Formatting
-        self.iv_ax.set_facecolor('white')
-        self.iv_ax.set_xlabel(xlabel, color='black', fontsize=11)
-        self.iv_ax.set_ylabel(ylabel, color='black', fontsize=11)
-        self.iv_ax.set_title(title, color='black', fontsize=12, fontweight='bold', pad=12)
+        Args:
+            x_axis_type, y_axis_type: Selected axis names
+            margin_scale: Multiplier for the axis margins (live updates leave room to grow)
+        """
+        fingerprint = (self._iv_data_fingerprint(x_axis_type, y_axis_type), margin_scale, self._iv_sweep_range)
+        if fingerprint == self._iv_plot_fingerprint:
+            return  # Same data, axes and limits as the last full redraw
+        self._iv_plot_fingerprint = fingerprint
+        x_data_scaled, y_data_scaled, xlabel, ylabel, title = self.get_iv_plot_data(x_axis_type, y_axis_type)
         
-        self.iv_ax.grid(True, alpha=0.4, color='gray', linestyle='-', linewidth=0.5, which='both')
-        self.iv_ax.set_axisbelow(True)
-        self.iv_ax.tick_params(colors='black', labelsize=9)
+        # Plot the data - long runs are downsampled to the axes width (the full data is kept)
+        if len(x_data_scaled) > 0 and len(y_data_scaled) > 0:
+            n = min(len(x_data_scaled), len(y_data_scaled))
+            plot_x, plot_y = self._iv_display_points(x_data_scaled[:n], y_data_scaled[:n])
+        else:
+            plot_x, plot_y = [], []
+        self.iv_line.set_data(plot_x, plot_y)
         
-        for spine in self.iv_ax.spines.values():
-            spine.set_color('black')
-            spine.set_linewidth(1)
+        # Label texts only - the styling set in setup_graphs is kept
+        # (set_title would reset the title font to the rc defaults)
+        self.iv_ax.xaxis.label.set_text(xlabel)
+        self.iv_ax.yaxis.label.set_text(ylabel)
+        self.iv_ax.title.set_text(title)
         
         # Set axis limits
         if len(x_data_scaled) > 0 and len(y_data_scaled) > 0:
-            x_margin = (max(x_data_scaled) - min(x_data_scaled)) * 0.05 if max(x_data_scaled) > min(x_data_scaled) else 1
-            y_margin = (max(y_data_scaled) - min(y_data_scaled)) * 0.1 if max(y_data_scaled) > min(y_data_scaled) else 1
-            self.iv_ax.set_xlim(min(x_data_scaled) - x_margin, max(x_data_scaled) + x_margin)
-            self.iv_ax.set_ylim(min(y_data_scaled) - y_margin, max(y_data_scaled) + y_margin)
+            x_min, x_max = np.nanmin(x_data_scaled), np.nanmax(x_data_scaled)
+            y_min, y_max = np.nanmin(y_data_scaled), np.nanmax(y_data_scaled)
+            x_margin_scale = y_margin_scale = margin_scale
+            sweep_range = self._iv_sweep_range
+            if sweep_range is not None:
+                # Voltage range of the running sweep is known - fit it once, so the voltage
+                # axis never has to be rescaled while the sweep advances
+                v_scale = self._voltage_axis_unit(None)[1]
+                v_min, v_max = sweep_range[0] * v_scale, sweep_range[1] * v_scale
+                if xlabel.startswith('Voltage'):
+                    x_min, x_max = min(x_min, v_min), max(x_max, v_max)
+                    x_margin_scale = 1.0
+                elif ylabel.startswith('Voltage'):
+                    y_min, y_max = min(y_min, v_min), max(y_max, v_max)
+                    y_margin_scale = 1.0
+            x_margin = (x_max - x_min) * 0.05 * x_margin_scale if x_max > x_min else 1
+            y_margin = (y_max - y_min) * 0.1 * y_margin_scale if y_max > y_min else 1
+            self.iv_ax.set_xlim(x_min - x_margin, x_max + x_margin)
+            self.iv_ax.set_ylim(y_min - y_margin, y_max + y_margin)
+        else:
+            self.iv_ax.set_xlim(0, 1)
+            self.iv_ax.set_ylim(0, 1)
         
         self.iv_fig.tight_layout(pad=2.0)
-        self.iv_canvas.draw()
+        self._iv_plot_layout = (x_axis_type, y_axis_type, xlabel, ylabel)
+        # Deferred - several requests before the next idle are painted once.
+        # The background is stale until then (_on_iv_draw caches the new one).
+        self._iv_background = None
+        self.iv_canvas.draw_idle()
+    
+    def _iv_data_fingerprint(self, x_axis_type, y_axis_type):
+        """Selected axes plus generation and length of every IV buffer - equal means the same plot data"""
+        buffers = (self.iv_x_data, self.iv_y_data, self.iv_time_x_data, self.iv_time_v_data, self.iv_time_i_data)
+        return (x_axis_type, y_axis_type) + tuple((buffer.generation, len(buffer)) for buffer in buffers)
+    
+    def _iv_display_points(self, x, y):
+        """
+        Points of the data line to draw - a line with more than 4 points per axes pixel is
+        LTTB-downsampled to one point per pixel, which looks the same but rasterizes faster
+        """
+        width = int(self.iv_ax.bbox.width)
+        if len(x) > 4 * width:
+            return lttb(x, y, width)
+        return x, y
+    
+    def _on_iv_draw(self, event):
+        """After a full draw (also zoom/pan/resize) - cache the background and draw the data line"""
+        self._iv_background = self.iv_canvas.copy_from_bbox(self.iv_ax.bbox)
+        self.iv_ax.draw_artist(self.iv_line)
+    
+    def blit_iv_graph(self):
+        """
+        Redraw only the data line for a live update.
+        Falls back to a full redraw if the axis units changed or the data left the axis limits.
+        """
+        x_axis_type = self.iv_x_axis_combo.get()
+        y_axis_type = self.iv_y_axis_combo.get()
+        fingerprint = self._iv_data_fingerprint(x_axis_type, y_axis_type)
+        if fingerprint == self._iv_blit_fingerprint:
+            return  # No new points since the last update (e.g. repeated updates during a stall)
+        self._iv_blit_fingerprint = fingerprint
+        x_data_scaled, y_data_scaled, xlabel, ylabel, _ = self.get_iv_plot_data(x_axis_type, y_axis_type)
+        n = min(len(x_data_scaled), len(y_data_scaled))
+        if (n == 0 or self._iv_plot_layout != (x_axis_type, y_axis_type, xlabel, ylabel)):
+            self.plot_iv_xy_graph(x_axis_type, y_axis_type, margin_scale=4.0)
+            return
+        
+        x_min, x_max = self.iv_ax.get_xlim()
+        y_min, y_max = self.iv_ax.get_ylim()
+        x_data_scaled, y_data_scaled = x_data_scaled[:n], y_data_scaled[:n]
+        if not (x_min <= np.nanmin(x_data_scaled) and np.nanmax(x_data_scaled) <= x_max
+                and y_min <= np.nanmin(y_data_scaled) and np.nanmax(y_data_scaled) <= y_max):
+            # Rescale with extra margin so the next points fit without another full redraw
+            self.plot_iv_xy_graph(x_axis_type, y_axis_type, margin_scale=4.0)
+            return
+        
+        plot_x, plot_y = self._iv_display_points(x_data_scaled, y_data_scaled)
+        self.iv_line.set_data(plot_x, plot_y)
+        if self._iv_background is None:
+            # A full draw is still pending - it draws the updated line
+            self.iv_canvas.draw_idle()
+            return
+        self.iv_canvas.restore_region(self._iv_background)
+        self.iv_ax.draw_artist(self.iv_line)
+        self.iv_canvas.blit(self.iv_ax.bbox)
     
     def update_iv_graph(self, x_data, y_data):
         """Update IV graph - now uses axis selection"""
-        if x_data and y_data:
-            self.iv_x_data = list(x_data)
-            self.iv_y_data = list(y_data)
+        if len(x_data) and len(y_data):  # Lists or numpy arrays
+            self.iv_x_data.set(x_data)
+            self.iv_y_data.set(y_data)
         
-        x_axis_type = self.iv_x_axis_combo.get()
-        y_axis_type = self.iv_y_axis_combo.get()
-        self.plot_iv_xy_graph(x_axis_type, y_axis_type)
+        self.blit_iv_graph()
+    
+    def refresh_iv_graph(self, count):
+        """
+        Redraw after the sweep worker appended to the IV buffers (called on main thread).
+        The worker and the graph share the buffers, so no data is copied or sent.
+        
+        Args:
+            count: Number of points measured when the update was posted
+        """
+        self.blit_iv_graph()
+        self.update_iv_statistics()
+        n = min(count, len(self.iv_x_data), len(self.iv_y_data))
+        if n > 0:
+            self.show_iv_reading(self.iv_x_data[n - 1], self.iv_y_data[n - 1])
+    
+    def append_iv_data(self, x_data, y_data):
+        """Append new points to the IV data and redraw the graph"""
+        self.iv_x_data.extend(x_data)
+        self.iv_y_data.extend(y_data)
+        
+        self.blit_iv_graph()
     
     def update_iv_statistics(self):
         """Calculate and update I-V statistics"""
         try:
             # BUG FIX #4: Thread-safe access and length validation
-            # Make copies to avoid race conditions
-            iv_x_copy = list(self.iv_x_data) if self.iv_x_data else []
-            iv_y_copy = list(self.iv_y_data) if self.iv_y_data else []
+            # Views of the first n points - a running sweep only appends after them, so no
+            # copy is needed (it may have appended the voltage but not yet the current)
+            n = min(len(self.iv_x_data), len(self.iv_y_data))
+            iv_x = self.iv_x_data.view()[:n]
+            iv_y = self.iv_y_data.view()[:n]
             
-            # Validate arrays have same length and are not empty
-            if len(iv_x_copy) > 0 and len(iv_y_copy) > 0 and len(iv_x_copy) == len(iv_y_copy):
-                self.iv_points_label.configure(text=str(len(iv_x_copy)))
+            # Validate arrays are not empty
+            if n > 0:
+                self.iv_points_label.configure(text=str(n))
                 
-                v_min = min(iv_x_copy)
-                v_max = max(iv_x_copy)
+                # One pass for all ranges - failed readings (NaN) are skipped.
+                # BUG FIX #12: currents <= 1e-10 A are skipped for the resistance (division by ~0)
+                v_min, v_max, i_min, i_max, min_r, max_r = iv_statistics(iv_x, iv_y)
                 self.iv_vrange_label.configure(text=self.format_range_with_unit(v_min, v_max, 'voltage'))
-                
-                i_min = min(iv_y_copy)
-                i_max = max(iv_y_copy)
                 self.iv_irange_label.configure(text=self.format_range_with_unit(i_min, i_max, 'current'))
                 
-                resistances = []
-                for v, i in zip(iv_x_copy, iv_y_copy):
-                    # BUG FIX #12: Better check for division by zero (also check for very small values)
-                    if i is not None and v is not None and abs(i) > 1e-10:  # Avoid division by very small numbers
-                        resistances.append(v / i)
-                
-                if resistances:
-                    max_r = max(resistances)
-                    min_r = min(resistances)
+                if not np.isnan(max_r):
                     self.iv_maxr_label.configure(text=self.format_value_with_unit(max_r, 'resistance'))
                     self.iv_minr_label.configure(text=self.format_value_with_unit(min_r, 'resistance'))
                 else:
@@ -1254,14 +1669,14 @@ class IVTab(BaseTab):
         """Save IV data to file"""
         try:
             if self.iv_x_data and self.iv_y_data:
+                n = min(len(self.iv_x_data), len(self.iv_y_data))
                 self.data_handler.create_new_file()
-                for i, (v, i_val) in enumerate(zip(self.iv_x_data, self.iv_y_data)):
-                    data_point = {
-                        "time": i,
-                        "voltage": v,
-                        "current": i_val
-                    }
-                    self.data_handler.append_data(data_point)
+                # All rows in one columnar write, straight from the numpy buffers
+                self.data_handler.append_columns({
+                    "time": np.arange(n),
+                    "voltage": self.iv_x_data.view()[:n],
+                    "current": self.iv_y_data.view()[:n]
+                })
                 self.data_handler.close_file()
                 if self.update_queue:
                     self.update_queue.put(('UPDATE_IV_STATUS_BAR', "I-V data saved to file"))
@@ -1282,7 +1697,7 @@ class IVTab(BaseTab):
                 if filename:
                     if not filename.endswith('.xlsx'):
                         filename += '.xlsx'
-                    success = self.data_handler.export_iv_to_excel(self.iv_x_data, self.iv_y_data, filename)
+                    success = self.data_handler.export_iv_to_excel(self.iv_x_data.view().copy(), self.iv_y_data.view().copy(), filename)
                     if success:
                         messagebox.showinfo('Export Complete', f'I-V Excel file exported successfully!\n{filename}')
                     else:
@@ -1292,6 +1707,45 @@ class IVTab(BaseTab):
         except Exception as e:
             messagebox.showerror('Error', f'Error exporting I-V to Excel: {e}')
     
+    def _snapshot_iv_figure(self):
+        """Pickled copy of the IV figure, with the data line as a normal artist holding all points"""
+        display_x, display_y = self.iv_line.get_data()
+        x_data_scaled, y_data_scaled = self.get_iv_plot_data(self.iv_x_axis_combo.get(), self.iv_y_axis_combo.get())[:2]
+        n = min(len(x_data_scaled), len(y_data_scaled))
+        self.iv_line.set_data(x_data_scaled[:n], y_data_scaled[:n])
+        self.iv_line.set_animated(False)
+        try:
+            # The Tk canvas and its callbacks are not part of the pickle
+            return pickle.dumps(self.iv_fig)
+        finally:
+            self.iv_line.set_data(display_x, display_y)
+            self.iv_line.set_animated(True)
+    
+    def save_iv_figure(self, filename, file_type, **kwargs):
+        """
+        Save the IV figure without blocking the GUI.
+        A copy of the figure is taken here (main thread) and rendered in a background
+        thread, so a dpi=300 export with bbox_inches='tight' does not freeze the window.
+        
+        Args:
+            filename: Output file path
+            file_type: Name shown in the completion message ('PNG' or 'PDF')
+            **kwargs: Passed on to savefig (e.g. dpi)
+        """
+        snapshot = self._snapshot_iv_figure()
+        threading.Thread(target=self._run_save_iv_figure, args=(snapshot, filename, file_type, kwargs),
+                         daemon=True).start()
+    
+    def _run_save_iv_figure(self, snapshot, filename, file_type, kwargs):
+        """Background thread - render the figure copy to the file"""
+        try:
+            figure = pickle.loads(snapshot)
+            figure.savefig(filename, bbox_inches='tight', **kwargs)
+            self._post_ui('SHOW_INFO', ('Export Complete', f'I-V graph exported as {file_type} successfully!'),
+                          lambda data: messagebox.showinfo(*data))
+        except Exception as e:
+            self._post_ui('SHOW_ERROR', f'Error exporting I-V graph: {e}', lambda data: messagebox.showerror('Error', data))
+    
     def iv_export_graph_png(self):
         """Export I-V graph as PNG"""
         try:
@@ -1301,8 +1755,7 @@ class IVTab(BaseTab):
                 title='Save I-V Graph as PNG'
             )
             if filename:
-                self.iv_fig.savefig(filename, dpi=300, bbox_inches='tight')
-                messagebox.showinfo('Export Complete', 'I-V graph exported as PNG successfully!')
+                self.save_iv_figure(filename, 'PNG', dpi=300)
         except Exception as e:
             messagebox.showerror('Error', f'Error exporting I-V graph: {e}')
     
@@ -1315,8 +1768,7 @@ class IVTab(BaseTab):
                 title='Save I-V Graph as PDF'
             )
             if filename:
-                self.iv_fig.savefig(filename, bbox_inches='tight')
-                messagebox.showinfo('Export Complete', 'I-V graph exported as PDF successfully!')
+                self.save_iv_figure(filename, 'PDF')
         except Exception as e:
             messagebox.showerror('Error', f'Error exporting I-V graph: {e}')
 
@@ -4,7 +4,7 @@ Main Tab - Primary experiment control and monitoring
 
 import customtkinter as ctk
 from tkinter import PanedWindow, Frame, messagebox, filedialog
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import threading
 import time
@@ -401,8 +401,9 @@ class MainTab(BaseTab):
     def setup_graphs(self):
         """Initialize matplotlib graphs"""
         # Multi-panel graphs (2x2 grid)
-        self.multi_fig, ((self.flow_ax, self.pressure_ax), 
-                         (self.temp_ax, self.level_ax)) = plt.subplots(2, 2, figsize=(12, 10))
+        self.multi_fig = Figure(figsize=(12, 10))
+        ((self.flow_ax, self.pressure_ax),
+         (self.temp_ax, self.level_ax)) = self.multi_fig.subplots(2, 2)
         
         # Configure each subplot
         graphs_config = [
@@ -434,7 +435,8 @@ class MainTab(BaseTab):
         self.multi_toolbar.update()
         
         # Single graph (for X-Y mode)
-        self.main_fig, self.main_ax = plt.subplots(figsize=(6, 6))
+        self.main_fig = Figure(figsize=(6, 6))
+        self.main_ax = self.main_fig.subplots()
         self.main_ax.set_xlabel("Time (s)", color='black', fontsize=12)
         self.main_ax.set_ylabel("Value", color='black', fontsize=12)
         self.main_ax.set_title("Real-Time Data Monitoring", color='black', fontsize=14, fontweight='bold', pad=15)
@@ -477,24 +479,20 @@ class MainTab(BaseTab):
         """Update all 4 graphs in multi-panel view"""
         # BUG FIX #1 & #4: Thread-safe access with lock and make copies
         with self.data_lock:
-            flow_x_copy = list(self.flow_x_data) if self.flow_x_data else []
-            flow_y_copy = list(self.flow_y_data) if self.flow_y_data else []
-            pressure_x_copy = list(self.pressure_x_data) if self.pressure_x_data else []
-            pressure_y_copy = list(self.pressure_y_data) if self.pressure_y_data else []
-            temp_x_copy = list(self.temp_x_data) if self.temp_x_data else []
-            temp_y_copy = list(self.temp_y_data) if self.temp_y_data else []
-            level_x_copy = list(self.level_x_data) if self.level_x_data else []
-            level_y_copy = list(self.level_y_data) if self.level_y_data else []
+            flow_x_copy = self.flow_x_data.view().copy()
+            flow_y_copy = self.flow_y_data.view().copy()
+            pressure_x_copy = self.pressure_x_data.view().copy()
+            pressure_y_copy = self.pressure_y_data.view().copy()
+            temp_x_copy = self.temp_x_data.view().copy()
+            temp_y_copy = self.temp_y_data.view().copy()
+            level_x_copy = self.level_x_data.view().copy()
+            level_y_copy = self.level_y_data.view().copy()
         
         # Flow graph
         self.flow_ax.clear()
         if len(flow_x_copy) > 0 and len(flow_y_copy) > 0:
             min_len = min(len(flow_x_copy), len(flow_y_copy))
             self.flow_ax.plot(flow_x_copy[:min_len], flow_y_copy[:min_len], color='#2E86AB', linewidth=2, alpha=0.85)
-            # Auto-scale axes
-            if min_len > 0:
-                self.flow_ax.relim()
-                self.flow_ax.autoscale()
         self.flow_ax.set_xlabel("Time (s)", color='black', fontsize=10)
         self.flow_ax.set_ylabel("Flow Rate (ml/min)", color='black', fontsize=10)
         self.flow_ax.set_title("Flow Rate", color='black', fontsize=12, fontweight='bold', pad=10)
@@ -506,10 +504,6 @@ class MainTab(BaseTab):
         if len(pressure_x_copy) > 0 and len(pressure_y_copy) > 0:
             min_len = min(len(pressure_x_copy), len(pressure_y_copy))
             self.pressure_ax.plot(pressure_x_copy[:min_len], pressure_y_copy[:min_len], color='#A23B72', linewidth=2, alpha=0.85)
-            # Auto-scale axes
-            if min_len > 0:
-                self.pressure_ax.relim()
-                self.pressure_ax.autoscale()
         self.pressure_ax.set_xlabel("Time (s)", color='black', fontsize=10)
         self.pressure_ax.set_ylabel("Pressure (bar)", color='black', fontsize=10)
         self.pressure_ax.set_title("Pressure", color='black', fontsize=12, fontweight='bold', pad=10)
@@ -521,10 +515,6 @@ class MainTab(BaseTab):
         if len(temp_x_copy) > 0 and len(temp_y_copy) > 0:
             min_len = min(len(temp_x_copy), len(temp_y_copy))
             self.temp_ax.plot(temp_x_copy[:min_len], temp_y_copy[:min_len], color='#F18F01', linewidth=2, alpha=0.85)
-            # Auto-scale axes
-            if min_len > 0:
-                self.temp_ax.relim()
-                self.temp_ax.autoscale()
         self.temp_ax.set_xlabel("Time (s)", color='black', fontsize=10)
         self.temp_ax.set_ylabel("Temperature (°C)", color='black', fontsize=10)
         self.temp_ax.set_title("Temperature", color='black', fontsize=12, fontweight='bold', pad=10)
@@ -536,10 +526,6 @@ class MainTab(BaseTab):
         if len(level_x_copy) > 0 and len(level_y_copy) > 0:
             min_len = min(len(level_x_copy), len(level_y_copy))
             self.level_ax.plot(level_x_copy[:min_len], level_y_copy[:min_len], color='#06A77D', linewidth=2, alpha=0.85)
-            # Auto-scale axes
-            if min_len > 0:
-                self.level_ax.relim()
-                self.level_ax.autoscale()
         self.level_ax.set_xlabel("Time (s)", color='black', fontsize=10)
         self.level_ax.set_ylabel("Level (%)", color='black', fontsize=10)
         self.level_ax.set_title("Liquid Level", color='black', fontsize=12, fontweight='bold', pad=10)
@@ -555,7 +541,7 @@ class MainTab(BaseTab):
                 spine.set_linewidth(1)
         
         self.multi_fig.tight_layout(pad=2.0)
-        self.multi_canvas.draw()
+        self.multi_canvas.draw_idle()
     
     def on_axis_change(self, *args):
         """Handle axis selection change"""
@@ -569,14 +555,14 @@ class MainTab(BaseTab):
         
         # BUG FIX #1 & #4: Thread-safe access with lock and make copies
         with self.data_lock:
-            flow_x_copy = list(self.flow_x_data) if self.flow_x_data else []
-            flow_y_copy = list(self.flow_y_data) if self.flow_y_data else []
-            pressure_x_copy = list(self.pressure_x_data) if self.pressure_x_data else []
-            pressure_y_copy = list(self.pressure_y_data) if self.pressure_y_data else []
-            temp_x_copy = list(self.temp_x_data) if self.temp_x_data else []
-            temp_y_copy = list(self.temp_y_data) if self.temp_y_data else []
-            level_x_copy = list(self.level_x_data) if self.level_x_data else []
-            level_y_copy = list(self.level_y_data) if self.level_y_data else []
+            flow_x_copy = self.flow_x_data.view().copy()
+            flow_y_copy = self.flow_y_data.view().copy()
+            pressure_x_copy = self.pressure_x_data.view().copy()
+            pressure_y_copy = self.pressure_y_data.view().copy()
+            temp_x_copy = self.temp_x_data.view().copy()
+            temp_y_copy = self.temp_y_data.view().copy()
+            level_x_copy = self.level_x_data.view().copy()
+            level_y_copy = self.level_y_data.view().copy()
             keithley_time_copy = list(self.keithley_time_data) if self.keithley_time_data else []
             keithley_voltage_copy = list(self.keithley_voltage_data) if self.keithley_voltage_data else []
             keithley_current_copy = list(self.keithley_current_data) if self.keithley_current_data else []
@@ -663,8 +649,8 @@ class MainTab(BaseTab):
         if len(x_param) > 0 and len(y_param) > 0:
             # Make sure arrays are the same length
             min_len = min(len(x_param), len(y_param))
-            x_plot = list(x_param[:min_len])
-            y_plot = list(y_param[:min_len])
+            x_plot = np.asarray(x_param[:min_len], dtype=np.float64)
+            y_plot = np.asarray(y_param[:min_len], dtype=np.float64)
         else:
             # Generate demo data - clean sine waves
             x_demo = np.linspace(0, 60, 200)
@@ -682,8 +668,8 @@ class MainTab(BaseTab):
                 y_demo = 0.001 + 0.0005 * np.sin(2 * np.pi * x_demo / 20)
             else:
                 y_demo = 10 + 2 * np.sin(2 * np.pi * x_demo / 15)
-            x_plot = x_demo.tolist()
-            y_plot = y_demo.tolist()
+            x_plot = x_demo
+            y_plot = y_demo
         
         # Plot the data
         self.main_ax.plot(x_plot, y_plot, color='#2E86AB', linewidth=2.5, alpha=0.85)
@@ -707,14 +693,19 @@ class MainTab(BaseTab):
             spine.set_linewidth(1)
         
         # Set axis limits
-        if len(x_plot) > 0 and len(y_plot) > 0:
-            x_margin = (max(x_plot) - min(x_plot)) * 0.05 if max(x_plot) > min(x_plot) else 1
-            y_margin = (max(y_plot) - min(y_plot)) * 0.1 if max(y_plot) > min(y_plot) else 1
-            self.main_ax.set_xlim(min(x_plot) - x_margin, max(x_plot) + x_margin)
-            self.main_ax.set_ylim(min(y_plot) - y_margin, max(y_plot) + y_margin)
+        # (NaN samples from a disconnected sensor are ignored)
+        x_valid = x_plot[np.isfinite(x_plot)]
+        y_valid = y_plot[np.isfinite(y_plot)]
+        if len(x_valid) > 0 and len(y_valid) > 0:
+            x_min, x_max = x_valid.min(), x_valid.max()
+            y_min, y_max = y_valid.min(), y_valid.max()
+            x_margin = (x_max - x_min) * 0.05 if x_max > x_min else 1
+            y_margin = (y_max - y_min) * 0.1 if y_max > y_min else 1
+            self.main_ax.set_xlim(x_min - x_margin, x_max + x_margin)
+            self.main_ax.set_ylim(y_min - y_margin, y_max + y_margin)
         
         self.main_fig.tight_layout(pad=2.0)
-        self.main_canvas.draw()
+        self.main_canvas.draw_idle()
     
     def update_statistics(self):
         """Calculate and update real-time statistics"""
@@ -722,10 +713,10 @@ class MainTab(BaseTab):
             # BUG FIX #4: Thread-safe access with lock and length validation
             with self.data_lock:
                 # Flow statistics
-                flow_y_copy = list(self.flow_y_data) if self.flow_y_data else []
-                pressure_y_copy = list(self.pressure_y_data) if self.pressure_y_data else []
-                temp_y_copy = list(self.temp_y_data) if self.temp_y_data else []
-                level_y_copy = list(self.level_y_data) if self.level_y_data else []
+                flow_y_copy = self.flow_y_data.view().copy()
+                pressure_y_copy = self.pressure_y_data.view().copy()
+                temp_y_copy = self.temp_y_data.view().copy()
+                level_y_copy = self.level_y_data.view().copy()
             
             # Calculate statistics on copies to avoid race conditions
             if len(flow_y_copy) > 0:
@@ -748,7 +739,7 @@ class MainTab(BaseTab):
                 self.pressure_stats_label.configure(text='Mean: N/A | Std: N/A')
             
             # Temperature statistics (filter out NaN values from disconnected sensor)
-            temp_y_valid = [t for t in temp_y_copy if not (isinstance(t, float) and (np.isnan(t) or np.isinf(t)))]
+            temp_y_valid = temp_y_copy[np.isfinite(temp_y_copy)]
             if len(temp_y_valid) > 0:
                 temp_mean = np.mean(temp_y_valid)
                 temp_std = np.std(temp_y_valid)
@@ -810,7 +801,7 @@ class MainTab(BaseTab):
             experiment_program = [{'duration': duration, 'flow_rate': flow_rate, 'valve_setting': valve_setting}]
             
             # Check if file needs to be created (separate from new measurement)
-            file_needs_creation = not self.data_handler.file_path or not os.path.exists(self.data_handler.file_path) or self.data_handler.file is None
+            file_needs_creation = not self.data_handler.is_open()
             
             # For multiple measurements: always treat as new measurement if base_time is None
             # Continuation only happens if experiment_base_time exists and we're resuming same measurement
@@ -914,7 +905,7 @@ class MainTab(BaseTab):
             self.current_flow_rate = experiment_program[0]['flow_rate']
         
         # Check if file needs to be created (separate from new measurement)
-        file_needs_creation = not self.data_handler.file_path or not os.path.exists(self.data_handler.file_path) or self.data_handler.file is None
+        file_needs_creation = not self.data_handler.is_open()
         
         # For multiple measurements: always treat as new measurement if base_time is None
         is_new_experiment = self.experiment_base_time is None
@@ -983,14 +974,7 @@ class MainTab(BaseTab):
         """Clear all graphs"""
         # BUG FIX #1: Thread-safe clearing with lock
         with self.data_lock:
-            self.flow_x_data.clear()
-            self.flow_y_data.clear()
-            self.pressure_x_data.clear()
-            self.pressure_y_data.clear()
-            self.temp_x_data.clear()
-            self.temp_y_data.clear()
-            self.level_x_data.clear()
-            self.level_y_data.clear()
+            self.reset_buffers()
             # Clear Keithley data
             self.keithley_voltage_data.clear()
             self.keithley_current_data.clear()
@@ -1043,7 +1027,7 @@ class MainTab(BaseTab):
                     self.update_queue.put(('UPDATE_STATUS', status_msg))
                 
                 # Log flow change to data file if recording
-                if self.data_handler.file_path and self.data_handler.file:
+                if self.data_handler.file_path and self.data_handler.is_open():
                     self.data_handler.log_flow_change(new_flow_rate)
                 
                 # Update current readings display
@@ -1393,7 +1377,7 @@ class MainTab(BaseTab):
                 self.update_queue.put(('UPDATE_STATUS', 'Starting new experiment...'))
             # Create file only if it doesn't exist (for multiple measurements in same file)
             # Note: measurement_counter was already incremented in start_recording/start_recording_from_program_tab
-            if not self.data_handler.file_path or not os.path.exists(self.data_handler.file_path) or self.data_handler.file is None:
+            if not self.data_handler.is_open():
                 self.data_handler.create_new_file()
             # Ensure base_time is set (should already be set in start_recording)
             if self.experiment_base_time is None:
@@ -1402,7 +1386,7 @@ class MainTab(BaseTab):
         else:
             if self.update_queue:
                 self.update_queue.put(('UPDATE_STATUS', f'Resuming experiment from {self.last_total_time:.1f}s...'))
-            if not self.data_handler.file_path or not os.path.exists(self.data_handler.file_path):
+            if not self.data_handler.is_open():
                 self.data_handler.create_new_file()
                 self.experiment_base_time = time.time()
                 self.last_total_time = 0.0
@@ -1577,9 +1561,12 @@ class MainTab(BaseTab):
                     print("[EXPERIMENT_THREAD] Experiment stopped due to pump timeout")
                     break  # Exit the loop
                 
-                pressure = self.exp_manager.hw_controller.read_pressure_sensor()
-                temperature = self.exp_manager.hw_controller.read_temperature_sensor()
-                level = self.exp_manager.hw_controller.read_level_sensor()
+                # The pump reply above already carries the pressure - no second GP query
+                pressure = pump_data.get('pressure')
+                # Temperature and level come from one DAQ scan
+                analog_data = self.exp_manager.hw_controller.read_all_analog()
+                temperature = analog_data['temperature']
+                level = analog_data['level']
                 
                 # Read Keithley measurements if enabled
                 keithley_voltage = None
@@ -1664,25 +1651,20 @@ class MainTab(BaseTab):
                 # Update graphs via queue (thread-safe - BUG FIX #1)
                 if self.update_queue:
                     try:
-                        # Make copies while holding lock
+                        # Make numpy copies while holding lock, sent as one message (one redraw)
                         with self.data_lock:
-                            flow_x_copy = list(self.flow_x_data)
-                            flow_y_copy = list(self.flow_y_data)
-                            pressure_x_copy = list(self.pressure_x_data)
-                            pressure_y_copy = list(self.pressure_y_data)
-                            temp_x_copy = list(self.temp_x_data)
-                            temp_y_copy = list(self.temp_y_data)
-                            level_x_copy = list(self.level_x_data)
-                            level_y_copy = list(self.level_y_data)
+                            graph_data = {
+                                'flow': (self.flow_x_data.view().copy(), self.flow_y_data.view().copy()),
+                                'pressure': (self.pressure_x_data.view().copy(), self.pressure_y_data.view().copy()),
+                                'temp': (self.temp_x_data.view().copy(), self.temp_y_data.view().copy()),
+                                'level': (self.level_x_data.view().copy(), self.level_y_data.view().copy()),
+                            }
                         
-                        self.update_queue.put(('UPDATE_GRAPH1', (flow_x_copy, flow_y_copy)))
-                        self.update_queue.put(('UPDATE_GRAPH2', (pressure_x_copy, pressure_y_copy)))
-                        self.update_queue.put(('UPDATE_GRAPH3', (temp_x_copy, temp_y_copy)))
-                        self.update_queue.put(('UPDATE_GRAPH4', (level_x_copy, level_y_copy)))
+                        self.update_queue.put(('UPDATE_ALL', graph_data))
                         if loop_count == 1:  # Print on first iteration
                             print(f"[EXPERIMENT_THREAD] Sent graph updates to queue")
-                            print(f"[EXPERIMENT_THREAD] Flow data: {len(flow_x_copy)} points")
-                            print(f"[EXPERIMENT_THREAD] Pressure data: {len(pressure_x_copy)} points")
+                            print(f"[EXPERIMENT_THREAD] Flow data: {len(graph_data['flow'][0])} points")
+                            print(f"[EXPERIMENT_THREAD] Pressure data: {len(graph_data['pressure'][0])} points")
                     except Exception as e:
                         print(f"[EXPERIMENT_THREAD ERROR] Error updating graphs: {e}")
                 time.sleep(1)
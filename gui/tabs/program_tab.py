@@ -323,13 +323,15 @@ class ProgramTab(BaseTab):
             start_time = time.time()
             
             while time.time() - start_time < duration and self.exp_manager.is_running:
-                if not self.exp_manager.perform_safety_checks():
-                    break
+                # One pump query and one DAQ scan for all readings
+                sensors = self.exp_manager.hw_controller.read_all_sensors()
+                pump_data = sensors['pump']
+                pressure = sensors['pressure']
+                temperature_read = sensors['temperature']
+                level = sensors['level']
                 
-                pump_data = self.exp_manager.hw_controller.read_pump_data()
-                pressure = self.exp_manager.hw_controller.read_pressure_sensor()
-                temperature_read = self.exp_manager.hw_controller.read_temperature_sensor()
-                level = self.exp_manager.hw_controller.read_level_sensor()
+                if not self.exp_manager.perform_safety_checks(level=level, pressure=pressure, temperature=temperature_read):
+                    break
                 
                 current_time = time.time()
                 elapsed_time_from_start = current_time - program_start_time
@@ -370,21 +372,16 @@ class ProgramTab(BaseTab):
                 
                 # Update graphs (thread-safe - BUG FIX #1)
                 if self.update_queue:
-                    # Make copies while holding lock
+                    # Make numpy copies while holding lock, sent as one message (one redraw)
                     with self.data_lock:
-                        flow_x_copy = list(self.flow_x_data)
-                        flow_y_copy = list(self.flow_y_data)
-                        pressure_x_copy = list(self.pressure_x_data)
-                        pressure_y_copy = list(self.pressure_y_data)
-                        temp_x_copy = list(self.temp_x_data)
-                        temp_y_copy = list(self.temp_y_data)
-                        level_x_copy = list(self.level_x_data)
-                        level_y_copy = list(self.level_y_data)
+                        graph_data = {
+                            'flow': (self.flow_x_data.view().copy(), self.flow_y_data.view().copy()),
+                            'pressure': (self.pressure_x_data.view().copy(), self.pressure_y_data.view().copy()),
+                            'temp': (self.temp_x_data.view().copy(), self.temp_y_data.view().copy()),
+                            'level': (self.level_x_data.view().copy(), self.level_y_data.view().copy()),
+                        }
                     
-                    self.update_queue.put(('UPDATE_GRAPH1', (flow_x_copy, flow_y_copy)))
-                    self.update_queue.put(('UPDATE_GRAPH2', (pressure_x_copy, pressure_y_copy)))
-                    self.update_queue.put(('UPDATE_GRAPH3', (temp_x_copy, temp_y_copy)))
-                    self.update_queue.put(('UPDATE_GRAPH4', (level_x_copy, level_y_copy)))
+                    self.update_queue.put(('UPDATE_ALL', graph_data))
                 time.sleep(1)
         
         self.exp_manager.stop_experiment()
@@ -2,7 +2,7 @@
 Graph widget for displaying real-time data
 """
 
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import customtkinter as ctk
 import numpy as np
@@ -31,7 +31,8 @@ class GraphWidget(ctk.CTkFrame):
         self.color = color
         
         # Create figure
-        self.fig, self.ax = plt.subplots(figsize=(6, 4))
+        self.fig = Figure(figsize=(6, 4))
+        self.ax = self.fig.subplots()
         self.ax.set_xlabel(self.xlabel, color='black', fontsize=10)
         self.ax.set_ylabel(self.ylabel, color='black', fontsize=10)
         self.ax.set_title(self.title, color='black', fontsize=12, fontweight='bold', pad=10)
@@ -73,7 +74,7 @@ class GraphWidget(ctk.CTkFrame):
         for spine in self.ax.spines.values():
             spine.set_color('black')
             spine.set_linewidth(1)
-        self.canvas.draw()
+        self.canvas.draw_idle()
     
     def clear(self):
         """Clear graph"""
@@ -83,7 +84,7 @@ class GraphWidget(ctk.CTkFrame):
         self.ax.set_title(self.title, color='black', fontsize=12, fontweight='bold', pad=10)
         self.ax.set_facecolor('white')
         self.ax.grid(True, alpha=0.4, color='gray', linestyle='-', linewidth=0.5)
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
 
 class MultiPanelGraphWidget(ctk.CTkFrame):
@@ -104,13 +105,15 @@ class MultiPanelGraphWidget(ctk.CTkFrame):
         # Create figure with subplots
         n_graphs = len(graphs_config)
         if n_graphs == 4:
-            self.fig, ((self.ax1, self.ax2), (self.ax3, self.ax4)) = plt.subplots(2, 2, figsize=(12, 10))
+            self.fig = Figure(figsize=(12, 10))
+            ((self.ax1, self.ax2), (self.ax3, self.ax4)) = self.fig.subplots(2, 2)
             self.axes = [self.ax1, self.ax2, self.ax3, self.ax4]
         else:
             # Fallback for other numbers
             rows = int(np.ceil(np.sqrt(n_graphs)))
             cols = int(np.ceil(n_graphs / rows))
-            self.fig, axes = plt.subplots(rows, cols, figsize=(12, 10))
+            self.fig = Figure(figsize=(12, 10))
+            axes = self.fig.subplots(rows, cols)
             if n_graphs == 1:
                 self.axes = [axes]
             else:
@@ -159,7 +162,7 @@ class MultiPanelGraphWidget(ctk.CTkFrame):
                 self.axes[i].set_facecolor('white')
                 self.axes[i].grid(True, alpha=0.4, color='gray', linestyle='-', linewidth=0.5)
                 self.axes[i].set_axisbelow(True)
-        self.canvas.draw()
+        self.canvas.draw_idle()
     
     def clear(self):
         """Clear all graphs"""
@@ -167,5 +170,5 @@ class MultiPanelGraphWidget(ctk.CTkFrame):
             ax.clear()
             ax.set_facecolor('white')
             ax.grid(True, alpha=0.4, color='gray', linestyle='-', linewidth=0.5)
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
@@ -10,6 +10,7 @@ from .sensors.pressure_sensor import PressureSensor
 from .sensors.temperature_sensor import TemperatureSensor
 from .sensors.flow_sensor import FlowSensor
 from .sensors.level_sensor import LevelSensor
+from config.hardware_config import PUMP_PORT, PRESSURE_CHANNEL, TEMP_CHANNEL, FLOW_CHANNEL, LEVEL_CHANNEL
 
 
 class HardwareController:
@@ -18,7 +19,7 @@ class HardwareController:
     Provides backward compatibility with the old hardware_control.py interface
     """
     
-    def __init__(self, pump_port='COM3', mc_board_num=0, smu_resource=None):
+    def __init__(self, pump_port=PUMP_PORT, mc_board_num=0, smu_resource=None):
         """
         Initialize hardware controller with all components
         
@@ -34,10 +35,10 @@ class HardwareController:
         self.ni_daq = MCusb1408FS(board_num=mc_board_num)
         
         # Initialize sensors (connected to NI DAQ)
-        self.pressure_sensor = PressureSensor(ni_daq=self.ni_daq, channel='ai0')
-        self.temperature_sensor = TemperatureSensor(ni_daq=self.ni_daq, channel='ai1')
-        self.flow_sensor = FlowSensor(ni_daq=self.ni_daq, channel='ai2', pump_setpoint_flow=1.5)
-        self.level_sensor = LevelSensor(ni_daq=self.ni_daq, channel='ai3')
+        self.pressure_sensor = PressureSensor(ni_daq=self.ni_daq, channel=PRESSURE_CHANNEL)
+        self.temperature_sensor = TemperatureSensor(ni_daq=self.ni_daq, channel=TEMP_CHANNEL)
+        self.flow_sensor = FlowSensor(ni_daq=self.ni_daq, channel=FLOW_CHANNEL, pump_setpoint_flow=1.5)
+        self.level_sensor = LevelSensor(ni_daq=self.ni_daq, channel=LEVEL_CHANNEL)
         
         # Initialize SMU
         self.smu = Keithley2450(resource=smu_resource)
@@ -99,6 +100,45 @@ class HardwareController:
         """Read level sensor"""
         return self.level_sensor.read()
     
+    def read_all_analog(self):
+        """
+        Read all DAQ-connected sensors with a single multi-channel scan
+        Pressure is read from the pump (serial), so it is not part of this scan.
+        
+        Returns:
+            Dictionary with 'temperature', 'flow' and 'level' (None for a failed sensor)
+        """
+        voltages = {}
+        if self.ni_daq and self.ni_daq.is_connected() and hasattr(self.ni_daq, 'read_analog_inputs'):
+            channels = [self.temperature_sensor.channel, self.flow_sensor.channel, self.level_sensor.channel]
+            values = self.ni_daq.read_analog_inputs(channels)
+            if values:
+                voltages = dict(zip(channels, values))
+        
+        # Sensors fall back to their own single-channel read (or simulation) if the scan failed
+        return {
+            'temperature': self.temperature_sensor.read(voltages.get(self.temperature_sensor.channel)),
+            'flow': self.flow_sensor.read(voltages.get(self.flow_sensor.channel)),
+            'level': self.level_sensor.read(voltages.get(self.level_sensor.channel))
+        }
+    
+    def read_all_sensors(self):
+        """
+        Read the pump and all DAQ sensors for one sample
+        
+        The pump is queried once (one GP round-trip, which includes a 0.1 s wait) and its
+        pressure is reused, instead of read_pump_data() and read_pressure_sensor() each
+        sending their own GP command. The DAQ sensors come from one scan (read_all_analog).
+        
+        Returns:
+            Dictionary with 'pump' (pump data dict), 'pressure', 'temperature', 'flow' and 'level'
+        """
+        pump_data = self.read_pump_data()
+        sensors = self.read_all_analog()
+        sensors['pump'] = pump_data
+        sensors['pressure'] = pump_data.get('pressure')
+        return sensors
+    
     # --- DAQ Device Control Functions (backward compatibility) ---
     def set_valves(self, valve_1_state, valve_2_state):
         """
@@ -158,6 +198,22 @@ class HardwareController:
         """Set SMU voltage"""
         return self.smu.set_voltage(voltage)
     
+    def start_smu_voltage_sweep(self, start_v, end_v, points, delay):
+        """Start an instrument-timed SMU voltage sweep"""
+        return self.smu.start_voltage_sweep(start_v, end_v, points, delay)
+    
+    def get_smu_sweep_count(self):
+        """Get the number of SMU sweep readings stored so far"""
+        return self.smu.get_sweep_count()
+    
+    def read_smu_sweep_data(self, start_index, end_index):
+        """Read SMU sweep readings (voltages, currents, relative_times)"""
+        return self.smu.read_sweep_data(start_index, end_index)
+    
+    def abort_smu_sweep(self):
+        """Abort a running SMU sweep"""
+        self.smu.abort_sweep()
+    
     def setup_smu_for_current_source(self, voltage_limit=20.0, current_range=None):
         """Setup SMU for current source / voltage measurement mode"""
         return self.smu.setup_for_current_source_measurement(voltage_limit, current_range)
@@ -166,15 +222,16 @@ class HardwareController:
         """Set SMU current"""
         return self.smu.set_current(current)
     
-    def measure_smu(self, mode="voltage"):
+    def measure_smu(self, mode="voltage", source_value=None):
         """
         Measure voltage and current from SMU
         
         Args:
             mode: "voltage" (Source Voltage / Measure Current) 
                   OR "current" (Source Current / Measure Voltage)
+            source_value: Setpoint just programmed by the caller (skips the setpoint query)
         """
-        return self.smu.measure(mode=mode)
+        return self.smu.measure(mode=mode, source_value=source_value)
     
     # --- SMU Safe Mode Switching ---
     def configure_smu_mode_safe(self, mode, bias_value=0.0, current_limit=0.1, voltage_limit=20.0):
@@ -3,9 +3,11 @@ MCusb-1408FS-Plus DAQ control module
 Measurement Computing USB-1408FS-Plus
 """
 
+import ctypes
+
 try:
     from mcculw import ul
-    from mcculw.enums import ULRange, DigitalIODirection, InterfaceType
+    from mcculw.enums import ULRange, DigitalIODirection, InterfaceType, ScanOptions
     MCCULW_AVAILABLE = True
     # USB-1408FS-Plus analog outputs support only 0-5V range
     ANALOG_OUTPUT_RANGE = ULRange.UNI5VOLTS
@@ -140,6 +142,47 @@ class MCusb1408FS(HardwareBase):
             print(f"Error reading analog input channel {channel}: {e}")
             return None
     
+    def read_analog_inputs(self, channels):
+        """
+        Read several single-ended analog inputs with one hardware scan
+        
+        Uses ul.a_in_scan over the contiguous channel range (one USB transaction)
+        instead of one ul.a_in round-trip per channel.
+        
+        Args:
+            channels: List of channels (numbers or strings like 'ai1')
+            
+        Returns:
+            List of voltages in the same order as channels, or None on error
+        """
+        if not self.connected or not MCCULW_AVAILABLE:
+            return None
+        
+        try:
+            channel_nums = [int(ch.replace('ai', '')) if isinstance(ch, str) else int(ch) for ch in channels]
+            low_chan = min(channel_nums)
+            high_chan = max(channel_nums)
+            if high_chan > 3:
+                print(f"Warning: Channel {high_chan} is out of range. USB-1408FS-Plus has 4 channels (0-3)")
+                return None
+            
+            num_points = high_chan - low_chan + 1
+            ai_range = ULRange.BIP10VOLTS
+            memhandle = ul.win_buf_alloc(num_points)
+            if not memhandle:
+                raise Exception("Could not allocate scan buffer")
+            try:
+                # One sample per channel, blocking until the scan is complete
+                ul.a_in_scan(self.board_id, low_chan, high_chan, num_points, 1000,
+                             ai_range, memhandle, ScanOptions.FOREGROUND)
+                raw = ctypes.cast(memhandle, ctypes.POINTER(ctypes.c_ushort))
+                return [ul.to_eng_units(self.board_id, ai_range, raw[ch - low_chan]) for ch in channel_nums]
+            finally:
+                ul.win_buf_free(memhandle)
+        except Exception as e:
+            print(f"Error scanning analog inputs {channels}: {e}")
+            return None
+    
     def write_digital_output(self, channel, value):
         """
         Write digital output using dedicated DIO ports
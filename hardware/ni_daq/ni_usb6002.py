@@ -5,6 +5,9 @@ NI USB-6002 DAQ control module
 import nidaqmx
 from hardware.base import HardwareBase
 
+# Analog input channels kept in the persistent read task (in task order)
+AI_CHANNELS = ['ai0', 'ai1', 'ai2', 'ai3']
+
 
 class NIUSB6002(HardwareBase):
     """
@@ -28,9 +31,12 @@ class NIUSB6002(HardwareBase):
     def connect(self):
         """Connect to NI device"""
         try:
+            # One task for all analog inputs, created and started once.
+            # Every read is then a single task.read() with no DAQmx setup cost.
             self.ni_task = nidaqmx.Task()
-            # Add an analog input channel for pressure sensor
-            self.ni_task.ai_channels.add_ai_voltage_chan(f"{self.ni_device_name}/ai0")
+            for channel in AI_CHANNELS:
+                self.ni_task.ai_channels.add_ai_voltage_chan(f"{self.ni_device_name}/{channel}")
+            self.ni_task.start()
             print(f"Connected to NI device: {self.ni_device_name}")
             self.connected = True
             self.simulation_mode = False
@@ -38,6 +44,11 @@ class NIUSB6002(HardwareBase):
         except (nidaqmx.errors.DaqError, nidaqmx.errors.DaqNotFoundError, Exception) as e:
             print(f"Error connecting to NI device: {e}")
             print("Running in simulation mode for NI sensors.")
+            if self.ni_task:
+                try:
+                    self.ni_task.close()
+                except:
+                    pass
             self.ni_task = None
             self.enable_simulation()
             return False
@@ -46,34 +57,47 @@ class NIUSB6002(HardwareBase):
         """Disconnect from NI device"""
         if self.ni_task:
             try:
+                self.ni_task.stop()
                 self.ni_task.close()
             except:
                 pass
             self.ni_task = None
         self.connected = False
     
-    def read_analog_input(self, channel):
+    def read_analog_inputs(self, channels):
         """
-        Read analog input from specified channel
+        Read several analog inputs with one task read
         
         Args:
-            channel: Channel name (e.g., 'ai0', 'ai1')
+            channels: List of channels (numbers or strings like 'ai1')
             
         Returns:
-            Voltage value or None on error
+            List of voltages in the same order as channels, or None on error
         """
         if self.ni_task:
             try:
-                # For now, using the default channel configured in __init__
-                # In full implementation, would configure channel dynamically
-                voltage = self.ni_task.read()
-                return voltage
-            except nidaqmx.errors.DaqError as e:
+                # One sample from every channel in the task (ai0..ai3)
+                values = self.ni_task.read()
+                return [values[int(ch.replace('ai', '')) if isinstance(ch, str) else int(ch)] for ch in channels]
+            except (nidaqmx.errors.DaqError, IndexError, ValueError) as e:
                 print(f"Error reading from NI device: {e}")
                 return None
         else:
             return None
     
+    def read_analog_input(self, channel):
+        """
+        Read analog input from specified channel
+        
+        Args:
+            channel: Channel name (e.g., 'ai0', 'ai1')
+            
+        Returns:
+            Voltage value or None on error
+        """
+        values = self.read_analog_inputs([channel])
+        return values[0] if values else None
+    
     def write_digital_output(self, channel, value):
         """
         Write digital output
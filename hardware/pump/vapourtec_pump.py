@@ -378,11 +378,11 @@ class VapourtecPump(HardwareBase):
         Read data from pump (flow, pressure, RPM)
         
         Returns:
-            Dictionary with flow, pressure, and rpm
+            Dictionary with flow, pressure, and rpm (pressure is None on a failed read)
         """
         if self.pump and self.connected:
             try:
-                # Get pressure
+                # Get pressure (None on a failed read - passed through, not replaced)
                 pressure = self.get_pressure()
                 
                 # Get flow rate (current setpoint)
@@ -394,12 +394,17 @@ class VapourtecPump(HardwareBase):
                 
                 return {
                     "flow": flow,
-                    "pressure": pressure if pressure is not None else 0.0,
+                    "pressure": pressure,
                     "rpm": rpm
                 }
             except Exception as e:
                 print(f"Error reading pump data: {e}")
-                return self._simulate_data()
+                # Report the failed read instead of substituting simulated values
+                return {
+                    "flow": self.pump_setpoint_flow,
+                    "pressure": None,
+                    "rpm": None
+                }
         else:
             # Realistic simulation
             return self._simulate_data()
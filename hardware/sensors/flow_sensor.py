@@ -57,16 +57,21 @@ class FlowSensor(HardwareBase):
         self.pump_setpoint_flow = flow_rate
         self.flow_change_time = time.time()
     
-    def read(self):
+    def read(self, voltage=None):
         """
         Read flow rate value
         
+        Args:
+            voltage: Voltage already read for this channel (e.g. from a multi-channel scan).
+                     If None, the channel is read from the DAQ.
+        
         Returns:
             Flow rate in L/min (or None on error)
         """
         if self.ni_daq and self.ni_daq.is_connected():
             try:
-                voltage = self.ni_daq.read_analog_input(self.channel)
+                if voltage is None:
+                    voltage = self.ni_daq.read_analog_input(self.channel)
                 # Check if voltage is None (read failed)
                 if voltage is None:
                     # Return simulated value if read failed
@@ -47,10 +47,14 @@ class LevelSensor(HardwareBase):
         """Disconnect from sensor"""
         self.connected = False
     
-    def read(self):
+    def read(self, voltage=None):
         """
         Read level value
         
+        Args:
+            voltage: Voltage already read for this channel (e.g. from a multi-channel scan).
+                     If None, the channel is read from the DAQ.
+        
         Returns:
             Level as fraction (0.0 to 1.0) or None on error (in real mode)
             In simulation mode, returns simulated value
@@ -66,7 +70,8 @@ class LevelSensor(HardwareBase):
         
         # Real mode - try to read actual sensor
         try:
-            voltage = self.ni_daq.read_analog_input(self.channel)
+            if voltage is None:
+                voltage = self.ni_daq.read_analog_input(self.channel)
             
             # Check if voltage is None (read failed)
             if voltage is None:
@@ -71,7 +71,7 @@ class TemperatureSensor(HardwareBase):
         
         return False
     
-    def read(self):
+    def read(self, voltage=None):
         """
         Read temperature value from 4-20mA temperature transmitter
         
@@ -81,12 +81,17 @@ class TemperatureSensor(HardwareBase):
         - Shunt Resistor: 556 Ohms
         - Input: Voltage across shunt resistor
         
+        Args:
+            voltage: Voltage already read for this channel (e.g. from a multi-channel scan).
+                     If None, the channel is read from the DAQ.
+        
         Returns:
             Temperature in Celsius, or None if sensor disconnected
         """
         if self.ni_daq and self.ni_daq.is_connected():
             try:
-                voltage = self.ni_daq.read_analog_input(self.channel)
+                if voltage is None:
+                    voltage = self.ni_daq.read_analog_input(self.channel)
                 # Check if voltage is None (read failed)
                 if voltage is None:
                     if self._should_print_error("voltage_none"):
@@ -3,32 +3,17 @@ Keithley 2450 SMU (Source Measure Unit) control module
 """
 
 import time
+import numpy as np
 from hardware.base import HardwareBase
 from hardware.smu.scpi_commands import SCPICommands
 
 # Try to import pyvisa
+# The VISA backend is chosen when a Keithley2450 is created (_initialize_visa) - not probed at import
 PYVISA_AVAILABLE = False
-VISA_BACKEND = None
 
 try:
     import pyvisa
     PYVISA_AVAILABLE = True
-    
-    # Try to determine which VISA backend is available
-    try:
-        rm_ni = pyvisa.ResourceManager()
-        VISA_BACKEND = '@ni'
-        print("Using NI-VISA backend (recommended for USB devices)")
-        rm_ni.close()
-    except:
-        try:
-            rm_py = pyvisa.ResourceManager('@py')
-            VISA_BACKEND = '@py'
-            print("Using pyvisa-py backend (limited USB support)")
-            rm_py.close()
-        except:
-            VISA_BACKEND = None
-            print("Warning: VISA backend could not be initialized")
 except ImportError:
     PYVISA_AVAILABLE = False
     print("PyVISA not available. SMU will run in simulation mode.")
@@ -387,6 +372,81 @@ class Keithley2450(HardwareBase):
             import traceback
             traceback.print_exc()
     
+    def start_voltage_sweep(self, start_v, end_v, points, delay):
+        """
+        Start an instrument-timed linear voltage sweep (call setup_for_iv_measurement first).
+        The SMU steps the source and stores each reading in defbuffer1 without a VISA
+        round trip per point - poll get_sweep_count() and fetch with read_sweep_data().
+        
+        Args:
+            start_v: First voltage (V)
+            end_v: Last voltage (V)
+            points: Number of points
+            delay: Source delay before each measurement (s)
+            
+        Returns:
+            True if the sweep was started, False otherwise
+        """
+        if not self.smu:
+            print("SMU not connected. Cannot start sweep.")
+            return False
+        
+        try:
+            self.smu.write(self.scpi.clear_buffer())
+            print(f"Sending: SOUR:SWE:VOLT:LIN {start_v}, {end_v}, {points}, {delay}")
+            self.smu.write(self.scpi.set_voltage_sweep_linear(start_v, end_v, points, delay))
+            self.smu.write(self.scpi.initiate())
+            return True
+        except Exception as e:
+            print(f"Error starting SMU sweep: {e}")
+            return False
+    
+    def get_sweep_count(self):
+        """
+        Get the number of sweep readings stored so far
+        
+        Returns:
+            Reading count, or None on error
+        """
+        if not self.smu:
+            return None
+        
+        try:
+            return int(self.smu.query(self.scpi.query_buffer_count()).strip())
+        except Exception as e:
+            print(f"Error reading SMU buffer count: {e}")
+            return None
+    
+    def read_sweep_data(self, start_index, end_index):
+        """
+        Read sweep readings from defbuffer1 in one transfer
+        
+        Args:
+            start_index: First reading (1-based)
+            end_index: Last reading (inclusive)
+            
+        Returns:
+            (voltages, currents, relative_times) numpy arrays, or None on error
+        """
+        if not self.smu:
+            return None
+        
+        try:
+            response = self.smu.query(self.scpi.query_buffer_data(start_index, end_index))
+            values = np.array(response.strip().split(','), dtype=np.float64).reshape(-1, 3)
+            return values[:, 0], values[:, 1], values[:, 2]
+        except Exception as e:
+            print(f"Error reading SMU sweep data: {e}")
+            return None
+    
+    def abort_sweep(self):
+        """Abort a running instrument sweep"""
+        if self.smu:
+            try:
+                self.smu.write(self.scpi.abort())
+            except Exception as e:
+                print(f"Error aborting SMU sweep: {e}")
+    
     def set_voltage(self, voltage):
         """
         Set SMU output voltage (bias value)
@@ -511,7 +571,7 @@ class Keithley2450(HardwareBase):
             print(f"Error setting SMU current: {e}")
             return False
     
-    def measure(self, mode="voltage"):
+    def measure(self, mode="voltage", source_value=None):
         """
         Measure voltage and current from SMU.
         
@@ -528,6 +588,9 @@ class Keithley2450(HardwareBase):
         Args:
             mode: "voltage" (Source Voltage / Measure Current)
                   OR "current" (Source Current / Measure Voltage)
+            source_value: Setpoint the caller just programmed. If given, it is returned
+                          as the source value and the SOUR:VOLT?/SOUR:CURR? query is skipped
+                          (one VISA round trip less per measurement).
         
         Returns:
             dict with keys:
@@ -552,12 +615,15 @@ class Keithley2450(HardwareBase):
                     return None
                 
                 # Voltage is the programmed source voltage (setpoint)
-                try:
-                    v_str = self.smu.query(self.scpi.query_voltage()).strip()
-                    voltage = float(v_str)
-                except Exception as e:
-                    print(f"Warning: Could not read programmed voltage (SOUR:VOLT?): {e}")
-                    return None
+                if source_value is not None:
+                    voltage = float(source_value)
+                else:
+                    try:
+                        v_str = self.smu.query(self.scpi.query_voltage()).strip()
+                        voltage = float(v_str)
+                    except Exception as e:
+                        print(f"Warning: Could not read programmed voltage (SOUR:VOLT?): {e}")
+                        return None
                 
                 data["voltage"] = voltage
                 data["current"] = current
@@ -573,12 +639,15 @@ class Keithley2450(HardwareBase):
                     return None
                 
                 # Current is the programmed source current (setpoint)
-                try:
-                    i_str = self.smu.query(self.scpi.query_current()).strip()
-                    current = float(i_str)
-                except Exception as e:
-                    print(f"Warning: Could not read programmed current (SOUR:CURR?): {e}")
-                    return None
+                if source_value is not None:
+                    current = float(source_value)
+                else:
+                    try:
+                        i_str = self.smu.query(self.scpi.query_current()).strip()
+                        current = float(i_str)
+                    except Exception as e:
+                        print(f"Warning: Could not read programmed current (SOUR:CURR?): {e}")
+                        return None
                 
                 data["voltage"] = voltage
                 data["current"] = current
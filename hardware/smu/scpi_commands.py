@@ -187,4 +187,35 @@ class SCPICommands:
     def set_format_elements():
         """Set data format elements for READ? command (V, I, R, S)"""
         return "FORM:ELEM VOLT,CURR,RES,STAT"
+    
+    # --- Instrument-Timed Sweep ---
+    @staticmethod
+    def set_voltage_sweep_linear(start, stop, points, delay):
+        """Build a linear voltage sweep in the trigger model (readings go to defbuffer1)"""
+        return f":SOUR:SWE:VOLT:LIN {start}, {stop}, {points}, {delay}"
+    
+    @staticmethod
+    def initiate():
+        """Start the trigger model"""
+        return ":INIT"
+    
+    @staticmethod
+    def abort():
+        """Stop the trigger model"""
+        return ":ABOR"
+    
+    @staticmethod
+    def clear_buffer(buffer_name="defbuffer1"):
+        """Clear a reading buffer"""
+        return f':TRAC:CLE "{buffer_name}"'
+    
+    @staticmethod
+    def query_buffer_count(buffer_name="defbuffer1"):
+        """Query the number of readings in a buffer"""
+        return f':TRAC:ACT? "{buffer_name}"'
+    
+    @staticmethod
+    def query_buffer_data(start_index, end_index, buffer_name="defbuffer1"):
+        """Query source value, reading and relative time of buffer entries start_index..end_index (1-based)"""
+        return f':TRAC:DATA? {start_index}, {end_index}, "{buffer_name}", SOUR, READ, REL'
 
@@ -4,15 +4,34 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from hardware.hardware_controller import HardwareController
 from experiments.experiment_manager import ExperimentManager
-from utils.data_handler import DataHandler
+from utils.data_handler import create_data_handler
+from utils.sample_buffer import SampleBuffer
+from config.settings import DATA_FILE_FORMAT, GUI_UPDATE_INTERVAL, LOG_LEVEL
+import atexit
 import queue
 import logging
+import numpy as np
+import logging.handlers
 
-# Configure global logging: by default show only WARNING and above
-logging.basicConfig(
-    level=logging.WARNING,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+# Maximum number of update_queue messages handled per poll - bounds the work per Tk tick
+UPDATE_QUEUE_MAX_ITEMS = 256
+# Message types that only set state - when several arrive in one poll, only the newest is applied
+COALESCED_UPDATES = frozenset([
+    'UPDATE_IV_STATUS', 'UPDATE_IV_FILE', 'UPDATE_IV_STATUS_BAR', 'UPDATE_IV_TIME_GRAPH',
+    'UPDATE_STATUS', 'UPDATE_RECORDING_STATUS', 'UPDATE_FILE', 'UPDATE_READINGS',
+    'UPDATE_PROGRAM_STATUS', 'UPDATE_IV_PROGRAM_STATUS', 'UPDATE_IV_READING', 'UPDATE_MCUSB_CH0',
+    'UPDATE_IV_GRAPH_TAIL',
+])
+
+# Configure global logging at LOG_LEVEL (WARNING by default).
+# When INFO/DEBUG output is enabled (LOG_LEVEL in config/settings.py), those records are
+# collected in a MemoryHandler and written in batches: when 256 are pending, once per
+# second from the sensor loop and at exit. WARNING and above are written immediately.
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+_log_buffer = logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.WARNING, target=_console_handler)
+logging.basicConfig(level=LOG_LEVEL, handlers=[_log_buffer])
+atexit.register(_log_buffer.flush)
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +57,8 @@ class FluidicControlApp(ctk.CTk):
         
         # Queue for thread-safe GUI updates
         self.update_queue = queue.Queue()
+        # Queue polling period (ms) - shortened by a running IV program via SET_POLL_MS
+        self.update_poll_ms = GUI_UPDATE_INTERVAL
         
         # Flag to stop periodic callbacks
         self.is_closing = False
@@ -54,7 +75,7 @@ class FluidicControlApp(ctk.CTk):
             mc_board_num=0,  # MCusb-1408FS-Plus board number (default 0)
             smu_resource=None  # Auto-detect Keithley 2450
         )
-        self.data_handler = DataHandler()
+        self.data_handler = create_data_handler(DATA_FILE_FORMAT)
         self.exp_manager = ExperimentManager(self.hw_controller, self.data_handler)
         
         # Create UI
@@ -151,151 +172,222 @@ class FluidicControlApp(ctk.CTk):
         """Check for thread-safe GUI updates and route to appropriate tabs"""
         if self.is_closing:
             return
+        # Latest graph series from UPDATE_ALL messages - each message is a full snapshot,
+        # so only the newest one per series is drawn, once per poll
+        latest_graphs = {}
+        # IV graph arrays received this poll: [x chunks, y chunks, replace] - replace if an
+        # UPDATE_IV_GRAPH was seen (chunks are joined once, not converted to lists)
+        iv_points = None
+        # Newest data of each COALESCED_UPDATES type
+        latest = {}
         try:
-            while True:
-                update_type, data = self.update_queue.get_nowait()
-                
-                # Route updates to appropriate tabs
-                if update_type in ['UPDATE_GRAPH1', 'UPDATE_GRAPH2', 'UPDATE_GRAPH3', 'UPDATE_GRAPH4']:
-                    # Main tab graph updates
-                    if hasattr(self, 'main_tab_instance') and self.main_tab_instance is not None:
-                        try:
-                            x, y = data
-                            logger.debug(
-                                "Received %s: %d x points, %d y points",
-                                update_type,
-                                len(x) if x else 0,
-                                len(y) if y else 0,
-                            )
-                            # BUG FIX #1: Thread-safe update of data arrays with lock
-                            with self.main_tab_instance.data_lock:
-                                # Update the data arrays first
-                                if update_type == 'UPDATE_GRAPH1':
-                                    self.main_tab_instance.flow_x_data = list(x) if x else []
-                                    self.main_tab_instance.flow_y_data = list(y) if y else []
-                                    logger.debug(
-                                        "Updated flow data: %d points",
-                                        len(self.main_tab_instance.flow_x_data),
-                                    )
-                                elif update_type == 'UPDATE_GRAPH2':
-                                    self.main_tab_instance.pressure_x_data = list(x) if x else []
-                                    self.main_tab_instance.pressure_y_data = list(y) if y else []
-                                    logger.debug(
-                                        "Updated pressure data: %d points",
-                                        len(self.main_tab_instance.pressure_x_data),
-                                    )
-                                elif update_type == 'UPDATE_GRAPH3':
-                                    self.main_tab_instance.temp_x_data = list(x) if x else []
-                                    self.main_tab_instance.temp_y_data = list(y) if y else []
-                                elif update_type == 'UPDATE_GRAPH4':
-                                    self.main_tab_instance.level_x_data = list(x) if x else []
-                                    self.main_tab_instance.level_y_data = list(y) if y else []
-                            
-                            # Update graphs based on current mode
-                            graph_mode = self.main_tab_instance.graph_mode_var.get()
-                            logger.debug("Graph mode: %s", graph_mode)
-                            if graph_mode == "multi":
-                                logger.debug("Calling update_multi_panel_graphs()")
-                                self.main_tab_instance.update_multi_panel_graphs()
-                            else:
-                                # For single graph mode, update with current axis selection
-                                x_axis_type = self.main_tab_instance.x_axis_combo.get()
-                                y_axis_type = self.main_tab_instance.y_axis_combo.get()
-                                logger.debug(
-                                    "Calling plot_xy_graph(%s, %s)",
-                                    x_axis_type,
-                                    y_axis_type,
-                                )
-                                self.main_tab_instance.plot_xy_graph(x_axis_type, y_axis_type, [], [])
-                            
-                            # Update statistics
-                            self.main_tab_instance.update_statistics()
-                            logger.debug("Graph update completed")
-                        except Exception as e:
-                            logger.error("Error updating graphs: %s", e, exc_info=True)
-                
-                elif update_type in ['UPDATE_IV_GRAPH', 'UPDATE_IV_STATUS', 'UPDATE_IV_FILE', 
-                                     'UPDATE_IV_STATUS_BAR', 'UPDATE_IV_TIME_GRAPH']:
-                    # IV tab updates
-                    if hasattr(self, 'iv_tab_instance'):
-                        if update_type == 'UPDATE_IV_GRAPH':
-                            x, y = data
-                            self.iv_tab_instance.update_iv_graph(x, y)
-                            self.iv_tab_instance.update_iv_statistics()
-                            # Update current readings with last point
-                            if len(x) > 0 and len(y) > 0:
-                                last_v = x[-1]
-                                last_i = y[-1]
-                                resistance = last_v / last_i if last_i != 0 else float('inf')
-                                self.iv_tab_instance.iv_voltage_label.configure(
-                                    text=self.iv_tab_instance.format_value_with_unit(last_v, 'voltage'))
-                                self.iv_tab_instance.iv_current_label.configure(
-                                    text=self.iv_tab_instance.format_value_with_unit(last_i, 'current'))
-                                if resistance != float('inf'):
-                                    self.iv_tab_instance.iv_resistance_label.configure(
-                                        text=self.iv_tab_instance.format_value_with_unit(resistance, 'resistance'))
-                                else:
-                                    self.iv_tab_instance.iv_resistance_label.configure(text="∞")
-                        elif update_type == 'UPDATE_IV_STATUS':
-                            text, color = data
-                            self.iv_tab_instance.iv_status_label.configure(text=text, text_color=color)
-                        elif update_type == 'UPDATE_IV_FILE':
-                            self.iv_tab_instance.iv_file_label.configure(text=data)
-                        elif update_type == 'UPDATE_IV_STATUS_BAR':
-                            self.iv_tab_instance.iv_status_bar.configure(text=data)
-                        elif update_type == 'UPDATE_IV_TIME_GRAPH':
-                            x_axis_type = self.iv_tab_instance.iv_x_axis_combo.get()
-                            y_axis_type = self.iv_tab_instance.iv_y_axis_combo.get()
-                            self.iv_tab_instance.plot_iv_xy_graph(x_axis_type, y_axis_type)
-                        elif update_type == 'UPDATE_MCUSB_CH0':
-                            # MCusb channel 0 reading update
-                            voltage = data
-                            self.iv_tab_instance.mcusb_ch0_label.configure(
-                                text=f'{voltage:.4f} V', text_color='green')
-                
-                elif update_type in ['UPDATE_STATUS', 'UPDATE_RECORDING_STATUS', 'UPDATE_FILE', 'UPDATE_READINGS']:
-                    # Main tab status updates
-                    if hasattr(self, 'main_tab_instance'):
-                        if update_type == 'UPDATE_STATUS':
-                            self.main_tab_instance.status_bar.configure(text=data)
-                        elif update_type == 'UPDATE_RECORDING_STATUS':
-                            text, color = data
-                            self.main_tab_instance.recording_status_label.configure(text=text, text_color=color)
-                        elif update_type == 'UPDATE_FILE':
-                            self.main_tab_instance.current_file_label.configure(text=data)
-                        elif update_type == 'UPDATE_READINGS':
-                            pressure, temp, flow, level = data
-                            # FIXED: Handle None pressure (sensor disconnected)
-                            if pressure is not None:
-                                self.main_tab_instance.pressure_label.configure(text=f"{pressure:.2f} bar", text_color='green')
-                            else:
-                                self.main_tab_instance.pressure_label.configure(text="N/A", text_color='red')
-                            # Handle None temperature (sensor disconnected)
-                            if temp is not None:
-                                self.main_tab_instance.temp_label.configure(text=f"{temp:.2f} °C", text_color='green')
-                            else:
-                                self.main_tab_instance.temp_label.configure(text="---", text_color='red')
-                            self.main_tab_instance.flow_label.configure(text=f"{flow:.2f} ml/min")
-                            # FIXED: Handle None level (sensor disconnected)
-                            if level is not None:
-                                self.main_tab_instance.level_label.configure(text=f"{level:.2f} %", text_color='green')
-                            else:
-                                self.main_tab_instance.level_label.configure(text="N/A", text_color='red')
-                
-                elif update_type == 'UPDATE_PROGRAM_STATUS':
-                    # Program tab status updates
-                    if hasattr(self, 'program_tab_instance'):
-                        self.program_tab_instance.program_status_label.configure(text=data)
-                        
-        except queue.Empty:
-            pass
+            try:
+                # At most UPDATE_QUEUE_MAX_ITEMS per poll - the rest waits for the next poll
+                for _ in range(UPDATE_QUEUE_MAX_ITEMS):
+                    update_type, data = self.update_queue.get_nowait()
+                    
+                    if update_type == 'UPDATE_ALL':
+                        latest_graphs.update(data)
+                    elif update_type == 'UPDATE_IV_GRAPH':
+                        iv_points = [[data[0]], [data[1]], True]
+                    elif update_type == 'UPDATE_IV_GRAPH_APPEND':
+                        if iv_points is None:
+                            iv_points = [[data[0]], [data[1]], False]
+                        else:
+                            iv_points[0].append(data[0])
+                            iv_points[1].append(data[1])
+                    elif update_type in COALESCED_UPDATES:
+                        latest[update_type] = data
+                    else:
+                        self.route_update(update_type, data)
+            except queue.Empty:
+                pass
+            
+            # Graph points first - a refit (UPDATE_IV_TIME_GRAPH) queued after them must see them
+            if iv_points is not None:
+                x_chunks, y_chunks, replace = iv_points
+                x = x_chunks[0] if len(x_chunks) == 1 else np.concatenate(x_chunks)
+                y = y_chunks[0] if len(y_chunks) == 1 else np.concatenate(y_chunks)
+                self.route_update('UPDATE_IV_GRAPH' if replace else 'UPDATE_IV_GRAPH_APPEND', (x, y))
+            # Apply the coalesced updates once
+            for update_type, data in latest.items():
+                self.route_update(update_type, data)
+            if latest_graphs:
+                self.apply_main_tab_graphs(latest_graphs)
         finally:
             # Schedule next check (only if not closing)
             if not self.is_closing:
-                self.check_update_job = self.after(100, self.check_update_queue)
+                self.check_update_job = self.after(self.update_poll_ms, self.check_update_queue)
                 if self.check_update_job:
                     self.pending_callbacks.append(self.check_update_job)
     
+    def route_update(self, update_type, data):
+        """
+        Apply one update_queue message to the tab it belongs to
+        
+        Args:
+            update_type: Message type, e.g. 'UPDATE_STATUS'
+            data: Message payload
+        """
+        # Route updates to appropriate tabs
+        if update_type == 'UPDATE_ALL':
+            self.apply_main_tab_graphs(data)
+        
+        elif update_type in ['UPDATE_IV_GRAPH', 'UPDATE_IV_GRAPH_APPEND', 'UPDATE_IV_STATUS',
+                             'UPDATE_IV_FILE', 'UPDATE_IV_STATUS_BAR', 'UPDATE_IV_TIME_GRAPH',
+                             'UPDATE_IV_READING', 'UPDATE_IV_STOP_BUTTON', 'UPDATE_SMU_STATUS',
+                             'UPDATE_SMU_ERROR', 'UPDATE_MCUSB_CH0', 'UPDATE_VISA_DEVICE',
+                             'UPDATE_VISA_SCAN_DONE', 'UPDATE_IV_GRAPH_TAIL']:
+            # IV tab updates
+            if hasattr(self, 'iv_tab_instance'):
+                if update_type in ('UPDATE_IV_GRAPH', 'UPDATE_IV_GRAPH_APPEND'):
+                    x, y = data
+                    if update_type == 'UPDATE_IV_GRAPH':
+                        self.iv_tab_instance.update_iv_graph(x, y)
+                    else:
+                        # Only the new points - the IV tab keeps the full data
+                        self.iv_tab_instance.append_iv_data(x, y)
+                    self.iv_tab_instance.update_iv_statistics()
+                    # Update current readings with last point
+                    if len(x) > 0 and len(y) > 0:
+                        self.iv_tab_instance.show_iv_reading(x[-1], y[-1])
+                elif update_type == 'UPDATE_IV_GRAPH_TAIL':
+                    # The sweep appended to the IV tab's own buffers - only the count is sent
+                    self.iv_tab_instance.refresh_iv_graph(data)
+                elif update_type == 'UPDATE_IV_READING':
+                    voltage, current = data
+                    self.iv_tab_instance.show_iv_reading(voltage, current)
+                elif update_type == 'UPDATE_IV_STOP_BUTTON':
+                    self.iv_tab_instance.iv_stop_button.configure(state=data)
+                elif update_type == 'UPDATE_SMU_STATUS':
+                    self.iv_tab_instance._update_smu_ui(data)
+                elif update_type == 'UPDATE_SMU_ERROR':
+                    self.iv_tab_instance._update_smu_error(data)
+                elif update_type == 'UPDATE_IV_STATUS':
+                    text, color = data
+                    self.iv_tab_instance.iv_status_label.configure(text=text, text_color=color)
+                elif update_type == 'UPDATE_IV_FILE':
+                    self.iv_tab_instance.iv_file_label.configure(text=data)
+                elif update_type == 'UPDATE_IV_STATUS_BAR':
+                    self.iv_tab_instance.iv_status_bar.configure(text=data)
+                elif update_type == 'UPDATE_IV_TIME_GRAPH':
+                    x_axis_type = self.iv_tab_instance.iv_x_axis_combo.get()
+                    y_axis_type = self.iv_tab_instance.iv_y_axis_combo.get()
+                    self.iv_tab_instance.plot_iv_xy_graph(x_axis_type, y_axis_type)
+                elif update_type == 'UPDATE_VISA_DEVICE':
+                    self.iv_tab_instance._add_visa_device(*data)
+                elif update_type == 'UPDATE_VISA_SCAN_DONE':
+                    self.iv_tab_instance._finish_visa_scan(data)
+                elif update_type == 'UPDATE_MCUSB_CH0':
+                    # MCusb channel 0 reading update
+                    voltage = data
+                    self.iv_tab_instance.mcusb_ch0_label.configure(
+                        text=f'{voltage:.4f} V', text_color='green')
+        
+        elif update_type in ['UPDATE_STATUS', 'UPDATE_RECORDING_STATUS', 'UPDATE_FILE', 'UPDATE_READINGS']:
+            # Main tab status updates
+            if hasattr(self, 'main_tab_instance'):
+                if update_type == 'UPDATE_STATUS':
+                    self.main_tab_instance.status_bar.configure(text=data)
+                elif update_type == 'UPDATE_RECORDING_STATUS':
+                    text, color = data
+                    self.main_tab_instance.recording_status_label.configure(text=text, text_color=color)
+                elif update_type == 'UPDATE_FILE':
+                    self.main_tab_instance.current_file_label.configure(text=data)
+                elif update_type == 'UPDATE_READINGS':
+                    pressure, temp, flow, level = data
+                    # FIXED: Handle None pressure (sensor disconnected)
+                    if pressure is not None:
+                        self.main_tab_instance.pressure_label.configure(text=f"{pressure:.2f} bar", text_color='green')
+                    else:
+                        self.main_tab_instance.pressure_label.configure(text="N/A", text_color='red')
+                    # Handle None temperature (sensor disconnected)
+                    if temp is not None:
+                        self.main_tab_instance.temp_label.configure(text=f"{temp:.2f} °C", text_color='green')
+                    else:
+                        self.main_tab_instance.temp_label.configure(text="---", text_color='red')
+                    self.main_tab_instance.flow_label.configure(text=f"{flow:.2f} ml/min")
+                    # FIXED: Handle None level (sensor disconnected)
+                    if level is not None:
+                        self.main_tab_instance.level_label.configure(text=f"{level:.2f} %", text_color='green')
+                    else:
+                        self.main_tab_instance.level_label.configure(text="N/A", text_color='red')
+        
+        elif update_type == 'UPDATE_IV_PROGRAM_STATUS':
+            # IV program tab status label
+            if hasattr(self, 'iv_program_tab_instance'):
+                text, color = data
+                self.iv_program_tab_instance.update_status(text, color)
+        
+        elif update_type == 'SHOW_ERROR':
+            # Error dialog requested by a worker thread (Tk dialogs must run on this thread)
+            messagebox.showerror('Error', data)
+        
+        elif update_type == 'SHOW_INFO':
+            # Info dialog requested by a worker thread
+            title, message = data
+            messagebox.showinfo(title, message)
+        
+        elif update_type == 'SHOW_WARNING':
+            # Warning dialog requested by a worker thread
+            title, message = data
+            messagebox.showwarning(title, message)
+        
+        elif update_type == 'SET_POLL_MS':
+            # None restores the default polling period
+            self.update_poll_ms = data if data else GUI_UPDATE_INTERVAL
+        
+        elif update_type == 'UPDATE_PROGRAM_STATUS':
+            # Program tab status updates
+            if hasattr(self, 'program_tab_instance'):
+                self.program_tab_instance.program_status_label.configure(text=data)
+    
+    def apply_main_tab_graphs(self, graph_data):
+        """
+        Replace the main tab series and redraw its graphs once
+        
+        Args:
+            graph_data: Dict of series name -> (x array, y array), as sent with UPDATE_ALL
+        """
+        if not hasattr(self, 'main_tab_instance') or self.main_tab_instance is None:
+            return
+        try:
+            # Copy each array into its own buffer outside the lock (series may share
+            # one time array), then only swap the references under it
+            buffers = {}
+            for series, (x, y) in graph_data.items():
+                buffers[f'{series}_x_data'] = SampleBuffer.copy_of(x)
+                buffers[f'{series}_y_data'] = SampleBuffer.copy_of(y)
+            with self.main_tab_instance.data_lock:
+                for name, buffer in buffers.items():
+                    setattr(self.main_tab_instance, name, buffer)
+            self.refresh_main_tab_graphs()
+        except Exception as e:
+            logger.error("Error updating graphs: %s", e, exc_info=True)
+    
+    def refresh_main_tab_graphs(self):
+        """Redraw the main tab graphs and statistics from its data arrays"""
+        # Update graphs based on current mode
+        graph_mode = self.main_tab_instance.graph_mode_var.get()
+        logger.debug("Graph mode: %s", graph_mode)
+        if graph_mode == "multi":
+            logger.debug("Calling update_multi_panel_graphs()")
+            self.main_tab_instance.update_multi_panel_graphs()
+        else:
+            # For single graph mode, update with current axis selection
+            x_axis_type = self.main_tab_instance.x_axis_combo.get()
+            y_axis_type = self.main_tab_instance.y_axis_combo.get()
+            logger.debug(
+                "Calling plot_xy_graph(%s, %s)",
+                x_axis_type,
+                y_axis_type,
+            )
+            self.main_tab_instance.plot_xy_graph(x_axis_type, y_axis_type, [], [])
+        
+        # Update statistics
+        self.main_tab_instance.update_statistics()
+        logger.debug("Graph update completed")
+    
     def update_sensor_readings(self):
         """Periodically update sensor readings"""
         if self.is_closing:
@@ -305,10 +397,12 @@ class FluidicControlApp(ctk.CTk):
         try:
             if not self.exp_manager.is_running:
                 try:
-                    pressure = self.hw_controller.read_pressure_sensor()
-                    temperature = self.hw_controller.read_temperature_sensor()
-                    pump_data = self.hw_controller.read_pump_data()
-                    level = self.hw_controller.read_level_sensor()
+                    # One pump query and one DAQ scan for all readings
+                    sensors = self.hw_controller.read_all_sensors()
+                    pressure = sensors['pressure']
+                    temperature = sensors['temperature']
+                    pump_data = sensors['pump']
+                    level = sensors['level']
                     
                     self.update_queue.put(('UPDATE_READINGS', (pressure, temperature, pump_data['flow'], level * 100)))
                 except Exception as e:
@@ -318,6 +412,9 @@ class FluidicControlApp(ctk.CTk):
             logger.error("Critical error in update_sensor_readings: %s", e, exc_info=True)
             # Ensure we still schedule next update even on critical error
         
+        # Write buffered INFO/DEBUG log records at least once per second
+        _log_buffer.flush()
+        
         # Schedule next update (only if not closing)
         if not self.is_closing:
             try:
@@ -0,0 +1,86 @@
+"""
+Tests for the DataHandler CSV writer (no hardware needed)
+Run from the project root: python -m pytest tests/test_data_handler.py
+"""
+
+import os
+
+import numpy as np
+
+from utils.data_handler import DataHandler, build_row_format, _csv_field
+
+
+def read_lines(handler):
+    with open(handler.file_path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_build_row_format():
+    row_format = build_row_format(["time", "voltage"])
+    assert row_format == "{time},{voltage}\n"
+    assert row_format.format(time=1.5, voltage=-2) == "1.5,-2\n"
+
+
+def test_csv_field_quoting():
+    assert _csv_field(None) == ""
+    assert _csv_field(1.25) == 1.25
+    assert _csv_field("plain") == "plain"
+    assert _csv_field("a,b") == '"a,b"'
+    assert _csv_field('say "hi"') == '"say ""hi"""'
+
+
+def test_append_data_rows(tmp_path):
+    handler = DataHandler(str(tmp_path))
+    handler.create_new_file(["time", "program_step", "voltage"])
+    handler.append_data({"time": 0.5, "program_step": "ramp, up", "voltage": None})
+    handler.append_data({"time": 1.0, "voltage": 2.0, "not_a_column": 7})
+    handler.close_file()
+    assert read_lines(handler) == [
+        "time,program_step,voltage",
+        '0.5,"ramp, up",',
+        "1.0,,2.0",
+    ]
+
+
+def test_append_columns(tmp_path):
+    handler = DataHandler(str(tmp_path))
+    handler.create_new_file(["voltage", "current", "program_step"])
+    handler.append_columns({"voltage": np.array([0.0, 0.5]), "current": [1e-3, None]})
+    handler.close_file()
+    assert read_lines(handler) == [
+        "voltage,current,program_step",
+        "0.0,0.001,",
+        "0.5,,",
+    ]
+
+
+def test_file_created_on_first_row(tmp_path):
+    handler = DataHandler(str(tmp_path))
+    handler.create_new_file()
+    assert handler.is_open()
+    assert not os.path.exists(handler.file_path)
+
+    handler.append_data({"time": 1.0})
+    assert os.path.exists(handler.file_path)
+    handler.close_file()
+
+
+def test_no_file_for_run_without_rows(tmp_path):
+    handler = DataHandler(str(tmp_path))
+    handler.create_new_file()
+    handler.close_file()
+    assert not handler.is_open()
+    assert os.listdir(tmp_path) == []
+
+
+def test_row_after_close_does_not_reopen(tmp_path):
+    handler = DataHandler(str(tmp_path))
+    handler.create_new_file(["time"])
+    handler.append_data({"time": 1.0})
+    handler.close_file()
+
+    # A late row from another thread must not truncate the recording
+    handler._write_row({"time": 2.0})
+    handler.append_columns({"time": [3.0]})
+    assert handler.fd is None
+    assert read_lines(handler) == ["time", "1.0"]
@@ -0,0 +1,48 @@
+"""
+Tests for I-V program parsing and voltage ramps (no hardware needed)
+Run from the project root: python -m pytest tests/test_iv_program.py
+"""
+
+import numpy as np
+
+from utils.iv_program import RAMP_TOLERANCE, parse_program_targets, ramp_voltages
+
+
+def test_parse_program_targets():
+    program = (
+        "# comment: voltage=9\n"
+        "step1: voltage=1.5, duration=10\n"
+        "step2: duration=5, Voltage = -0.25\n"
+        "  # indented comment: voltage=7\n"
+        "no colon voltage=3\n"
+        "step3: duration=5\n"
+        "step4: voltage=abc\n"
+        "step5:voltage=2"
+    )
+    assert parse_program_targets(program) == [1.5, -0.25, 2.0]
+
+
+def test_parse_program_uses_first_voltage_item():
+    assert parse_program_targets("s: voltage=1, voltage=2\n") == [1.0]
+
+
+def test_parse_empty_program():
+    assert parse_program_targets("") == []
+
+
+def test_ramp_up_clamps_last_step_to_target():
+    np.testing.assert_allclose(ramp_voltages(0.0, 1.0, 0.3), [0.3, 0.6, 0.9, 1.0])
+
+
+def test_ramp_down():
+    np.testing.assert_allclose(ramp_voltages(1.0, 0.0, 0.5), [0.5, 0.0])
+
+
+def test_ramp_exact_multiple_ends_on_target():
+    voltages = ramp_voltages(0.0, 1.0, 0.1)
+    assert len(voltages) == 10
+    assert voltages[-1] == 1.0
+
+
+def test_no_ramp_when_already_at_target():
+    assert len(ramp_voltages(1.0, 1.0 + RAMP_TOLERANCE / 2, 0.1)) == 0
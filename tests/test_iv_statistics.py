@@ -0,0 +1,47 @@
+"""
+Tests for the I-V statistics kernel (no hardware needed)
+Run from the project root: python -m pytest tests/test_iv_statistics.py
+"""
+
+import numpy as np
+
+from utils.iv_statistics import MIN_CURRENT, iv_statistics, _iv_statistics_kernel, _iv_statistics_numpy
+
+
+def assert_same(result, expected):
+    np.testing.assert_allclose(np.array(result, dtype=np.float64), np.array(expected, dtype=np.float64))
+
+
+def test_ranges():
+    voltages = np.array([-1.0, 0.0, 2.0])
+    currents = np.array([-0.5, 0.0, 0.5])
+    # Resistance skips the zero current: -1/-0.5 = 2, 2/0.5 = 4
+    assert_same(iv_statistics(voltages, currents), (-1.0, 2.0, -0.5, 0.5, 2.0, 4.0))
+
+
+def test_nan_samples_are_skipped():
+    voltages = np.array([1.0, np.nan, 3.0])
+    currents = np.array([np.nan, 0.1, 1.0])
+    assert_same(iv_statistics(voltages, currents), (1.0, 3.0, 0.1, 1.0, 3.0, 3.0))
+
+
+def test_no_valid_values_give_nan():
+    empty = np.array([], dtype=np.float64)
+    assert np.isnan(iv_statistics(empty, empty)).all()
+
+    voltages = np.array([1.0, 2.0])
+    currents = np.array([0.0, MIN_CURRENT / 2])
+    result = iv_statistics(voltages, currents)
+    assert_same(result[:4], (1.0, 2.0, 0.0, MIN_CURRENT / 2))
+    assert np.isnan(result[4]) and np.isnan(result[5])
+
+
+def test_kernel_and_numpy_versions_agree():
+    # _iv_statistics_kernel is the numba-compiled version when numba is installed
+    rng = np.random.default_rng(1)
+    voltages = rng.normal(size=10000)
+    currents = rng.normal(scale=1e-3, size=10000)
+    voltages[rng.integers(0, 10000, 100)] = np.nan
+    currents[rng.integers(0, 10000, 100)] = np.nan
+    currents[:10] = 0.0
+    assert_same(_iv_statistics_kernel(voltages, currents), _iv_statistics_numpy(voltages, currents))
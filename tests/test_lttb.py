@@ -0,0 +1,53 @@
+"""
+Tests for LTTB downsampling (no hardware needed)
+Run from the project root: python -m pytest tests/test_lttb.py
+"""
+
+import numpy as np
+
+from utils.lttb import lttb, _bucket_edges, _lttb_kernel, _lttb_numpy
+
+
+def test_short_input_is_returned_unchanged():
+    x = np.arange(10.0)
+    y = x * 2
+    out_x, out_y = lttb(x, y, 10)
+    assert out_x is x and out_y is y
+    assert lttb(x, y, 2)[0] is x
+
+
+def test_keeps_endpoints_and_point_count():
+    x = np.linspace(0, 10, 1000)
+    y = np.sin(x)
+    out_x, out_y = lttb(x, y, 50)
+    assert len(out_x) == len(out_y) == 50
+    assert out_x[0] == x[0] and out_x[-1] == x[-1]
+    assert np.all(np.diff(out_x) > 0)
+
+
+def test_keeps_a_single_spike():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[437] = 5.0
+    out_x, out_y = lttb(x, y, 20)
+    assert 437.0 in out_x
+    assert out_y.max() == 5.0
+
+
+def test_skips_nan_samples():
+    x = np.arange(200.0)
+    y = np.cos(x / 10)
+    y[50:53] = np.nan  # Shorter than a bucket (about 7 points)
+    y[120] = np.nan
+    out_x, out_y = lttb(x, y, 30)
+    assert not np.isnan(out_y).any()
+
+
+def test_kernel_and_numpy_versions_agree():
+    rng = np.random.default_rng(0)
+    x = np.cumsum(rng.random(5000))
+    y = rng.normal(size=5000)
+    y[rng.integers(0, 5000, 50)] = np.nan
+    for n_out in (3, 17, 500):
+        edges = _bucket_edges(len(x), n_out)
+        np.testing.assert_array_equal(_lttb_kernel(x, y, edges), _lttb_numpy(x, y, edges))
@@ -0,0 +1,49 @@
+"""
+Test that a failed pump pressure read reaches read_all_sensors() as None
+(not 0.0 or a simulated value), so the safety checks see it as a failed read
+"""
+
+from hardware.hardware_controller import HardwareController
+
+
+class FailingSerial:
+    """Serial port stand-in whose GP round-trip always fails"""
+
+    in_waiting = 0
+
+    def write(self, data):
+        raise OSError("simulated serial failure")
+
+    def read(self, size):
+        return b''
+
+
+def test_failed_pump_read_reaches_sensors_as_none():
+    hw_controller = HardwareController(pump_port='COM3', mc_board_num=0, smu_resource=None)
+    pump = hw_controller.pump
+    saved = (pump.pump, pump.ser, pump.connected)
+    try:
+        # Make the pump look connected, with a serial port that fails every read
+        pump.pump = object()
+        pump.ser = FailingSerial()
+        pump.connected = True
+
+        sensors = hw_controller.read_all_sensors()
+
+        assert sensors['pressure'] is None, f"expected None, got {sensors['pressure']!r}"
+        assert sensors['pump']['pressure'] is None
+    finally:
+        pump.pump, pump.ser, pump.connected = saved
+        hw_controller.cleanup()
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("Testing read_all_sensors() with a failing pump read")
+    print("="*60 + "\n")
+
+    try:
+        test_failed_pump_read_reaches_sensors_as_none()
+        print("[OK] Failed pressure read reported as None")
+    except AssertionError as e:
+        print(f"[FAIL] {e}")
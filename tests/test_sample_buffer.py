@@ -0,0 +1,72 @@
+"""
+Tests for SampleBuffer and decimate (no hardware needed)
+Run from the project root: python -m pytest tests/test_sample_buffer.py
+"""
+
+import numpy as np
+
+from utils.sample_buffer import SampleBuffer, decimate
+
+
+def test_append_grows_past_capacity():
+    buffer = SampleBuffer(capacity=2)
+    for value in (1.0, 2.0, None, 4.0):
+        buffer.append(value)
+    assert len(buffer) == 4
+    np.testing.assert_array_equal(buffer.view(), [1.0, 2.0, np.nan, 4.0])
+    assert buffer[-1] == 4.0
+
+
+def test_extend_and_tolist():
+    buffer = SampleBuffer(capacity=1)
+    buffer.extend([1, 2])
+    buffer.extend(np.array([3.5]))
+    assert buffer.tolist() == [1.0, 2.0, 3.5]
+    assert list(buffer) == [1.0, 2.0, 3.5]
+
+
+def test_clear_keeps_allocation():
+    buffer = SampleBuffer(capacity=8)
+    buffer.extend(range(8))
+    data = buffer._data
+    generation = buffer.generation
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.generation == generation + 1
+    buffer.append(1.0)
+    assert buffer._data is data
+
+
+def test_set_converts_non_numbers_to_nan():
+    buffer = SampleBuffer()
+    buffer.set([1.0, "FLOW_CHANGE", None, "2.5"])
+    np.testing.assert_array_equal(buffer.view(), [1.0, np.nan, np.nan, 2.5])
+
+
+def test_reserve_does_not_shrink():
+    buffer = SampleBuffer(capacity=16)
+    buffer.reserve(4)
+    assert len(buffer._data) == 16
+    buffer.reserve(100)
+    assert len(buffer._data) >= 100
+
+
+def test_copy_of_does_not_alias():
+    time_data = np.arange(3.0)
+    a = SampleBuffer.copy_of(time_data)
+    b = SampleBuffer.copy_of(time_data)
+    a.set([9.0, 9.0])
+    a.append(1.0)
+    np.testing.assert_array_equal(time_data, [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(b.view(), [0.0, 1.0, 2.0])
+
+
+def test_decimate_keeps_short_series_and_last_point():
+    x = np.arange(10.0)
+    assert decimate(x, x, max_points=20)[0] is x
+
+    x = np.arange(1001.0)
+    dx, dy = decimate(x, -x, max_points=100)
+    assert len(dx) <= 101
+    assert dx[0] == 0.0 and dx[-1] == 1000.0
+    np.testing.assert_array_equal(dy, -dx)
@@ -0,0 +1,34 @@
+"""
+Tests for compute_voltage_points (no hardware needed)
+Run from the project root: python -m pytest tests/test_voltage_points.py
+"""
+
+import pytest
+
+from experiments.experiment_types.iv_experiment import compute_voltage_points
+
+
+def test_includes_end_voltage():
+    points = compute_voltage_points(0.0, 1.0, 0.1)
+    assert len(points) == 11
+    assert points[0] == 0.0
+    assert points[-1] == 1.0
+
+
+def test_descending_sweep_ignores_step_sign():
+    assert compute_voltage_points(2.0, -2.0, 1.0) == [2.0, 1.0, 0.0, -1.0, -2.0]
+    assert compute_voltage_points(2.0, -2.0, -1.0) == [2.0, 1.0, 0.0, -1.0, -2.0]
+
+
+def test_stops_before_end_when_not_a_multiple():
+    points = compute_voltage_points(0.0, 1.0, 0.3)
+    assert points == pytest.approx([0.0, 0.3, 0.6, 0.9])
+
+
+def test_single_point_when_start_equals_end():
+    assert compute_voltage_points(0.5, 0.5, 0.1) == [0.5]
+
+
+def test_zero_step_is_rejected():
+    with pytest.raises(ValueError):
+        compute_voltage_points(0.0, 1.0, 0.0)
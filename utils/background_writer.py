@@ -0,0 +1,99 @@
+"""
+Background writer - moves data file writes off the acquisition thread
+"""
+
+import logging
+import queue
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWriter:
+    """
+    Writes data points to a DataHandler from a separate thread.
+    The acquisition loop only puts rows into a bounded queue, so a slow disk
+    flush never delays the next sensor read.
+    """
+
+    def __init__(self, data_handler, maxsize=1024, batch_size=64, recycle_rows=False, pool_size=32):
+        """
+        Initialize background writer
+
+        Args:
+            data_handler: DataHandler instance with an open file
+            maxsize: Maximum number of queued rows before new rows are dropped
+            batch_size: Maximum number of rows written per batch
+            recycle_rows: Return written row dicts to free_rows for reuse by the producer
+                          (only if the producer does not keep its own reference to queued rows)
+            pool_size: Maximum number of row dicts kept in free_rows
+        """
+        self.data_handler = data_handler
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread = None
+        self.dropped = 0  # Rows dropped because the queue was full
+        self.recycle_rows = recycle_rows
+        # Written row dicts waiting to be refilled (deque append/pop are thread-safe)
+        self.free_rows = deque(maxlen=pool_size)
+
+    def start(self):
+        """Start the writer thread"""
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def put(self, data_point):
+        """
+        Queue a data point for writing (never blocks)
+
+        Returns:
+            True if queued, False if the queue was full and the row was dropped
+        """
+        try:
+            self.queue.put_nowait(data_point)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Writer queue full - dropped data point (%d total)", self.dropped)
+            return False
+
+    def get_row(self):
+        """Get a recycled row dict to fill, or a new one if none is free"""
+        try:
+            return self.free_rows.pop()
+        except IndexError:
+            return {}
+
+    def stop(self):
+        """Write all queued rows and stop the writer thread"""
+        if self.thread is None:
+            return
+        # None is the sentinel - blocking put so it is never dropped
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def _writer_loop(self):
+        """Thread worker - drain the queue in batches and write them"""
+        while True:
+            items = [self.queue.get()]
+            # Collect whatever else is already waiting, up to batch_size rows
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = items[-1] is None
+            rows = [item for item in items if item is not None]
+            if rows:
+                try:
+                    self.data_handler.append_data_batch(rows)
+                except Exception as e:
+                    logger.error("Error in background writer: %s", e)
+                if self.recycle_rows:
+                    # Rows are serialized now - hand the dicts back to the producer
+                    self.free_rows.extend(rows)
+            if done:
+                break
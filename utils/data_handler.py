@@ -1,27 +1,144 @@
 # data_handler.py
 
-import csv
+import atexit
+import logging
+import weakref
 from datetime import datetime
+import time
 import os  # Library for interacting with the operating system, used here for file paths.
-import pandas as pd  # For Excel export functionality
+import threading
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Fixed CSV schema. Every data file uses these columns in this order.
+CSV_FIELDNAMES = [
+    "measurement_id",
+    "time",
+    "flow_setpoint",
+    "pump_flow_read",
+    "pressure_read",
+    "temp_read",
+    "level_read",
+    "program_step",
+    "voltage",
+    "current",
+    "target_voltage"
+    # We can add more fieldnames here for other sensors if needed.
+]
+
+# Column sets for experiments that only record part of the full schema
+TIME_DEPENDENT_FIELDNAMES = ("time", "flow_setpoint", "pump_flow_read", "pressure_read", "temp_read", "level_read")
+IV_FIELDNAMES = ("voltage", "current")
+IV_PROGRAM_FIELDNAMES = ("time", "program_step", "voltage", "current", "target_voltage")
+
+
+def build_row_format(fieldnames):
+    """
+    Build the preformatted row template for a schema
+    One str.format_map call per row instead of csv.DictWriter
+    """
+    return ",".join("{" + name + "}" for name in fieldnames) + "\n"
+
+
+CSV_ROW_FORMAT = build_row_format(CSV_FIELDNAMES)
+CSV_HEADER = ",".join(CSV_FIELDNAMES) + "\n"
+
+# Encoded rows are collected in memory and written with one os.write call once
+# CSV_BUFFER_SIZE bytes (64 KiB) are pending, or every flush_interval seconds
+CSV_BUFFER_SIZE = 1 << 16
+
+# Raw append-only file descriptor (no TextIOWrapper/codec layer per write).
+# O_BINARY keeps Windows from translating '\n' to '\r\n'.
+CSV_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+
+# Handlers with an open file. A raw fd is not flushed by Python at exit, so anything still
+# open (e.g. main-tab recording when the app is closed) is closed by _close_open_handlers.
+_open_handlers = weakref.WeakSet()
+
+
+def _close_open_handlers():
+    for handler in list(_open_handlers):
+        try:
+            handler.close_file()
+        except Exception as e:
+            logger.error("Error closing data file at exit: %s", e)
+
+
+atexit.register(_close_open_handlers)
+
+# Parquet output: program_step is text, every other column is stored as float64
+PARQUET_TEXT_FIELDS = ["program_step"]
+PARQUET_CHUNK_SIZE = 4096  # Rows per column batch / row group
+
+
+class _CsvRow:
+    """
+    Read-only mapping view over a data point for str.format_map
+    Missing keys and None values become empty fields (same as csv.DictWriter restval)
+    """
+    __slots__ = ('data_point',)
+
+    def __init__(self, data_point):
+        self.data_point = data_point
+
+    def __getitem__(self, key):
+        return _csv_field(self.data_point.get(key))
+
+
+def _csv_field(value):
+    """Field value for a CSV row - None becomes an empty field, special text is quoted"""
+    if value is None:
+        return ""
+    if isinstance(value, str) and (',' in value or '"' in value or '\n' in value):
+        # Quote like the csv module does for fields with special characters
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _column_text(values):
+    """
+    CSV text of each value in a column - same text as a per-row write
+    Numeric numpy arrays are converted in one call (numpy and str() give the same float text)
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fiu':
+        return values.astype(str).tolist()
+    return [str(_csv_field(value)) for value in values]
 
 
 # This class handles saving data to a file.
 class DataHandler:
     # The constructor.
-    def __init__(self, data_folder="data"):
+    def __init__(self, data_folder="data", flush_interval=2.0):
         # We will create a 'data' folder to store all experiment files.
         self.data_folder = data_folder
         self.file_path = None  # This will store the path to the current file.
-        self.file = None
-        self.writer = None
+        self.fd = None  # OS file descriptor of the open data file
+        self._pending = False  # create_new_file was called, the file is opened on the first row
+        self.fieldnames = list(CSV_FIELDNAMES)  # Columns of the current file
+        self._row_format = CSV_ROW_FORMAT
+        # With a large buffer, rows are pushed to disk at most every flush_interval seconds
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._buf = bytearray()  # Encoded rows waiting to be written
+        # The experiment thread appends rows while the GUI thread logs flow changes and closes
+        # the file - every access to fd/_buf goes through this lock (reentrant: open -> flush)
+        self._lock = threading.RLock()
         self.custom_filename = None  # Store custom filename for recording
         self.metadata = None  # Store experiment metadata
 
         # Check if the data folder exists; if not, create it.
         if not os.path.exists(self.data_folder):
             os.makedirs(self.data_folder)
-            print(f"Created data folder: {self.data_folder}")
+            logger.info("Created data folder: %s", self.data_folder)
 
     def set_custom_filename(self, filename):
         """
@@ -29,7 +146,7 @@ class DataHandler:
         filename: The base filename (without extension)
         """
         self.custom_filename = filename
-        print(f"Custom filename set to: {filename}")
+        logger.info("Custom filename set to: %s", filename)
     
     def set_metadata(self, metadata):
         """
@@ -37,51 +154,53 @@ class DataHandler:
         metadata: Dictionary with experiment metadata (name, description, tags, operator, etc.)
         """
         self.metadata = metadata
-        print(f"Metadata set: {metadata}")
+        logger.info("Metadata set: %s", metadata)
 
-    # This function creates a new CSV file for a new experiment.
-    def create_new_file(self):
-        # Generate a unique filename using the current timestamp.
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Use custom filename if set, otherwise use default
-        if self.custom_filename:
-            filename = f"{self.custom_filename}_{timestamp}.csv"
-        else:
-            filename = f"experiment_data_{timestamp}.csv"
+    # This function prepares a new CSV file for a new experiment.
+    # The file itself is only created when the first row is written, so aborted runs leave no empty files.
+    # fieldnames: Optional column list for this file (default: the full CSV_FIELDNAMES schema)
+    def create_new_file(self, fieldnames=None):
+        with self._lock:
+            # Close the previous file so its buffered rows don't end up in the new one
+            if self.fd is not None:
+                self.close_file()
+            
+            # Generate a unique filename using the current timestamp.
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-        self.file_path = os.path.join(self.data_folder, filename)
+            # Use custom filename if set, otherwise use default
+            if self.custom_filename:
+                filename = f"{self.custom_filename}_{timestamp}.csv"
+            else:
+                filename = f"experiment_data_{timestamp}.csv"
+                
+            self.file_path = os.path.join(self.data_folder, filename)
+            self.fieldnames = list(fieldnames) if fieldnames else list(CSV_FIELDNAMES)
+            self._row_format = build_row_format(self.fieldnames)
+            self._pending = True
+            logger.info("New data file prepared at: %s", self.file_path)
 
-        # Open the file in write mode ('w') with a newline='' argument to prevent empty rows.
-        self.file = open(self.file_path, 'w', newline='')
+    def _open_file(self):
+        """Create the prepared data file and write the metadata comments and header"""
+        # Open the file for appending; the data is buffered in self._buf, not by Python's file object
+        self.fd = os.open(self.file_path, CSV_OPEN_FLAGS, 0o644)
+        _open_handlers.add(self)
+        self._pending = False
+        self._last_flush = time.monotonic()
+        self._buf = bytearray()
         
         # Write metadata as comments at the beginning of the file
         if self.metadata:
-            self.file.write("# Experiment Metadata\n")
+            self._buf += b"# Experiment Metadata\n"
             for key, value in self.metadata.items():
                 if isinstance(value, list):
                     value = ','.join(str(v) for v in value)
-                self.file.write(f"# {key}: {value}\n")
-            self.file.write("#\n")
+                self._buf += f"# {key}: {value}\n".encode('utf-8')
+            self._buf += b"#\n"
         
-        # Create a CSV writer object.
-        self.writer = csv.DictWriter(self.file, fieldnames=[
-            "measurement_id",
-            "time",
-            "flow_setpoint",
-            "pump_flow_read",
-            "pressure_read",
-            "temp_read",
-            "level_read",
-            "program_step",
-            "voltage",
-            "current",
-            "target_voltage"
-            # We can add more fieldnames here for other sensors if needed.
-        ])
-
         # Write the header row to the CSV file.
-        self.writer.writeheader()
+        self._buf += (",".join(self.fieldnames) + "\n").encode('utf-8')
+        self.flush()
         
         # Save metadata to separate JSON file
         if self.metadata:
@@ -90,26 +209,114 @@ class DataHandler:
             with open(metadata_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
         
-        print(f"New data file created at: {self.file_path}")
+        logger.info("New data file created at: %s", self.file_path)
+
+    def _ensure_open(self):
+        """
+        Create the prepared file on the first row (call with self._lock held)
+        Returns False once the file was closed - a late row from another thread is dropped,
+        the file is never reopened (O_TRUNC would wipe the recording)
+        """
+        if self.fd is not None:
+            return True
+        if not self._pending:
+            return False
+        self._open_file()
+        return True
+
+    def is_open(self):
+        """Check if a data file is open (or prepared) for writing"""
+        return self.fd is not None or self._pending
 
     # This function appends a new data point (a dictionary) to the CSV file.
+    # Keys that are not in the file's fieldnames are ignored, missing keys are written as empty fields.
     def append_data(self, data_point):
-        if self.writer and data_point:
+        if self.is_open() and data_point:
             try:
-                self.writer.writerow(data_point)
+                with self._lock:
+                    self._write_row(data_point)
                 # You can add a print statement for debugging if needed:
-                # print(f"Appended data: {data_point}")
+                # logger.debug("Appended data: %s", data_point)
+            except Exception as e:
+                logger.error("Error writing data: %s", e)
+        elif not self.is_open():
+            logger.warning("No file open for writing data")
+
+    def append_data_batch(self, data_points):
+        """
+        Append several data points at once (used by the background writer)
+        data_points: List of data point dictionaries
+        """
+        if self.is_open():
+            try:
+                with self._lock:
+                    for data_point in data_points:
+                        if data_point:
+                            self._write_row(data_point)
             except Exception as e:
-                print(f"Error writing data: {e}")
-        elif not self.writer:
-            print("Warning: No file open for writing data")
+                logger.error("Error writing data: %s", e)
+        else:
+            logger.warning("No file open for writing data")
+
+    def append_columns(self, columns):
+        """
+        Append a block of rows given column by column (e.g. numpy arrays from a sweep)
+        One formatting pass over the columns - no dict is built per row
+        columns: Dict of field name -> equal-length sequence; fields that are not in the
+                 file's columns are ignored, missing fields are left empty
+        """
+        if not self.is_open():
+            logger.warning("No file open for writing data")
+            return
+        try:
+            n = len(next(iter(columns.values()), ()))
+            if n == 0:
+                return
+            fields = [_column_text(columns[name]) if name in columns else [""] * n
+                      for name in self.fieldnames]
+            data = ("\n".join(map(",".join, zip(*fields))) + "\n").encode('utf-8')
+            with self._lock:
+                if not self._ensure_open():
+                    logger.warning("Data file already closed - %d rows dropped", n)
+                    return
+                self._buf += data
+                self.flush()
+                self._last_flush = time.monotonic()
+        except Exception as e:
+            logger.error("Error writing data: %s", e)
+
+    def _write_row(self, data_point):
+        """
+        Buffer one formatted row and write the buffer when it is full or stale
+        Bounds the data-loss window on crash to flush_interval seconds
+        Called with self._lock held; returns False if the row was dropped (file already closed)
+        """
+        if not self._ensure_open():
+            return False
+        self._buf += self._row_format.format_map(_CsvRow(data_point)).encode('utf-8')
+        now = time.monotonic()
+        if len(self._buf) >= CSV_BUFFER_SIZE or now - self._last_flush >= self.flush_interval:
+            self.flush()
+            self._last_flush = now
+        return True
+
+    def flush(self):
+        """Write all buffered rows to the file"""
+        with self._lock:
+            if self.fd is not None and self._buf:
+                written = 0
+                with memoryview(self._buf) as view:
+                    # os.write may write less than requested - loop until everything is out
+                    while written < len(view):
+                        written += os.write(self.fd, view[written:])
+                self._buf.clear()
 
     def log_flow_change(self, new_flow_rate):
         """
         Log a flow rate change to the data file
         new_flow_rate: The new flow rate value
         """
-        if self.writer:
+        if self.is_open():
             try:
                 # Create a special data point to mark flow change
                 flow_change_data = {
@@ -123,20 +330,33 @@ class DataHandler:
                     "voltage": "",
                     "current": ""
                 }
-                self.writer.writerow(flow_change_data)
-                print(f"Flow rate change logged: {new_flow_rate} ml/min")
+                with self._lock:
+                    self._write_row(flow_change_data)
+                logger.info("Flow rate change logged: %s ml/min", new_flow_rate)
             except Exception as e:
-                print(f"Error logging flow change: {e}")
+                logger.error("Error logging flow change: %s", e)
         else:
-            print("Warning: No file open for logging flow change")
+            logger.warning("No file open for logging flow change")
 
     # This function closes the file. It's crucial to call this at the end of every experiment.
+    # If no row was ever written, no file was created and there is nothing to close.
     def close_file(self):
-        if self.file:
-            self.file.close()
-            self.file = None
-            self.writer = None
-            print(f"Data file closed.")
+        with self._lock:
+            self._pending = False
+            if self.fd is None:
+                return
+            try:
+                self.flush()
+            finally:
+                os.close(self.fd)
+                self.fd = None
+                _open_handlers.discard(self)
+        logger.info("Data file closed.")
+
+    def __del__(self):
+        # Rows still in self._buf would be lost with the handler - write them and close the file
+        if getattr(self, 'fd', None) is not None:
+            self.close_file()
 
     def export_to_excel(self, output_path=None):
         """
@@ -144,20 +364,22 @@ class DataHandler:
         output_path: Optional path for Excel file. If None, uses same name as CSV with .xlsx extension
         """
         if not self.file_path or not os.path.exists(self.file_path):
-            print("No data file to export. Run an experiment first.")
+            logger.warning("No data file to export. Run an experiment first.")
             return False
         
+        import pandas as pd  # Only needed for Excel export - not loaded at startup
+        
         try:
             # Ensure file is closed before reading
-            if self.file:
-                self.file.flush()
+            if self.fd is not None:
+                self.flush()
             
             # Read the CSV file, skipping comment lines that start with #
             df = pd.read_csv(self.file_path, comment='#')
             
             # Check if file is empty or has no valid data
             if df.empty or len(df) == 0:
-                print("CSV file is empty. No data to export.")
+                logger.warning("CSV file is empty. No data to export.")
                 return False
             
             # Generate output path if not provided
@@ -206,70 +428,262 @@ class DataHandler:
                 summary_df = pd.DataFrame(summary_data)
                 summary_df.to_excel(writer, sheet_name='Summary', index=False)
             
-            print(f"Data exported to Excel: {output_path}")
+            logger.info("Data exported to Excel: %s", output_path)
             return True
             
         except pd.errors.EmptyDataError:
-            print("CSV file contains no data rows (only comments or headers).")
+            logger.warning("CSV file contains no data rows (only comments or headers).")
             return False
         except pd.errors.ParserError as e:
-            print(f"Error parsing CSV file: {e}")
+            logger.error("Error parsing CSV file: %s", e)
             return False
         except PermissionError:
-            print(f"Permission denied: Cannot write to {output_path}. File may be open in another program.")
+            logger.error("Permission denied: Cannot write to %s. File may be open in another program.", output_path)
             return False
         except Exception as e:
-            print(f"Error exporting to Excel: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error exporting to Excel: %s", e, exc_info=True)
             return False
 
     def export_iv_to_excel(self, voltage_data, current_data, output_path=None):
         """
         Export I-V measurement data to Excel
-        voltage_data: List of voltage values
-        current_data: List of current values
+        voltage_data: Voltage values (list or numpy array)
+        current_data: Current values (list or numpy array)
         output_path: Optional path for Excel file
         """
+        from openpyxl import Workbook  # Only needed for export - not loaded at startup
+        
         try:
-            # Create DataFrame from I-V data
-            df = pd.DataFrame({
-                'Voltage (V)': voltage_data,
-                'Current (A)': current_data,
-                'Resistance (Ohm)': [v/i if i != 0 else float('inf') for v, i in zip(voltage_data, current_data)]
-            })
+            voltages = np.asarray(voltage_data, dtype=np.float64)
+            currents = np.asarray(current_data, dtype=np.float64)
+            # Resistance in one vectorized pass (inf where the current is 0)
+            resistances = np.full_like(voltages, np.inf)
+            np.divide(voltages, currents, out=resistances, where=currents != 0)
             
             # Generate output path if not provided
             if output_path is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 output_path = os.path.join(self.data_folder, f"iv_measurement_{timestamp}.xlsx")
             
-            # Create Excel writer
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                # Write I-V data
-                df.to_excel(writer, sheet_name='I-V Data', index=False)
-                
-                # Add I-V curve plot (basic statistics)
-                stats_data = {
-                    'Parameter': ['Data Points', 'Voltage Range (V)', 'Current Range (A)', 'Max Resistance (Ohm)', 'Min Resistance (Ohm)'],
-                    'Value': [
-                        len(df),
-                        f"{df['Voltage (V)'].min():.3f} to {df['Voltage (V)'].max():.3f}",
-                        f"{df['Current (A)'].min():.3f} to {df['Current (A)'].max():.3f}",
-                        f"{df['Resistance (Ohm)'].max():.2f}",
-                        f"{df['Resistance (Ohm)'].min():.2f}"
-                    ]
-                }
-                
-                stats_df = pd.DataFrame(stats_data)
-                stats_df.to_excel(writer, sheet_name='I-V Statistics', index=False)
+            # Write-only workbook - rows are streamed instead of building every cell object
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet('I-V Data')
+            sheet.append(['Voltage (V)', 'Current (A)', 'Resistance (Ohm)'])
+            for row in zip(voltages.tolist(), currents.tolist(), resistances.tolist()):
+                sheet.append([_excel_number(value) for value in row])
+            
+            # Basic statistics
+            stats = workbook.create_sheet('I-V Statistics')
+            stats.append(['Parameter', 'Value'])
+            if len(voltages):
+                stats.append(['Data Points', len(voltages)])
+                stats.append(['Voltage Range (V)', f"{np.nanmin(voltages):.3f} to {np.nanmax(voltages):.3f}"])
+                stats.append(['Current Range (A)', f"{np.nanmin(currents):.3f} to {np.nanmax(currents):.3f}"])
+                stats.append(['Max Resistance (Ohm)', f"{np.nanmax(resistances):.2f}"])
+                stats.append(['Min Resistance (Ohm)', f"{np.nanmin(resistances):.2f}"])
+            else:
+                stats.append(['Data Points', 0])
+            workbook.save(output_path)
             
-            print(f"I-V data exported to Excel: {output_path}")
+            logger.info("I-V data exported to Excel: %s", output_path)
             return True
             
         except Exception as e:
-            print(f"Error exporting I-V data to Excel: {e}")
+            logger.error("Error exporting I-V data to Excel: %s", e)
+            return False
+
+
+class ParquetDataHandler(DataHandler):
+    """
+    DataHandler that also writes every experiment as a Parquet file.
+    Rows are collected column by column in preallocated numpy arrays and written
+    as one row group per PARQUET_CHUNK_SIZE rows.
+    The CSV file is still written, because the browser tab and Excel export read it.
+    """
+
+    def __init__(self, data_folder="data", flush_interval=2.0, chunk_size=PARQUET_CHUNK_SIZE):
+        super().__init__(data_folder, flush_interval)
+        self.chunk_size = chunk_size
+        self.parquet_path = None
+        self._parquet_writer = None
+        self._columns = None  # One float64 array per numeric field
+        self._text_columns = None  # One list per text field (program_step)
+        self._rows = 0  # Rows in the current chunk
+
+    def create_new_file(self, fieldnames=None):
+        super().create_new_file(fieldnames)
+        self.parquet_path = self.file_path[:-len('.csv')] + '.parquet'
+
+    def _open_file(self):
+        super()._open_file()
+        self.parquet_path = self.file_path[:-len('.csv')] + '.parquet'
+        numeric = [name for name in self.fieldnames if name not in PARQUET_TEXT_FIELDS]
+        text = [name for name in self.fieldnames if name in PARQUET_TEXT_FIELDS]
+        schema = pa.schema([(name, pa.float64()) for name in numeric] +
+                           [(name, pa.string()) for name in text])
+        self._parquet_writer = pq.ParquetWriter(self.parquet_path, schema)
+        # pa.array imports pandas on its first call; do that now so a file closed at interpreter
+        # exit (no new threads allowed by then, and pandas starts some) can still be written
+        pa.array(np.empty(0))
+        self._columns = {name: np.full(self.chunk_size, np.nan) for name in numeric}
+        self._text_columns = {name: [None] * self.chunk_size for name in text}
+        self._rows = 0
+        logger.info("Parquet data file created at: %s", self.parquet_path)
+
+    def _write_row(self, data_point):
+        if not super()._write_row(data_point) or self._parquet_writer is None:
             return False
+        i = self._rows
+        for name, column in self._columns.items():
+            value = data_point.get(name)
+            # Markers such as "FLOW_CHANGE" and empty fields are stored as NaN
+            try:
+                column[i] = value
+            except (TypeError, ValueError):
+                column[i] = np.nan
+        for name, column in self._text_columns.items():
+            value = data_point.get(name)
+            column[i] = None if value is None else str(value)
+        self._rows = i + 1
+        if self._rows == self.chunk_size:
+            self._write_chunk()
+        return True
+
+    def append_columns(self, columns):
+        with self._lock:
+            super().append_columns(columns)
+            if self._parquet_writer is not None:
+                self._append_parquet_columns(columns)
+
+    def _append_parquet_columns(self, columns):
+        """Copy a block of columns into the Parquet chunk buffers (self._lock held)"""
+        n = len(next(iter(columns.values()), ()))
+        numeric = {name: _float_values(columns[name]) for name in self._columns if name in columns}
+        text = {name: [None if value is None else str(value) for value in columns[name]]
+                for name in self._text_columns if name in columns}
+        done = 0
+        while done < n:
+            # Fill the current chunk with slices of the columns
+            i = self._rows
+            count = min(n - done, self.chunk_size - i)
+            for name, values in numeric.items():
+                self._columns[name][i:i + count] = values[done:done + count]
+            for name, values in text.items():
+                self._text_columns[name][i:i + count] = values[done:done + count]
+            self._rows = i + count
+            done += count
+            if self._rows == self.chunk_size:
+                self._write_chunk()
+
+    def _write_chunk(self):
+        """Write the buffered rows as one Parquet row group and reset the buffers"""
+        n = self._rows
+        if n == 0:
+            return
+        arrays = [pa.array(column[:n]) for column in self._columns.values()]
+        arrays += [pa.array(column[:n], type=pa.string()) for column in self._text_columns.values()]
+        table = pa.Table.from_arrays(arrays, names=list(self._columns) + list(self._text_columns))
+        self._parquet_writer.write_table(table)
+        for column in self._columns.values():
+            column[:n] = np.nan
+        # Text fields a later row doesn't supply must be empty, not the previous chunk's values
+        for column in self._text_columns.values():
+            column[:n] = [None] * n
+        self._rows = 0
+
+    def close_file(self):
+        with self._lock:
+            if self._parquet_writer is not None:
+                try:
+                    self._write_chunk()
+                except Exception as e:
+                    logger.error("Error writing Parquet data: %s", e)
+                finally:
+                    self._parquet_writer.close()
+                    self._parquet_writer = None
+            super().close_file()
+
+
+def _float_values(values):
+    """Column as float64 - values that are not numbers (markers, empty fields) become NaN"""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        result = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                result[i] = value
+            except (TypeError, ValueError):
+                result[i] = np.nan
+        return result
+
+
+def create_data_handler(data_format="csv", data_folder="data"):
+    """
+    Create the data handler for the requested file format
+
+    Args:
+        data_format: "csv" or "parquet" (Parquet is written alongside the CSV file)
+        data_folder: Folder for the data files
+
+    Returns:
+        DataHandler or ParquetDataHandler instance
+
+    Raises:
+        ImportError: If "parquet" is requested and pyarrow is not installed
+    """
+    if data_format == "parquet":
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                'DATA_FILE_FORMAT = "parquet" needs the pyarrow library. '
+                'Install it with "pip install pyarrow" or set DATA_FILE_FORMAT = "csv".'
+            )
+        return ParquetDataHandler(data_folder)
+    return DataHandler(data_folder)
+
+
+def export_csv_to_excel(csv_path, excel_path):
+    """
+    Convert a data CSV file to Excel, one row at a time
+
+    Uses an openpyxl write-only workbook, so memory use does not grow with the
+    file size. '# key: value' metadata lines are skipped; numeric cells are
+    written as numbers and empty cells are left blank.
+
+    Args:
+        csv_path: Path of the CSV data file
+        excel_path: Path of the .xlsx file to write
+    """
+    import csv
+    from openpyxl import Workbook  # Only needed for export - not loaded at startup
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Data')
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(line for line in f if not line.startswith('#'))
+        sheet.append(next(reader, []))  # Header row stays text
+        for row in reader:
+            sheet.append([_excel_cell(value) for value in row])
+    workbook.save(excel_path)
+
+
+def _excel_number(value):
+    """Convert one float to an Excel cell value - inf is written as text (as pandas did), NaN as a blank cell"""
+    if value != value:
+        return None
+    if value in (float('inf'), float('-inf')):
+        return 'inf' if value > 0 else '-inf'
+    return value
+
+
+def _excel_cell(value):
+    """Convert one CSV field to an Excel cell value (float, None or the text)"""
+    if value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
 
 
 # We can also add a simple example to show how this class can be used.
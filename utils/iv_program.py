@@ -0,0 +1,65 @@
+"""
+I-V program text parsing and voltage ramps for the IV Write Program tab
+"""
+
+import logging
+import math
+import re
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Program lines: "<label>: key=value, key=value, ..." - lines starting with '#' are comments.
+# Group 1 is everything after the first ':'
+PROGRAM_LINE_RE = re.compile(r'^(?![^\S\n]*#)[^\n:]*:(.*)$', re.MULTILINE)
+# First "voltage=<value>" item of a line body - group 1 is the value up to the next ','
+VOLTAGE_ITEM_RE = re.compile(r'(?:^|,)\s*voltage\s*=([^,]*)', re.IGNORECASE)
+
+# Voltages closer than this to the target count as reached
+RAMP_TOLERANCE = 1e-6
+
+
+def parse_program_targets(program_text):
+    """
+    Target voltages of an I-V program, in order
+
+    Lines without a voltage item are skipped; a line whose voltage is not a number
+    is skipped with a warning.
+
+    Args:
+        program_text: Program text, one "<label>: voltage=<V>, ..." step per line
+    Returns:
+        List of target voltages (floats)
+    """
+    targets = []
+    # One compiled regex pass over the text instead of splitting every line
+    for line_match in PROGRAM_LINE_RE.finditer(program_text):
+        voltage_match = VOLTAGE_ITEM_RE.search(line_match.group(1))
+        if voltage_match is None:
+            continue
+        try:
+            targets.append(float(voltage_match.group(1)))
+        except ValueError as err:
+            logger.warning("Skipping line due to parse error: %s (%s)", line_match.group(0).strip(), err)
+    return targets
+
+
+def ramp_voltages(start, target, step):
+    """
+    Voltages of a ramp from start towards target in fixed steps
+    
+    Args:
+        start: Voltage the ramp starts from (not included)
+        target: Target voltage - the last step is clamped to it
+        step: Positive step size (V)
+    Returns:
+        numpy array of the intermediate voltages, ending at target.
+        Empty if start is already within RAMP_TOLERANCE of target.
+    """
+    distance = abs(target - start)
+    count = max(0, math.ceil((distance - RAMP_TOLERANCE) / step))
+    direction = 1.0 if target > start else -1.0
+    voltages = start + direction * step * np.arange(1, count + 1, dtype=np.float64)
+    if direction > 0:
+        return np.minimum(voltages, target)
+    return np.maximum(voltages, target)
@@ -0,0 +1,80 @@
+"""
+I-V statistics - voltage, current and resistance ranges of a sweep
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Currents at or below this magnitude are skipped for the resistance (avoids division by ~0)
+MIN_CURRENT = 1e-10
+
+
+def iv_statistics(voltages, currents):
+    """
+    Compute the sweep ranges - NaN samples (failed readings) are skipped
+
+    Args:
+        voltages, currents: float64 numpy arrays of the same length
+    Returns:
+        (v_min, v_max, i_min, i_max, r_min, r_max) as floats - NaN if there is no valid value
+    """
+    if NUMBA_AVAILABLE:
+        return _iv_statistics_kernel(voltages, currents)
+    return _iv_statistics_numpy(voltages, currents)
+
+
+def _iv_statistics_kernel(voltages, currents):
+    """All six reductions in one pass (compiled with numba when it is installed)"""
+    v_min = i_min = r_min = np.inf
+    v_max = i_max = r_max = -np.inf
+    for k in range(len(voltages)):
+        v = voltages[k]
+        i = currents[k]
+        if v == v:  # Not NaN
+            v_min = min(v_min, v)
+            v_max = max(v_max, v)
+        if i == i:
+            i_min = min(i_min, i)
+            i_max = max(i_max, i)
+            if v == v and abs(i) > MIN_CURRENT:
+                r = v / i
+                r_min = min(r_min, r)
+                r_max = max(r_max, r)
+    if v_min > v_max:
+        v_min = v_max = np.nan
+    if i_min > i_max:
+        i_min = i_max = np.nan
+    if r_min > r_max:
+        r_min = r_max = np.nan
+    return v_min, v_max, i_min, i_max, r_min, r_max
+
+
+if NUMBA_AVAILABLE:
+    # First call compiles (the result is cached on disk for later runs)
+    _iv_statistics_kernel = njit(cache=True)(_iv_statistics_kernel)
+
+
+def _iv_statistics_numpy(voltages, currents):
+    """numpy version of the kernel - a few vectorized passes"""
+    v_valid = ~np.isnan(voltages)
+    i_valid = ~np.isnan(currents)
+    v_min = float(voltages.min(where=v_valid, initial=np.inf))
+    v_max = float(voltages.max(where=v_valid, initial=-np.inf))
+    i_min = float(currents.min(where=i_valid, initial=np.inf))
+    i_max = float(currents.max(where=i_valid, initial=-np.inf))
+    r_valid = v_valid & (np.abs(currents) > MIN_CURRENT)  # False for NaN currents
+    resistances = np.divide(voltages, currents, out=np.empty_like(voltages), where=r_valid)
+    r_min = float(resistances.min(where=r_valid, initial=np.inf))
+    r_max = float(resistances.max(where=r_valid, initial=-np.inf))
+    if v_min > v_max:
+        v_min = v_max = np.nan
+    if i_min > i_max:
+        i_min = i_max = np.nan
+    if r_min > r_max:
+        r_min = r_max = np.nan
+    return v_min, v_max, i_min, i_max, r_min, r_max
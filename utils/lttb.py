@@ -0,0 +1,124 @@
+"""
+Largest-Triangle-Three-Buckets downsampling - keeps the visual shape of a line plot
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def lttb(x, y, n_out):
+    """
+    Downsample a line to n_out points that look like the full line when drawn
+
+    Unlike a stride, LTTB keeps the peaks and steps: the first and last points are
+    kept, the rest is split into n_out - 2 buckets, and from each bucket the point
+    that forms the largest triangle with the previously kept point and the mean of
+    the next bucket is kept. NaN samples (failed readings) are never picked unless a
+    bucket has nothing else.
+
+    Args:
+        x, y: float64 numpy arrays of the same length
+        n_out: Number of points to keep
+    Returns:
+        (x, y) with n_out points - the inputs themselves if they are not longer than that
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = _bucket_edges(n, n_out)
+    if NUMBA_AVAILABLE:
+        index = _lttb_kernel(x, y, edges)
+    else:
+        index = _lttb_numpy(x, y, edges)
+    return x[index], y[index]
+
+
+def _bucket_edges(n, n_out):
+    """Start index of each of the n_out - 2 buckets, plus the end of the last one"""
+    return (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+
+
+def _lttb_kernel(x, y, edges):
+    """
+    Index of the kept points - plain loops (compiled with numba when it is installed)
+    edges comes from _bucket_edges - computed by the caller, numba cannot call Python functions
+    """
+    n = len(x)
+    n_out = len(edges) + 1
+    index = np.empty(n_out, dtype=np.int64)
+    index[0] = 0
+    index[n_out - 1] = n - 1
+    a = 0
+    for k in range(n_out - 2):
+        start, end = edges[k], edges[k + 1]
+        next_end = edges[k + 2] if k + 2 < n_out - 1 else n
+        # Mean of the next bucket (the last point for the last bucket)
+        avg_x = avg_y = 0.0
+        count = 0
+        for j in range(end, next_end):
+            if x[j] == x[j] and y[j] == y[j]:  # Not NaN
+                avg_x += x[j]
+                avg_y += y[j]
+                count += 1
+        if count > 0:
+            avg_x /= count
+            avg_y /= count
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        # Point of this bucket with the largest triangle (NaN areas never compare larger)
+        ax, ay = x[a], y[a]
+        best = start
+        max_area = -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                best = j
+        index[k + 1] = best
+        a = best
+    return index
+
+
+if NUMBA_AVAILABLE:
+    # First call compiles (the result is cached on disk for later runs)
+    _lttb_kernel = njit(cache=True)(_lttb_kernel)
+
+
+def _lttb_numpy(x, y, edges):
+    """numpy version of the kernel - one vectorized argmax per bucket"""
+    n = len(x)
+    n_out = len(edges) + 1
+    # Mean of each bucket after the first, skipping NaN - from running sums in one pass
+    valid = ~(np.isnan(x) | np.isnan(y))
+    sum_x = np.concatenate(([0.0], np.cumsum(np.where(valid, x, 0.0))))
+    sum_y = np.concatenate(([0.0], np.cumsum(np.where(valid, y, 0.0))))
+    sum_n = np.concatenate(([0], np.cumsum(valid)))
+    starts, ends = edges[1:-1], edges[2:]
+    counts = sum_n[ends] - sum_n[starts]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = (sum_x[ends] - sum_x[starts]) / counts
+        mean_y = (sum_y[ends] - sum_y[starts]) / counts
+    # The last bucket is followed by the last point - buckets with only NaN use it too
+    mean_x = np.append(mean_x, x[n - 1])
+    mean_y = np.append(mean_y, y[n - 1])
+    empty = np.append(counts == 0, False)
+    mean_x[empty] = x[n - 1]
+    mean_y[empty] = y[n - 1]
+
+    index = np.empty(n_out, dtype=np.int64)
+    index[0] = 0
+    index[n_out - 1] = n - 1
+    a = 0
+    for k in range(n_out - 2):
+        start, end = edges[k], edges[k + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mean_x[k]) * (y[start:end] - ay) - (ax - x[start:end]) * (mean_y[k] - ay))
+        best = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        index[k + 1] = best
+        a = best
+    return index
@@ -0,0 +1,148 @@
+"""
+Sample buffer - growable float64 array used for the live graph data
+"""
+
+import numpy as np
+
+
+class SampleBuffer:
+    """
+    Append-only float64 buffer with a list-like interface.
+    Values are stored in a preallocated numpy array (8 bytes per sample instead of
+    a Python float object per sample). clear() and set() keep the allocation, so
+    a new run reuses the same memory.
+    generation changes whenever existing samples are replaced (clear/set), so
+    consumers can cache results for a prefix and only process appended samples.
+    """
+    __slots__ = ('_data', '_n', 'generation')
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize sample buffer
+
+        Args:
+            capacity: Initial number of samples (doubles when full)
+        """
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._n = 0
+        self.generation = 0
+
+    def append(self, value):
+        """Append one sample (None is stored as NaN)"""
+        n = self._n
+        if n == len(self._data):
+            self._reserve(2 * n)
+        self._data[n] = np.nan if value is None else value
+        self._n = n + 1
+
+    def extend(self, values):
+        """Append a sequence or numpy array of samples"""
+        values = np.asarray(values, dtype=np.float64)
+        n, m = self._n, len(values)
+        if n + m > len(self._data):
+            self._reserve(max(2 * len(self._data), n + m))
+        self._data[n:n + m] = values
+        self._n = n + m
+
+    def reserve(self, capacity):
+        """
+        Make room for capacity samples in total, so appends up to that size never reallocate
+
+        Args:
+            capacity: Number of samples (the allocation is only ever grown)
+        """
+        if capacity > len(self._data):
+            self._reserve(capacity)
+
+    def clear(self):
+        """Remove all samples (the allocation is kept)"""
+        self._n = 0
+        self.generation += 1
+
+    def set(self, values):
+        """
+        Replace the contents with values, copying into the existing array
+
+        Args:
+            values: Sequence or numpy array - entries that are not numbers become NaN
+        """
+        try:
+            values = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            values = np.array([_to_float(v) for v in values], dtype=np.float64)
+        n = len(values)
+        if n > len(self._data):
+            self._reserve(n)
+        self._data[:n] = values
+        self._n = n
+        self.generation += 1
+
+    @classmethod
+    def copy_of(cls, values):
+        """
+        Create a buffer holding a private copy of values
+        Always copies - the same array may be shared (e.g. one time column for
+        several series), and a later set() writes into the buffer's array
+
+        Args:
+            values: Sequence or numpy array - entries that are not numbers become NaN
+        """
+        buffer = cls.__new__(cls)
+        try:
+            buffer._data = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            buffer._data = np.array([_to_float(v) for v in values], dtype=np.float64)
+        buffer._n = len(buffer._data)
+        buffer.generation = 0
+        return buffer
+
+    def view(self):
+        """numpy view of the stored samples (valid until the next append/set)"""
+        return self._data[:self._n]
+
+    def tolist(self):
+        """Copy of the samples as a list of Python floats"""
+        return self._data[:self._n].tolist()
+
+    def _reserve(self, capacity):
+        """Grow the array to at least capacity samples"""
+        data = np.empty(max(capacity, 16), dtype=np.float64)
+        data[:self._n] = self._data[:self._n]
+        self._data = data
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        return self._data[:self._n][index]
+
+
+def _to_float(value):
+    """Convert one value to float, NaN if it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def decimate(x, y, max_points=2000):
+    """
+    Stride-decimate a series for plotting - a plot is only ~1000-2000 pixels wide
+
+    Args:
+        x, y: numpy arrays of the same length
+        max_points: Maximum number of points to keep
+    Returns:
+        (x, y) views with at most about max_points points (the last point is always kept)
+    """
+    n = len(x)
+    if n <= max_points:
+        return x, y
+    stride = -(-n // max_points)  # ceil division
+    index = np.arange(0, n, stride)
+    if index[-1] != n - 1:
+        index = np.append(index, n - 1)
+    return x[index], y[index]